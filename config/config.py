@@ -1,29 +1,256 @@
 """
 Configuration module untuk University Dashboard
+
+Setiap nilai dideklarasikan sebagai Setting bertipe (env var, default, parser,
+batas). Atribut kelas dibaca seperti biasa (DataConfig.DATA_PATH), tetapi
+nilainya berasal dari snapshot konfigurasi yang dapat dimuat ulang tanpa
+restart: reload() membaca ulang environment dan file .env, reload_if_changed()
+hanya jika .env berubah. Env var proses selalu menang atas isi .env.
 """
+import logging
 import os
-from dotenv import load_dotenv
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dotenv import dotenv_values, find_dotenv
+
+logger = logging.getLogger(__name__)
+
+# File .env dicari sekali saat import (sama seperti load_dotenv sebelumnya); jika belum ada,
+# .env di root project tetap dipantau sehingga file yang dibuat kemudian ikut terbaca
+ENV_FILE = find_dotenv() or str(Path(__file__).resolve().parents[1] / ".env")
+
+# Sumber data tabel mahasiswa/KRS/mata kuliah; 'local' = nama lama untuk csv
+DATA_SOURCES = ("csv", "excel", "sqlite")
+
+
+def _bool(value: str) -> bool:
+    lowered = value.lower()
+    if lowered in ("true", "1", "yes", "on"):
+        return True
+    if lowered in ("false", "0", "no", "off"):
+        return False
+    raise ValueError(f"expected True/False, got {value!r}")
+
+
+def _data_source(value: str) -> str:
+    source = "csv" if value.lower() == "local" else value.lower()
+    if source not in DATA_SOURCES:
+        raise ValueError(f"expected one of {', '.join(DATA_SOURCES)}, got {value!r}")
+    return source
+
+
+class Setting:
+    """Typed class attribute read from an env var; the value comes from the current snapshot"""
+
+    def __init__(self, env: str, default: Any, parse: Callable[[str], Any] = str,
+                 minimum: Optional[float] = None):
+        self.env = env
+        self.default = default
+        self.parse = parse
+        self.minimum = minimum
+        self.key = env
+
+    def __set_name__(self, owner, name):
+        self.key = f"{owner.__name__}.{name}"
+        _SETTINGS.append(self)
+
+    def __get__(self, obj, owner=None):
+        return _state.values[self.key]
+
+    def coerce(self, raw: Optional[str]) -> Any:
+        """Typed value of a raw env string (None or empty = default); ValueError when invalid"""
+        if raw is None or raw.strip() == "":
+            return self.default
+        value = self.parse(raw.strip())
+        if self.minimum is not None and value < self.minimum:
+            raise ValueError(f"must be >= {self.minimum}, got {raw!r}")
+        return value
+
+
+_SETTINGS: List[Setting] = []
+
+
+class _State:
+    # Snapshot ditukar utuh saat reload; pembaca tidak pernah melihat campuran nilai lama/baru
+    values: Dict[str, Any] = {}
+    generation = 0
+    env_mtime: Optional[int] = None
+    error: Optional[str] = None
+
+
+_state = _State()
+_reload_lock = threading.Lock()
+
+
+def _env_mtime() -> Optional[int]:
+    try:
+        return os.stat(ENV_FILE).st_mtime_ns if ENV_FILE else None
+    except FileNotFoundError:
+        return None
+
+
+def _read() -> Dict[str, Any]:
+    file_values = dotenv_values(ENV_FILE) if ENV_FILE and os.path.isfile(ENV_FILE) else {}
+    values, errors = {}, []
+    for setting in _SETTINGS:
+        raw = os.environ.get(setting.env, file_values.get(setting.env))
+        try:
+            values[setting.key] = setting.coerce(raw)
+        except ValueError as e:
+            errors.append(f"{setting.env}: {e}")
+    if errors:
+        raise ValueError("Invalid configuration: " + "; ".join(errors))
+    return values
+
+
+def reload() -> Dict[str, Tuple[Any, Any]]:
+    """
+    Re-read the environment and .env file and swap in the new values.
+
+    Returns {setting: (old, new)} of the values that changed. When any value
+    is invalid nothing is applied and ValueError is raised.
+    """
+    with _reload_lock:
+        mtime = _env_mtime()
+        try:
+            values = _read()
+        except ValueError as e:
+            # Nilai lama tetap berlaku; file yang sama tidak dibaca ulang sampai diubah lagi
+            _state.env_mtime, _state.error = mtime, str(e)
+            raise
+        changed = {key: (_state.values.get(key), value) for key, value in values.items()
+                   if _state.values.get(key) != value}
+        _state.values = values
+        _state.env_mtime, _state.error = mtime, None
+        if changed:
+            _state.generation += 1
+        return changed
+
+
+def reload_if_changed() -> bool:
+    """Reload when the .env file changed since the last read (one stat call); True if values changed"""
+    if _env_mtime() == _state.env_mtime:
+        return False
+    try:
+        changed = reload()
+    except ValueError as e:
+        logger.error("Configuration reload failed; keeping the previous values: %s", e)
+        return False
+    if changed:
+        logger.info("Configuration reloaded: %s", ", ".join(sorted(changed)))
+    return bool(changed)
+
+
+def generation() -> int:
+    """Counter bumped by every reload that changed a value; cheap cache key for derived objects"""
+    return _state.generation
+
+
+def last_error() -> Optional[str]:
+    """Error of the last failed reload, None when the current values are the latest"""
+    return _state.error
+
+
+def describe() -> List[Dict[str, Any]]:
+    """Current value, default and env var of every setting (for the Settings page)"""
+    return [{"setting": s.key, "env": s.env, "value": _state.values[s.key], "default": s.default}
+            for s in _SETTINGS]
 
-# Load environment variables
-load_dotenv()
 
 class Config:
     """Base configuration"""
-    APP_TITLE = os.getenv("APP_TITLE", "University Analytics Dashboard")
-    APP_VERSION = os.getenv("APP_VERSION", "1.0.0")
-    DEBUG = os.getenv("DEBUG", "False") == "True"
-    
+    APP_TITLE = Setting("APP_TITLE", "University Analytics Dashboard")
+    APP_VERSION = Setting("APP_VERSION", "1.0.0")
+    DEBUG = Setting("DEBUG", False, _bool)
+
 class DatabaseConfig:
     """Database configuration"""
-    DB_TYPE = os.getenv("DB_TYPE", "sqlite")
-    DB_PATH = os.getenv("DB_PATH", "./database/university.db")
-    
+    DB_TYPE = Setting("DB_TYPE", "sqlite")
+    DB_PATH = Setting("DB_PATH", "./database/university.db")
+
 class StreamlitConfig:
     """Streamlit-specific configuration"""
-    SERVER_PORT = int(os.getenv("STREAMLIT_SERVER_PORT", 8501))
-    LOGGER_LEVEL = os.getenv("STREAMLIT_LOGGER_LEVEL", "info")
+    SERVER_PORT = Setting("STREAMLIT_SERVER_PORT", 8501, int)
+    LOGGER_LEVEL = Setting("STREAMLIT_LOGGER_LEVEL", "info")
 
 class DataConfig:
     """Data configuration"""
-    DATA_SOURCE = os.getenv("DATA_SOURCE", "local")
-    DATA_PATH = os.getenv("DATA_PATH", "./database/data")
+    # csv / excel: file di DATA_PATH; sqlite: tabel di DatabaseConfig.DB_PATH
+    DATA_SOURCE = Setting("DATA_SOURCE", "csv", _data_source)
+    DATA_PATH = Setting("DATA_PATH", "./database/data")
+    STUDENT_FILE = Setting("DATA_STUDENT_FILE", "mahasiswa_simulasi.csv")
+    COURSE_FILE = Setting("DATA_COURSE_FILE", "mata_kuliah_simulasi.csv")
+    KRS_FILE = Setting("DATA_KRS_FILE", "krs_simulasi.csv")
+    BPJS_FILE = Setting("DATA_BPJS_FILE", "bpjs antrol.csv")
+    SHARED_MEMORY = Setting("DATA_SHARED_MEMORY", False, _bool)
+    REFRESH_INTERVAL = Setting("DATA_REFRESH_INTERVAL", 30.0, float, minimum=1)
+    # Worker penulisan shard dan agregasi per kampus (0 = otomatis)
+    SHARD_WORKERS = Setting("DATA_SHARD_WORKERS", 0, int, minimum=0)
+
+    @classmethod
+    def source_path(cls) -> str:
+        """File or directory the refresher watches for the configured source"""
+        return DatabaseConfig.DB_PATH if cls.DATA_SOURCE == "sqlite" else cls.DATA_PATH
+
+class CacheConfig:
+    """In-process cache sizes and TTLs"""
+    # Rencana filter yang di-cache per FilterEngine (LRU)
+    FILTER_PLANS = Setting("CACHE_FILTER_PLANS", 128, int, minimum=1)
+    # TTL st.cache_data untuk data yang dimuat langsung oleh dashboard (0 = tanpa kedaluwarsa)
+    DATA_TTL = Setting("CACHE_DATA_TTL", 0.0, float, minimum=0)
+
+    @classmethod
+    def data_ttl(cls) -> Optional[float]:
+        return cls.DATA_TTL or None
+
+class ProfilingConfig:
+    """Per-rerun profiling configuration"""
+    ENABLED = Setting("PROFILE_RERUNS", False, _bool)
+    TRACE_DIR = Setting("PROFILE_TRACE_DIR", "./output/profiles")
+    KEEP_TRACES = Setting("PROFILE_KEEP_TRACES", 20, int, minimum=1)
+
+class ApiConfig:
+    """Headless aggregate API configuration"""
+    HOST = Setting("API_HOST", "127.0.0.1")
+    PORT = Setting("API_PORT", 8000, int)
+
+class ModelConfig:
+    """Offline dropout-risk model configuration"""
+    MODEL_DIR = Setting("MODEL_DIR", "./output/models")
+    N_JOBS = Setting("MODEL_N_JOBS", 1, int)
+    BATCH_SIZE = Setting("MODEL_BATCH_SIZE", 10000, int, minimum=1)
+
+class ExportConfig:
+    """Dataset export and report configuration"""
+    EXPORT_DIR = Setting("EXPORT_DIR", "./output/exports")
+    MAX_WORKERS = Setting("EXPORT_MAX_WORKERS", 2, int, minimum=1)
+    CHUNK_ROWS = Setting("EXPORT_CHUNK_ROWS", 50000, int, minimum=1)
+    MAX_FILES = Setting("EXPORT_MAX_FILES", 50, int, minimum=1)
+
+class CleaningConfig:
+    """Cleaning rules applied by DataLoader at ingest, per table (see src/data/cleaning.py)"""
+    ENABLED = Setting("CLEAN_AT_INGEST", True, _bool)
+    RULES = {
+        "mahasiswa": {
+            "strip": ["kampus", "prodi", "status", "jalur_masuk", "jenjang", "jenis_kelamin"],
+            # Batas clamp sama dengan TABLE_RULES profiler: baris yang di-clamp tetap ditandai anomali
+            "clamp": {"ipk": (1.0, 4.0)},
+        },
+        "mata_kuliah": {
+            "strip": ["kode_mk", "nama_mk", "prodi"],
+            "clamp": {"sks": (2, 3)},
+        },
+        "krs": {
+            "strip": ["kode_mk", "nilai_huruf"],
+            "clamp": {"nilai_angka": (0.0, 100.0)},
+            "semester": ["semester_akademik"],
+        },
+    }
+
+    @classmethod
+    def rules(cls):
+        return cls.RULES if cls.ENABLED else None
+
+# Snapshot pertama dibaca saat import; nilai tidak valid langsung gagal seperti sebelumnya
+reload()
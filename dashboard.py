@@ -1,12 +1,9 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from config.config import CacheConfig, DataConfig, generation, reload_if_changed
+from src.dashboard.common import CUSTOM_CSS, calculate_kpis, px
+from src.data.loader import DataLoader
 
 # Set page config
 st.set_page_config(
@@ -17,51 +14,20 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #1f4e79;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .section-header {
-        font-size: 2rem;
-        color: #2e75b6;
-        border-bottom: 2px solid #2e75b6;
-        padding-bottom: 0.5rem;
-        margin-top: 1.5rem;
-        text-align: center;
-    }
-    .metric-card {
-        background-color: #f8f9fa;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        margin-bottom: 1rem;
-        text-align: center;
-    }
-    .metric-card h3 {
-        margin: 0.2rem 0;
-        font-size: 1.8rem;
-        color: #1f4e79;
-    }
-    .metric-card p {
-        margin: 0.2rem 0;
-        font-size: 1rem;
-        color: #555;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Main title
 st.markdown('<h1 class="main-header">🎓 Dashboard Analitik Universitas</h1>', unsafe_allow_html=True)
 
-# Load dataset with error handling
-@st.cache_data
-def load_data():
+# Perubahan .env diterapkan tanpa restart: dicek sekali per rerun (satu stat)
+reload_if_changed()
+
+# Load dataset with error handling (sumber dan file dari DataConfig; TTL dari CacheConfig.DATA_TTL).
+# Generasi konfigurasi menjadi kunci cache: setelah reload data dimuat ulang sekali
+@st.cache_data(ttl=CacheConfig.data_ttl())
+def load_data(config_generation):
     try:
-        df = pd.read_csv('./database/data/mahasiswa_simulasi.csv')
+        df = DataLoader.from_config().load(DataConfig.STUDENT_FILE)
         # Convert date columns if they exist
         for col in df.columns:
             if 'tanggal' in col.lower() or 'date' in col.lower() or 'waktu' in col.lower() or 'time' in col.lower():
@@ -70,71 +36,15 @@ def load_data():
                 except:
                     pass
         return df
-    except FileNotFoundError:
-        st.error("File './database/data/mahasiswa_simulasi.csv' tidak ditemukan.")
+    except FileNotFoundError as e:
+        st.error(f"Data mahasiswa tidak ditemukan: {e}")
         return pd.DataFrame() # Return empty DataFrame
     except Exception as e:
         st.error(f"Terjadi kesalahan saat memuat data: {str(e)}")
         return pd.DataFrame() # Return empty DataFrame
 
-# Function to calculate KPIs
-def calculate_kpis(df):
-    if df.empty:
-        return {
-            'total_mahasiswa': 0,
-            'total_aktif': 0,
-            'total_lulus': 0,
-            'persentase_aktif': 0,
-            'avg_ipk': 0.0
-        }
-    
-    total_mahasiswa = len(df)
-    
-    # Find status column
-    status_col = None
-    for col in df.columns:
-        if 'status' in col.lower():
-            status_col = col
-            break
-    
-    # Count active and graduated students
-    total_aktif = 0
-    total_lulus = 0
-    if status_col and status_col in df.columns:
-        total_aktif = df[df[status_col].str.upper() == 'AKTIF'].shape[0]
-        total_lulus = df[df[status_col].str.upper() == 'LULUS'].shape[0]
-    
-    # Find IPK column
-    ipk_col = None
-    for col in df.columns:
-        if 'ipk' in col.lower() or 'gpa' in col.lower():
-            ipk_col = col
-            break
-    
-    # Calculate average IPK
-    avg_ipk = 0.0
-    if ipk_col and ipk_col in df.columns:
-        try:
-            ipk_values = pd.to_numeric(df[ipk_col], errors='coerce')
-            avg_ipk = ipk_values.mean()
-            if pd.isna(avg_ipk):
-                avg_ipk = 0.0
-        except:
-            avg_ipk = 0.0
-    
-    # Calculate percentage of active students
-    persentase_aktif = (total_aktif / total_mahasiswa * 100) if total_mahasiswa > 0 else 0
-    
-    return {
-        'total_mahasiswa': total_mahasiswa,
-        'total_aktif': total_aktif,
-        'total_lulus': total_lulus,
-        'persentase_aktif': persentase_aktif,
-        'avg_ipk': avg_ipk
-    }
-
 # Load data
-df = load_data()
+df = load_data(generation())
 
 # Tambahkan filter tahun angkatan di sini
 st.sidebar.subheader("Filter Tahun Angkatan")
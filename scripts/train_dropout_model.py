@@ -0,0 +1,55 @@
+"""
+Latih model risiko dropout/terlambat lulus dan simpan skor seluruh mahasiswa
+
+Usage: python scripts/train_dropout_model.py [--n-jobs 4] [--score-only]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config.config import DataConfig, ModelConfig
+from src.data.cohort import CohortMatrix
+from src.data.loader import DataLoader
+from src.models.dropout import (
+    build_features,
+    build_labels,
+    load_model,
+    save_model,
+    save_scores,
+    score_students,
+    train_model,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--data-path", help="ganti DATA_PATH (atau DB_PATH jika DATA_SOURCE=sqlite)")
+    parser.add_argument("--model-dir", default=ModelConfig.MODEL_DIR)
+    parser.add_argument("--n-jobs", type=int, default=ModelConfig.N_JOBS)
+    parser.add_argument("--batch-size", type=int, default=ModelConfig.BATCH_SIZE)
+    parser.add_argument("--score-only", action="store_true", help="pakai model tersimpan, tanpa melatih ulang")
+    args = parser.parse_args()
+
+    loader = DataLoader.from_config(args.data_path)
+    krs = loader.load(DataConfig.KRS_FILE)
+    cohort = CohortMatrix(loader.load(DataConfig.STUDENT_FILE), krs)
+    features = build_features(cohort, krs)
+
+    if args.score_only:
+        pipeline = load_model(args.model_dir)["pipeline"]
+    else:
+        pipeline, metrics = train_model(features, build_labels(cohort))
+        path = save_model(pipeline, args.model_dir, metrics)
+        print(f"✓ Model saved to {path} (ROC AUC holdout: {metrics['roc_auc']:.3f})")
+
+    scores = score_students(pipeline, features, batch_size=args.batch_size, n_jobs=args.n_jobs)
+    path = save_scores(cohort, scores, args.model_dir)
+    print(f"✓ {len(scores):,} scores saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -309,7 +309,7 @@ STREAMLIT_SERVER_PORT=8501
 STREAMLIT_LOGGER_LEVEL=info
 
 # Data Configuration
-DATA_SOURCE=local  # local, kaggle, or api
+DATA_SOURCE=csv  # csv, excel, or sqlite (tabel di DB_PATH)
 DATA_PATH=./database/data
 
 # App Configuration
@@ -0,0 +1,127 @@
+"""
+Headless Aggregate API
+
+Layanan HTTP/JSON async yang menyajikan angka yang sama dengan dashboard
+(KPI, distribusi prodi, tren angkatan). Agregat dan body JSON dihitung sekali
+per versi dataset oleh refresher di background; request hanya membaca hasilnya.
+
+Populasi: seluruh tabel mahasiswa persis seperti dimuat dashboard
+(DataLoader.load_students), sebelum filter sidebar. Angka /kpis sama dengan
+KPI dashboard tanpa filter; pilihan prodi bawaan dashboard tidak memuat baris
+tanpa prodi sehingga angkanya bisa sedikit lebih kecil.
+
+Jalankan dengan: python -m src.api.server
+"""
+import json
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import anyio
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config.config import ApiConfig, DataConfig
+from src.data.aggregates import student_summary
+from src.data.dedup import dataset_version
+from src.data.loader import DataLoader
+from src.data.refresh import DataRefresher
+
+# Endpoint agregat -> kunci pada hasil student_summary (None = seluruh ringkasan)
+ENDPOINTS = {
+    "summary": None,
+    "kpis": "kpis",
+    "prodi": "prodi",
+    "angkatan": "angkatan",
+}
+
+
+def render_responses(summary: Dict[str, Any], version: str) -> Dict[str, Tuple[bytes, str]]:
+    """Serialize every endpoint once: {endpoint: (json body, etag)}"""
+    responses = {}
+    for name, key in ENDPOINTS.items():
+        payload = {"dataset_version": version, "data": summary if key is None else summary[key]}
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        responses[name] = (body, f'"{version}-{name}"')
+    return responses
+
+
+def build_api_dataset(source_path: Path):
+    """Build function for DataRefresher: the dashboard's student table plus pre-rendered aggregates"""
+    loader = DataLoader.from_config(source_path)
+    df = loader.load_students(DataConfig.STUDENT_FILE, shared=DataConfig.SHARED_MEMORY)
+    version = dataset_version(df)
+    summary = student_summary(df)
+    return df, {
+        "dataset_version": version,
+        "summary": summary,
+        "responses": render_responses(summary, version),
+    }
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def create_app(refresher: DataRefresher) -> Starlette:
+    """ASGI app serving aggregates from the refresher's current snapshot"""
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # Build pertama berjalan di thread agar event loop tidak terblokir
+        await anyio.to_thread.run_sync(refresher.start)
+        yield
+        await anyio.to_thread.run_sync(refresher.stop)
+
+    async def health(request: Request) -> Response:
+        snapshot = refresher.snapshot
+        if snapshot is None:
+            return JSONResponse({"status": "loading"}, status_code=503)
+        return JSONResponse({
+            "status": "ok",
+            "dataset_version": snapshot["dataset_version"],
+            "snapshot_version": snapshot.version,
+        })
+
+    async def aggregate(request: Request) -> Response:
+        name = request.path_params["name"]
+        if name not in ENDPOINTS:
+            return JSONResponse({"error": f"Unknown aggregate: {name}"}, status_code=404)
+        snapshot = refresher.snapshot
+        if snapshot is None:
+            return JSONResponse({"error": "Dataset is not loaded yet"}, status_code=503)
+
+        body, etag = snapshot["responses"][name]
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    return Starlette(
+        routes=[
+            Route("/health", health),
+            Route("/api/v1/students/{name}", aggregate),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def main() -> None:
+    import uvicorn
+
+    # Refresher juga memuat ulang .env di setiap poll: sumber data dan interval bisa diubah tanpa restart
+    refresher = DataRefresher.from_config(build_api_dataset)
+    uvicorn.run(create_app(refresher), host=ApiConfig.HOST, port=ApiConfig.PORT)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,24 @@
 Main Dashboard Application
 University Analytics Dashboard - Streamlit Version
 """
+import sys
+import threading
+from pathlib import Path
+
+# `streamlit run src/dashboard/app.py` hanya menambahkan folder ini ke sys.path; root proyek ditambahkan manual
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
 import streamlit as st
 import pandas as pd
-from pathlib import Path
+from config.config import ENV_FILE, DataConfig, ModelConfig, describe, generation, last_error, reload, reload_if_changed
+from src.dashboard.common import px
+from src.data.cohort import CohortMatrix
+from src.data.courses import GRADE_LETTERS, CourseAggregates
+from src.data.loader import DataLoader
+from src.data.shards import UNKNOWN_CAMPUS
+from src.models.scores import LEVEL_COLUMN, RISK_LEVELS, SCORE_COLUMN, attach_scores, load_scores
 
 # Page configuration
 st.set_page_config(
@@ -23,9 +38,261 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
+# Loader di bawah menerima generasi konfigurasi sebagai kunci cache: setelah reload,
+# sumber/file/aturan baru dimuat ulang sekali tanpa restart proses
+
+# Shard per kampus: satu kampus membaca satu shard, lintas kampus menggabungkan partial
+@st.cache_resource(max_entries=1)
+def _shard_loader(config_generation):
+    return DataLoader.from_config(), threading.Lock()
+
+def load_shards():
+    # Kesegaran dicek setiap rerun (stat sumber + baca manifest); lock mencegah build ganda antar sesi
+    loader, lock = _shard_loader(generation())
+    with lock:
+        return loader.load_sharded(DataConfig.STUDENT_FILE)
+
+def render_overview():
+    """Campus-level aggregates read from the campus shards"""
+    st.title("📈 Overview")
+    try:
+        shards = load_shards()
+    except FileNotFoundError as e:
+        st.error(f"Data mahasiswa tidak ditemukan: {e}")
+        return
+
+    campuses = [c for c in shards.campuses if c != UNKNOWN_CAMPUS]
+    campus = st.selectbox("Kampus", ["Semua Kampus"] + campuses)
+    selected = campuses if campus == "Semua Kampus" else [campus]
+    aggregates = shards.aggregates(selected, max_workers=DataConfig.SHARD_WORKERS or None)
+
+    status = aggregates['status_dist']
+    total = int(status['jumlah'].sum())
+    aktif = int(aggregates['aktif_per_kampus']['jumlah_mahasiswa_aktif'].sum())
+    ipk = aggregates['ipk_summary']
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Kampus", f"{len(selected):,}")
+    col2.metric("Mahasiswa (status tercatat)", f"{total:,}")
+    col3.metric("Mahasiswa Aktif", f"{aktif:,}")
+    col4.metric("Prodi", f"{aggregates['prodi_dist']['prodi'].nunique():,}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Tren Angkatan")
+        fig = px.line(aggregates['angkatan_trend'], x='angkatan', y='jumlah_mhs', color='kampus', markers=True)
+        st.plotly_chart(fig, width='stretch')
+    with col2:
+        st.subheader("Distribusi Status Studi")
+        fig = px.bar(status, x='status', y='jumlah', color='kampus', barmode='group')
+        st.plotly_chart(fig, width='stretch')
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Prodi Terbesar")
+        fig = px.bar(aggregates['prodi_dist'].head(15), x='jumlah_mhs', y='prodi', color='kampus', orientation='h')
+        fig.update_layout(yaxis=dict(autorange="reversed"))
+        st.plotly_chart(fig, width='stretch')
+    with col2:
+        st.subheader("Jalur Masuk")
+        fig = px.bar(aggregates['jalur_masuk_dist'], x='jalur_masuk', y='jumlah_mhs', color='kampus', barmode='group')
+        st.plotly_chart(fig, width='stretch')
+
+    st.subheader("Rata-rata IPK per Jenjang")
+    st.dataframe(ipk, width='stretch', hide_index=True)
+
+# Matriks aktivitas KRS dibangun sekali per proses
+@st.cache_resource(max_entries=1)
+def load_cohort(config_generation):
+    loader = DataLoader.from_config()
+    # Skor risiko dibaca dari hasil pipeline offline, bukan dihitung saat rerun
+    students = attach_scores(loader.load(DataConfig.STUDENT_FILE), load_scores(ModelConfig.MODEL_DIR))
+    return CohortMatrix(students, loader.load(DataConfig.KRS_FILE))
+
+def render_student_analytics():
+    """Cohort retention, dropout hazard and time to graduation"""
+    st.title("👥 Student Analytics")
+    try:
+        cohort = load_cohort(generation())
+    except FileNotFoundError as e:
+        st.error(f"Data mahasiswa/KRS tidak ditemukan: {e}")
+        return
+
+    students = cohort.students
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        by = st.selectbox("Kelompokkan berdasarkan", ["angkatan", "prodi", "jalur_masuk"])
+    with col2:
+        angkatan = st.multiselect("Angkatan", sorted(students['angkatan'].dropna().unique()))
+    with col3:
+        prodi = st.multiselect("Prodi", sorted(students['prodi'].dropna().unique()))
+    with col4:
+        jalur = st.multiselect("Jalur Masuk", sorted(students['jalur_masuk'].dropna().unique()))
+    rows = cohort.select(angkatan=angkatan, prodi=prodi, jalur_masuk=jalur)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Mahasiswa", f"{len(rows):,}")
+    col2.metric("Dengan Riwayat KRS", f"{int((cohort.last_active[rows] >= 0).sum()):,}")
+    col3.metric("Ukuran Matriks Aktivitas", f"{cohort.nbytes / 1024:,.1f} KB")
+    col4.metric("Baris KRS Tidak Valid", f"{cohort.invalid_rows:,}")
+    if len(rows) == 0:
+        st.warning("Tidak ada mahasiswa yang sesuai dengan filter.")
+        return
+
+    st.subheader("Kurva Retensi")
+    st.caption("Persentase mahasiswa yang masih terdaftar (ada KRS pada semester tersebut atau sesudahnya). "
+               "Sel kosong berada di luar rentang data KRS.")
+    retention = cohort.retention(by, rows)
+    fig = px.imshow(retention * 100, text_auto=".0f", aspect="auto", color_continuous_scale="Blues",
+                    labels=dict(x="Semester", y=by, color="Retensi (%)"))
+    st.plotly_chart(fig, width='stretch')
+    with st.expander("Tabel retensi dan laju aktivitas"):
+        st.dataframe(retention.style.format("{:.1%}", na_rep="-"), width='stretch')
+        st.caption("Laju aktivitas: persentase mahasiswa terdaftar yang mengambil KRS (sisanya cuti).")
+        st.dataframe(cohort.activity_rate(by, rows).style.format("{:.1%}", na_rep="-"), width='stretch')
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Hazard Dropout")
+        hazard = cohort.dropout_hazard(by, rows)
+        long = hazard.rename_axis(columns="semester").stack().rename("hazard").reset_index()
+        long[by] = long[by].astype(str)
+        fig = px.line(long, x="semester", y="hazard", color=by, markers=True,
+                      labels=dict(hazard="Peluang DO"))
+        st.plotly_chart(fig, width='stretch')
+    with col2:
+        st.subheader("Lama Studi Hingga Lulus")
+        graduation = cohort.time_to_graduation(by, rows)
+        fig = px.bar(graduation.reset_index().astype({by: str}), x=by, y="rata_rata_semester",
+                     hover_data=["median_semester", "tercatat"], labels=dict(rata_rata_semester="Rata-rata Semester"))
+        st.plotly_chart(fig, width='stretch')
+        st.dataframe(graduation, width='stretch')
+
+    render_risk_scores(cohort, rows)
+
+# Partial per mata kuliah x semester dibangun sekali; drill-down hanya membaca partial
+@st.cache_resource(max_entries=1)
+def load_courses(config_generation):
+    loader = DataLoader.from_config()
+    return CourseAggregates(loader.load(DataConfig.KRS_FILE), loader.load(DataConfig.COURSE_FILE))
+
+def grade_chart(distribution):
+    fig = px.bar(x=distribution.index, y=distribution.values, color=distribution.index,
+                 labels=dict(x="Nilai Huruf", y="Jumlah"), category_orders=dict(x=GRADE_LETTERS))
+    fig.update_layout(showlegend=False)
+    return fig
+
+def render_academic_programs():
+    """Course load and grade distribution, drilled from prodi to course to semester"""
+    st.title("📚 Academic Programs")
+    try:
+        courses = load_courses(generation())
+    except FileNotFoundError as e:
+        st.error(f"Data KRS/mata kuliah tidak ditemukan: {e}")
+        return
+
+    programs = courses.programs()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Prodi", f"{len(programs):,}")
+    col2.metric("Mata Kuliah", f"{int(programs['jumlah_mk'].sum()):,}")
+    col3.metric("Pengambilan KRS", f"{int(programs['jumlah_krs'].sum()):,}")
+    col4.metric("Total SKS Diambil", f"{programs['total_sks'].sum():,.0f}")
+
+    prodi = st.selectbox("Prodi", ["Semua Prodi"] + programs.index.tolist())
+    selected_prodi = [] if prodi == "Semua Prodi" else [prodi]
+
+    if not selected_prodi:
+        st.subheader("Ringkasan per Prodi")
+        fig = px.bar(programs.reset_index().sort_values('jumlah_krs', ascending=False), x='prodi', y='jumlah_krs',
+                     color='rata_rata_nilai', labels=dict(jumlah_krs="Pengambilan KRS", rata_rata_nilai="Rata-rata Nilai"))
+        st.plotly_chart(fig, width='stretch')
+        st.dataframe(programs, width='stretch')
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Distribusi Nilai")
+        st.plotly_chart(grade_chart(courses.grade_distribution(prodi=selected_prodi)), width='stretch',
+                        key='grades_prodi')
+    with col2:
+        st.subheader("Beban SKS per Semester")
+        # Mahasiswa yang mengambil MK di beberapa prodi dihitung sekali (semester_totals)
+        load = courses.semester_load(selected_prodi)
+        fig = px.bar(load, x='semester', y='sks_per_mahasiswa',
+                     hover_data=['total_sks', 'jumlah_mahasiswa'], labels=dict(sks_per_mahasiswa="SKS per Mahasiswa"))
+        st.plotly_chart(fig, width='stretch')
+
+    st.subheader("Mata Kuliah")
+    course_table = courses.courses(prodi=selected_prodi)
+    st.dataframe(course_table, width='stretch', hide_index=True)
+    options = course_table['kode_mk'].tolist()
+    if not options:
+        return
+    kode_mk = st.selectbox("Detail Mata Kuliah", options,
+                           format_func=lambda kode: f"{kode} - {course_table.set_index('kode_mk').at[kode, 'nama_mk']}")
+    per_semester = courses.semesters(kode_mk=[kode_mk])
+    col1, col2 = st.columns(2)
+    with col1:
+        st.caption("Rekap per semester")
+        st.dataframe(per_semester, width='stretch')
+    with col2:
+        semester = st.selectbox("Semester", ["Semua Semester"] + per_semester.index.tolist())
+        distribution = courses.grade_distribution(
+            kode_mk=[kode_mk], semester=[] if semester == "Semua Semester" else [semester])
+        st.plotly_chart(grade_chart(distribution), width='stretch', key='grades_course')
+
+def render_risk_scores(cohort, rows):
+    """Precomputed dropout / late-graduation risk of the selected students"""
+    st.subheader("Risiko Dropout / Terlambat Lulus")
+    if SCORE_COLUMN not in cohort.students.columns:
+        st.info("Skor risiko belum tersedia. Jalankan `python scripts/train_dropout_model.py` untuk melatih "
+                "model dan menyimpan skor seluruh mahasiswa.")
+        return
+    selected = cohort.students.iloc[rows]
+    col1, col2 = st.columns(2)
+    with col1:
+        levels = selected[LEVEL_COLUMN].value_counts().reindex(RISK_LEVELS, fill_value=0)
+        fig = px.bar(x=levels.index, y=levels.values, color=levels.index,
+                     labels=dict(x="Kategori Risiko", y="Jumlah Mahasiswa"),
+                     color_discrete_sequence=["#2ca02c", "#ff7f0e", "#d62728"])
+        fig.update_layout(showlegend=False)
+        st.plotly_chart(fig, width='stretch')
+    with col2:
+        st.caption("Mahasiswa aktif/cuti dengan risiko tertinggi")
+        ongoing = selected[selected['status'].isin(['AKTIF', 'CUTI'])]
+        columns = [c for c in ['id_mahasiswa', 'prodi', 'angkatan', 'status', 'ipk', SCORE_COLUMN, LEVEL_COLUMN]
+                   if c in ongoing.columns]
+        st.dataframe(ongoing.nlargest(20, SCORE_COLUMN)[columns], width='stretch', hide_index=True)
+
+def render_settings():
+    """Current configuration values and a live reload of the .env file"""
+    st.title("⚙️ Settings")
+    missing = "" if Path(ENV_FILE).is_file() else " (belum ada)"
+    st.caption(f"Nilai dibaca dari environment proses lalu {ENV_FILE}{missing}; "
+               "perubahan .env diterapkan otomatis pada rerun berikutnya.")
+    if st.button("🔄 Muat Ulang Konfigurasi"):
+        try:
+            changed = reload()
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            if changed:
+                st.success(f"{len(changed)} nilai berubah; data dimuat ulang saat halaman dibuka.")
+                st.dataframe(pd.DataFrame([(key, str(old), str(new)) for key, (old, new) in changed.items()],
+                                          columns=["setting", "lama", "baru"]), width='stretch', hide_index=True)
+            else:
+                st.info("Tidak ada nilai yang berubah.")
+    elif last_error():
+        st.error(f"Reload terakhir gagal, nilai sebelumnya tetap dipakai: {last_error()}")
+
+    # Nilai bertipe campuran ditampilkan sebagai teks
+    settings = pd.DataFrame(describe()).astype({"value": str, "default": str})
+    st.dataframe(settings, width='stretch', hide_index=True)
+
 def main():
     """Main application function"""
     
+    # Perubahan .env diterapkan tanpa restart: dicek sekali per rerun (satu stat)
+    reload_if_changed()
+    
     # Sidebar
     st.sidebar.title("📊 Dashboard Navigation")
     
@@ -45,24 +312,20 @@ def main():
         """)
         
     elif page == "📈 Overview":
-        st.title("📈 Overview")
-        st.info("Overview page - Coming soon!")
+        render_overview()
         
     elif page == "👥 Student Analytics":
-        st.title("👥 Student Analytics")
-        st.info("Student Analytics page - Coming soon!")
+        render_student_analytics()
         
     elif page == "📚 Academic Programs":
-        st.title("📚 Academic Programs")
-        st.info("Academic Programs page - Coming soon!")
+        render_academic_programs()
         
     elif page == "💰 Finance":
         st.title("💰 Finance")
         st.info("Finance page - Coming soon!")
         
     elif page == "⚙️ Settings":
-        st.title("⚙️ Settings")
-        st.info("Settings page - Coming soon!")
+        render_settings()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,29 @@
+"""
+Debug Panel Module
+"""
+from typing import Dict, Optional
+import streamlit as st
+from src.data.filters import Plan
+from src.utils.instrumentation import Instrumentation
+
+
+def render_debug_panel(instrumentation: Instrumentation, filter_plans: Optional[Dict[str, Plan]] = None) -> None:
+    """Show stage timings of the current rerun in the sidebar (only when enabled)"""
+    if not instrumentation.enabled:
+        return
+    with st.sidebar.expander("🐞 Debug: Waktu Eksekusi"):
+        # Strategi eksekusi filter yang dipilih per query
+        for name, plan in (filter_plans or {}).items():
+            st.caption(f"Strategi filter {name}: {plan.strategy}")
+            if plan.steps:
+                st.dataframe(plan.explain(), width='stretch', hide_index=True)
+        summary = instrumentation.summary()
+        if summary.empty:
+            st.info("Belum ada data waktu eksekusi.")
+            return
+        st.dataframe(summary[["stage", "wall_ms", "rows_in", "rows_out", "mem_delta_bytes"]], width='stretch')
+        st.caption(f"Total waktu rerun: {summary['wall_ms'].sum():.1f} ms")
+        st.download_button("📥 Export JSON", instrumentation.to_json(),
+                           file_name="timings.json", mime="application/json")
+        st.download_button("📥 Export Prometheus", instrumentation.to_prometheus(),
+                           file_name="timings.prom", mime="text/plain")
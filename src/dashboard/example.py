@@ -4,6 +4,27 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
+import sys
+from pathlib import Path
+
+# Pastikan root project ada di sys.path saat dijalankan via `streamlit run`
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from config.config import CacheConfig, Config, DatabaseConfig, DataConfig, ExportConfig, ProfilingConfig, reload_if_changed
+from src.data.bpjs import load_bpjs
+from src.data.dedup import Deduplicator, dataset_version
+from src.data.export import ExportService
+from src.data.filters import And, Between, In, build_engine
+from src.data.rollup import RollupStore
+from src.data.sketches import SketchIndex
+from src.data.stats import StatsIndex
+from src.data.topk import TopKIndex
+from src.dashboard.debug import render_debug_panel
+from src.dashboard.export import render_report_export, render_table_export
+from src.dashboard.grid import render_grid
+from src.data.grid import GridIndex
+from src.utils.instrumentation import Instrumentation
+from src.utils.profiling import RerunProfiler
 
 # Set page config
 st.set_page_config(
@@ -12,599 +33,787 @@ st.set_page_config(
     layout="wide"
 )
 
-# Title
-st.title("🏥 Dashboard Pasien BPJS Add Antroll")
-st.markdown("---")
-
-# Create tabs for different sections
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "1. S.M.A.R.T Question & Data Wrangling",
-    "2. Ringkasan Statistik Deskriptif",
-    "3. Exploratory Data Analysis (Deskriptif)",
-    "4. Exploratory Data Analysis (Lanjutan)",
-    "5. Insight & Kesimpulan"
-])
-
-# Define the load_data function first
-@st.cache_data
-def load_data():
-    """
-    Load BPJS antrol data with error handling
-    """
-    try:
-        # Load the dataset
-        df = pd.read_csv('database/data/bpjs antrol.csv', low_memory=False)
-        
-        # Convert date columns to datetime
-        df['tgl_registrasi'] = pd.to_datetime(df['tgl_registrasi'], format='%d/%m/%Y', errors='coerce')
-        df['tanggal_periksa'] = pd.to_datetime(df['tanggal_periksa'], format='%d/%m/%Y', errors='coerce')
-        
-        # Convert time column to time format
-        df['jam_reg'] = pd.to_datetime(df['jam_reg'], format='%H:%M:%S', errors='coerce').dt.time
-        
-        # Create a unified status column
-        df['status'] = df['status_kirim'].apply(lambda x: 'Sudah' if x == 'Sudah' else 
-                                               'Gagal' if x == 'Gagal' else 
-                                               'Ambil Antrian' if x == 'Ambil Antrian' else 
-                                               'Belum' if x == 'Belum' else 'Tidak Diketahui')
+# Perubahan .env diterapkan tanpa restart: dicek sekali per rerun (satu stat); resource di bawah
+# dikunci dengan nilai konfigurasi yang dipakainya sehingga nilai baru membuat objek baru
+reload_if_changed()
+
+# Profiling satu rerun (opt-in lewat PROFILE_RERUNS=True atau query parameter ?profile=1)
+@st.cache_resource(max_entries=1)
+def _rerun_profiler(trace_dir, keep):
+    return RerunProfiler(trace_dir, keep=keep)
+
+def get_rerun_profiler():
+    return _rerun_profiler(ProfilingConfig.TRACE_DIR, ProfilingConfig.KEEP_TRACES)
+
+profile_trace = None
+filter_state = {}
+if ProfilingConfig.ENABLED or st.query_params.get("profile") == "1":
+    rerun_profiler = get_rerun_profiler()
+    profile_query_params = st.query_params.to_dict()
+    profile_trace = rerun_profiler.start()
+
+# Trace disimpan di finally: rerun yang berhenti lewat st.stop() atau exception tetap tercatat
+# dan profiler selalu dimatikan. Setelah st.stop() setiap perintah st.* melempar StopException
+# lagi, jadi finally hanya memakai objek yang sudah diambil di atas
+try:
+    # Instrumentasi waktu per tahap (aktif jika DEBUG=True)
+    @st.cache_resource(max_entries=1)
+    def get_instrumentation(enabled):
+        return Instrumentation(enabled=enabled)
+
+    instr = get_instrumentation(Config.DEBUG)
+    instr.begin_run()
+
+    # Title
+    st.title("🏥 Dashboard Pasien BPJS Add Antroll")
+    st.markdown("---")
+
+    # Create tabs for different sections
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        "1. S.M.A.R.T Question & Data Wrangling",
+        "2. Ringkasan Statistik Deskriptif",
+        "3. Exploratory Data Analysis (Deskriptif)",
+        "4. Exploratory Data Analysis (Lanjutan)",
+        "5. Insight & Kesimpulan"
+    ])
+
+    # File BPJS di DATA_PATH (DataConfig.BPJS_FILE)
+    def bpjs_path():
+        return str(Path(DataConfig.DATA_PATH) / DataConfig.BPJS_FILE)
+
+    # Define the load_data function first
+    @st.cache_data
+    def load_data():
+        """
+        Load BPJS antrol data with error handling
+        """
+        try:
+            # Load the dataset: kolom yang dipakai saja, tanggal/jam di-parse paralel dengan format eksplisit
+            # dan status_kirim dipetakan ke kategori 'status' secara vektor
+            df = load_bpjs(bpjs_path())
         
-        # Create age column if birth date is available (not in this dataset, so we'll skip)
-        # Calculate age based on registration date and birth date if available
+            # Create age column if birth date is available (not in this dataset, so we'll skip)
+            # Calculate age based on registration date and birth date if available
         
-        return df
-    except FileNotFoundError:
-        st.error("File 'database/data/bpjs antrol.csv' tidak ditemukan. Harap pastikan file tersebut ada di direktori yang benar.")
-        return pd.DataFrame()
-    except Exception as e:
-        st.error(f"Error saat membaca file: {str(e)}")
-        return pd.DataFrame()
-
-# Load data
-df = load_data()
-
-if df.empty:
-    st.error("Tidak dapat memuat data. Silakan periksa file dataset.")
-    st.stop()
-
-# Sidebar filters
-st.sidebar.header("Filters")
-
-# Date range filter
-if not df.empty and 'tgl_registrasi' in df.columns:
-    min_date = df['tgl_registrasi'].min()
-    max_date = df['tgl_registrasi'].max()
+            return df
+        except FileNotFoundError:
+            st.error(f"File '{bpjs_path()}' tidak ditemukan. Harap pastikan file tersebut ada di direktori yang benar.")
+            return pd.DataFrame()
+        except Exception as e:
+            st.error(f"Error saat membaca file: {str(e)}")
+            return pd.DataFrame()
+
+    # Fingerprint no_rawat dihitung sekali saat load, bukan setiap rerun
+    @st.cache_resource
+    def load_deduplicator():
+        return Deduplicator(load_data(), subsets={'no_rawat': ['no_rawat']})
+
+    # Rollup jumlah registrasi per hari/jam/10 menit, dibangun sekali dari data unik per no_rawat
+    @st.cache_resource
+    def load_rollup():
+        data = load_data()
+        rollup = RollupStore()
+        rollup.append(data[~load_deduplicator().duplicated('no_rawat', keep='first')])
+        return rollup
+
+    # Ringkasan Space-Saving per partisi (ukuran terbatas) untuk kolom teks berkardinalitas tinggi
+    @st.cache_resource
+    def load_topk():
+        data = load_data()
+        data = data[~load_deduplicator().duplicated('no_rawat', keep='first')]
+        indexes = {col: TopKIndex(col, fill_value='Unknown') for col in ['nm_pasien', 'keterangan'] if col in data.columns}
+        for index in indexes.values():
+            index.append(data)
+        return indexes
+
+    # Sketch HLL (nunique) dan t-digest (kuantil) per partisi untuk mode ringkasan perkiraan
+    @st.cache_resource
+    def load_sketches():
+        data = load_data()
+        numeric_cols = data.select_dtypes(include=[np.number], exclude=['timedelta']).columns.tolist()
+        sketches = SketchIndex(data.columns.tolist(), numeric_cols)
+        sketches.append(data)
+        return sketches
+
+    # Momen per partisi (non-null, sum, sumsq, cross-product) untuk statistik deskriptif dan korelasi
+    @st.cache_resource
+    def load_stats(deduplicated):
+        data = load_data()
+        if deduplicated:
+            data = data[~load_deduplicator().duplicated('no_rawat', keep='first')]
+        numeric_cols = data.select_dtypes(include=[np.number], exclude=['timedelta']).columns.tolist()
+        stats = StatsIndex(data.columns.tolist(), numeric_cols)
+        stats.append(data)
+        return stats
+
+    # Permutasi urutan per kolom untuk tabel berhalaman (dihitung lazy, sekali per kolom)
+    @st.cache_resource
+    def load_grid_index():
+        return GridIndex(load_data())
+
+    # Filter sidebar dikompilasi sekali per state: kode kategori, salinan SQLite (_filter_bpjs_antrol), atau mask pandas
+    @st.cache_resource(max_entries=1)
+    def load_filter_engine(database, cache_size):
+        return build_engine(load_data(), database, "bpjs_antrol", cache_size=cache_size,
+                            index_columns=["tgl_registrasi", "nm_poli", "status"])
+
+    # Ekspor dan laporan ditulis di background, di-cache per (versi dataset, state filter)
+    @st.cache_resource(max_entries=1)
+    def _export_service(directory, max_workers, chunk_rows, max_files):
+        return ExportService(directory, max_workers=max_workers, chunk_rows=chunk_rows, max_files=max_files)
+
+    def get_export_service():
+        return _export_service(ExportConfig.EXPORT_DIR, ExportConfig.MAX_WORKERS,
+                               ExportConfig.CHUNK_ROWS, ExportConfig.MAX_FILES)
+
+    @st.cache_resource
+    def load_dataset_version():
+        return dataset_version(load_data())
+
+    # Info dan describe semua kolom hanya dihitung ulang saat filter berubah
+    @st.cache_data(show_spinner=False)
+    def describe_all_columns(filter_key, _df):
+        buffer = pd.io.common.StringIO()
+        _df.info(buf=buffer)
+        return buffer.getvalue(), _df.describe(include="all")
+
+    # Filter aktif diterapkan ke rollup dengan memotong rentang tanggal, bukan groupby ulang
+    rollup_range = (None, None)
+    rollup_filters = {}
+
+    def rollup_slice(grain):
+        return load_rollup().slice(grain, *rollup_range, **rollup_filters).fillna({'nm_poli': 'Unknown'})
+
+    # Load data
+    with instr.stage("load_data") as stage:
+        df = load_data()
+        stage.rows_out = len(df)
+
+    if df.empty:
+        st.error("Tidak dapat memuat data. Silakan periksa file dataset.")
+        st.stop()
+
+    # Sidebar filters
+    st.sidebar.header("Filters")
+    filter_engine = load_filter_engine(DatabaseConfig.DB_PATH if DatabaseConfig.DB_TYPE == "sqlite" else None,
+                                       CacheConfig.FILTER_PLANS)
+    predicates = []
+
+    with instr.stage("filter_tanggal", rows_in=len(df)) as stage:
+        # Date range filter
+        if not df.empty and 'tgl_registrasi' in df.columns:
+            min_date = df['tgl_registrasi'].min()
+            max_date = df['tgl_registrasi'].max()
     
-    # Default date range: last 30 days
-    default_end = min(max_date, datetime.now())
-    default_start = max(min_date, default_end - timedelta(days=30))
+            # Default date range: last 30 days
+            default_end = min(max_date, datetime.now())
+            default_start = max(min_date, default_end - timedelta(days=30))
     
-    date_range = st.sidebar.date_input(
-        "Pilih Rentang Tanggal",
-        value=(default_start.date(), default_end.date()),
-        min_value=min_date.date(),
-        max_value=max_date.date()
-    )
+            date_range = st.sidebar.date_input(
+                "Pilih Rentang Tanggal",
+                value=(default_start.date(), default_end.date()),
+                min_value=min_date.date(),
+                max_value=max_date.date()
+            )
+            filter_state["rentang_tanggal"] = date_range
     
-    if len(date_range) == 2:
-        start_date, end_date = date_range
-        df = df[(df['tgl_registrasi'] >= pd.Timestamp(start_date)) &
-                (df['tgl_registrasi'] <= pd.Timestamp(end_date))]
-
-# Poli filter
-if 'nm_poli' in df.columns:
-    poli_options = df['nm_poli'].unique()
-    selected_poli = st.sidebar.multiselect("Pilih Poliklinik", options=poli_options, default=poli_options)
-    if selected_poli:
-        df = df[df['nm_poli'].isin(selected_poli)]
-
-# Status filter
-if 'status' in df.columns:
-    status_options = df['status'].unique()
-    selected_status = st.sidebar.multiselect("Pilih Status", options=status_options, default=status_options)
-    if selected_status:
-        df = df[df['status'].isin(selected_status)]
-
-# EDA Mode selector (will be used in tab 4)
-# Note: This variable is defined here but the actual selector is in tab 4
-eda_mode = "Deskriptif" # Default value, will be set based on tab selection later
-
-# Tab 1: S.M.A.R.T Question & Data Wrangling
-with tab1:
-    st.subheader("🎯 Tujuan Penelitian & Pertanyaan S.M.A.R.T")
-    st.markdown("""
-    Aplikasi ini dibuat untuk menganalisis data registrasi pasien BPJS Add Antroll.
-    Berikut adalah beberapa pertanyaan S.M.A.R.T yang menjadi dasar analisis ini:
-
-    1. **Berapa jumlah total registrasi pasien BPJS per hari?**
-       - *Specific*: Mengukur jumlah registrasi harian
-       - *Measurable*: Dapat dihitung dari data tanggal registrasi
-       - *Achievable*: Data tersedia di dataset
-       - *Relevant*: Penting untuk mengetahui volume layanan
-       - *Time-bound*: Dapat dianalisis per hari, minggu, atau bulan
-
-    2. **Berapa persentase keberhasilan registrasi BPJS per poliklinik?**
-       - *Specific*: Mengukur efektivitas registrasi per poliklinik
-       - *Measurable*: Dihitung sebagai rasio registrasi sukses terhadap total
-       - *Achievable*: Status registrasi tersedia di dataset
-       - *Relevant*: Penting untuk evaluasi kinerja layanan
-       - *Time-bound*: Dapat dianalisis dalam periode tertentu
-
-    3. **Apa poliklinik dengan jumlah kunjungan tertinggi dan terendah?**
-       - *Specific*: Identifikasi poliklinik berdasarkan volume kunjungan
-       - *Measurable*: Dihitung berdasarkan jumlah registrasi per poliklinik
-       - *Achievable*: Nama poliklinik tersedia di dataset
-       - *Relevant*: Penting untuk alokasi sumber daya
-       - *Time-bound*: Dapat dianalisis dalam periode tertentu
-
-    4. **Apa penyebab utama kegagalan registrasi BPJS?**
-       - *Specific*: Mengidentifikasi faktor-faktor yang menyebabkan kegagalan
-       - *Measurable*: Dihitung berdasarkan kategori keterangan error
-       - *Achievable*: Data keterangan error tersedia di dataset
-       - *Relevant*: Penting untuk perbaikan sistem
-       - *Time-bound*: Dapat dianalisis dalam periode tertentu
-
-    5. **Bagaimana pola distribusi waktu registrasi pasien?**
-       - *Specific*: Mengidentifikasi jam-jam sibuk pendaftaran
-       - *Measurable*: Dihitung berdasarkan jam registrasi
-       - *Achievable*: Jam registrasi tersedia di dataset
-       - *Relevant*: Penting untuk manajemen antrian
-       - *Time-bound*: Dapat dianalisis harian/mingguan
-    """)
-    st.markdown("---")
+            if len(date_range) == 2:
+                start_date, end_date = date_range
+                rollup_range = (start_date, end_date)
+                predicates.append(Between('tgl_registrasi', pd.Timestamp(start_date), pd.Timestamp(end_date)))
+                df = filter_engine.apply(And(*predicates))
+        stage.rows_out = len(df)
+
+    with instr.stage("filter_poli", rows_in=len(df)) as stage:
+        # Poli filter
+        if 'nm_poli' in df.columns:
+            poli_options = df['nm_poli'].unique()
+            selected_poli = st.sidebar.multiselect("Pilih Poliklinik", options=poli_options, default=poli_options)
+            filter_state["poli"] = selected_poli
+            rollup_filters["nm_poli"] = selected_poli
+            if selected_poli:
+                predicates.append(In('nm_poli', selected_poli))
+                df = filter_engine.apply(And(*predicates))
+        stage.rows_out = len(df)
+
+    with instr.stage("filter_status", rows_in=len(df)) as stage:
+        # Status filter
+        if 'status' in df.columns:
+            status_options = df['status'].unique()
+            selected_status = st.sidebar.multiselect("Pilih Status", options=status_options, default=status_options)
+            filter_state["status"] = selected_status
+            rollup_filters["status"] = selected_status
+            if selected_status:
+                predicates.append(In('status', selected_status))
+        filter_plan = filter_engine.compile(And(*predicates))
+        df = filter_plan.apply()
+        stage.rows_out = len(df)
+
+    # Ringkasan exact (scan data terfilter) atau perkiraan (gabungan sketch partisi terpilih)
+    approx_mode = st.sidebar.toggle("Ringkasan Perkiraan (Sketch)", value=False,
+                                    help="Jumlah nilai unik dari HyperLogLog dan kuantil dari t-digest")
+    filter_state["ringkasan_perkiraan"] = approx_mode
+
+    # EDA Mode selector (will be used in tab 4)
+    # Note: This variable is defined here but the actual selector is in tab 4
+    eda_mode = "Deskriptif" # Default value, will be set based on tab selection later
+
+    # Tab 1: S.M.A.R.T Question & Data Wrangling
+    with tab1:
+        st.subheader("🎯 Tujuan Penelitian & Pertanyaan S.M.A.R.T")
+        st.markdown("""
+        Aplikasi ini dibuat untuk menganalisis data registrasi pasien BPJS Add Antroll.
+        Berikut adalah beberapa pertanyaan S.M.A.R.T yang menjadi dasar analisis ini:
+
+        1. **Berapa jumlah total registrasi pasien BPJS per hari?**
+           - *Specific*: Mengukur jumlah registrasi harian
+           - *Measurable*: Dapat dihitung dari data tanggal registrasi
+           - *Achievable*: Data tersedia di dataset
+           - *Relevant*: Penting untuk mengetahui volume layanan
+           - *Time-bound*: Dapat dianalisis per hari, minggu, atau bulan
+
+        2. **Berapa persentase keberhasilan registrasi BPJS per poliklinik?**
+           - *Specific*: Mengukur efektivitas registrasi per poliklinik
+           - *Measurable*: Dihitung sebagai rasio registrasi sukses terhadap total
+           - *Achievable*: Status registrasi tersedia di dataset
+           - *Relevant*: Penting untuk evaluasi kinerja layanan
+           - *Time-bound*: Dapat dianalisis dalam periode tertentu
+
+        3. **Apa poliklinik dengan jumlah kunjungan tertinggi dan terendah?**
+           - *Specific*: Identifikasi poliklinik berdasarkan volume kunjungan
+           - *Measurable*: Dihitung berdasarkan jumlah registrasi per poliklinik
+           - *Achievable*: Nama poliklinik tersedia di dataset
+           - *Relevant*: Penting untuk alokasi sumber daya
+           - *Time-bound*: Dapat dianalisis dalam periode tertentu
+
+        4. **Apa penyebab utama kegagalan registrasi BPJS?**
+           - *Specific*: Mengidentifikasi faktor-faktor yang menyebabkan kegagalan
+           - *Measurable*: Dihitung berdasarkan kategori keterangan error
+           - *Achievable*: Data keterangan error tersedia di dataset
+           - *Relevant*: Penting untuk perbaikan sistem
+           - *Time-bound*: Dapat dianalisis dalam periode tertentu
+
+        5. **Bagaimana pola distribusi waktu registrasi pasien?**
+           - *Specific*: Mengidentifikasi jam-jam sibuk pendaftaran
+           - *Measurable*: Dihitung berdasarkan jam registrasi
+           - *Achievable*: Jam registrasi tersedia di dataset
+           - *Relevant*: Penting untuk manajemen antrian
+           - *Time-bound*: Dapat dianalisis harian/mingguan
+        """)
+        st.markdown("---")
     
-    # Data Wrangling Process
-    st.subheader("🔍 Proses Data Wrangling")
-    st.markdown("#### Gathering Data")
-    st.info(f"Jumlah data awal: {len(df):,} baris dan {df.shape[1]} kolom")
+        # Data Wrangling Process
+        st.subheader("🔍 Proses Data Wrangling")
+        st.markdown("#### Gathering Data")
+        st.info(f"Jumlah data awal: {len(df):,} baris dan {df.shape[1]} kolom")
 
-    # Data Quality Assessment
-    st.markdown("#### Assessing Data Quality")
-    col1, col2, col3 = st.columns(3)
+        # Data Quality Assessment
+        st.markdown("#### Assessing Data Quality")
+        col1, col2, col3 = st.columns(3)
 
-    with col1:
-        st.metric(label="Jumlah Baris", value=f"{df.shape[0]:,}")
+        with col1:
+            st.metric(label="Jumlah Baris", value=f"{df.shape[0]:,}")
         
-    with col2:
-        st.metric(label="Jumlah Kolom", value=df.shape[1])
+        with col2:
+            st.metric(label="Jumlah Kolom", value=df.shape[1])
         
-    with col3:
-        st.metric(label="Jumlah Missing Values", value=f"{df.isnull().sum().sum():,}")
-
-    # Detailed data info
-    st.markdown("#### Informasi Detail Dataset")
-    data_info = pd.DataFrame({
-        'Kolom': df.columns,
-        'Tipe Data': [str(df[col].dtype) for col in df.columns],
-        'Missing Values': [df[col].isnull().sum() for col in df.columns],
-        'Unique Values': [df[col].nunique() for col in df.columns]
-    })
-    st.dataframe(data_info, width='stretch')
-
-    # Missing values handling
-    st.markdown("#### Cleaning Data - Penanganan Missing Values")
-    missing_values_cols = df.columns[df.isnull().any()].tolist()
-
-    if missing_values_cols:
-        st.write("Kolom-kolom dengan missing values:")
-        for col in missing_values_cols:
-            missing_pct = (df[col].isnull().sum() / len(df)) * 10  # Fixed calculation to multiply by 10
-            st.write(f"- **{col}**: {df[col].isnull().sum()} missing values ({missing_pct:.2f}%)")
+        raw_stats = load_stats(False).summary(*rollup_range, **rollup_filters)
+        with col3:
+            st.metric(label="Jumlah Missing Values", value=f"{raw_stats.nulls().sum():,}")
+
+        with instr.stage("data_info", rows_in=len(df)):
+            # Detailed data info
+            st.markdown("#### Informasi Detail Dataset")
+            data_info = pd.DataFrame({
+                'Kolom': df.columns,
+                'Tipe Data': [str(df[col].dtype) for col in df.columns],
+                'Missing Values': raw_stats.nulls().reindex(df.columns).to_numpy(),
+                'Unique Values': ([load_sketches().nunique(col, *rollup_range, **rollup_filters) for col in df.columns]
+                                  if approx_mode else [df[col].nunique() for col in df.columns])
+            })
+            st.dataframe(data_info, width='stretch')
+
+        with instr.stage("clean_missing", rows_in=len(df)) as stage:
+            # Missing values handling
+            st.markdown("#### Cleaning Data - Penanganan Missing Values")
+            missing_values_cols = df.columns[df.isnull().any()].tolist()
+
+            if missing_values_cols:
+                st.write("Kolom-kolom dengan missing values:")
+                for col in missing_values_cols:
+                    missing_pct = (df[col].isnull().sum() / len(df)) * 10  # Fixed calculation to multiply by 10
+                    st.write(f"- **{col}**: {df[col].isnull().sum()} missing values ({missing_pct:.2f}%)")
         
-        # Automatically fill all missing values with 'Unknown'
-        st.info("Mengisi semua missing values dengan 'Unknown'...")
-        df.fillna('Unknown', inplace=True)
-        st.success("✅ Semua missing values telah diisi dengan 'Unknown'")
+                # Automatically fill missing text values with 'Unknown'; tanggal/jam tetap NaT
+                st.info("Mengisi missing values pada kolom teks dengan 'Unknown'...")
+                text_cols = [col for col in missing_values_cols
+                             if pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col])]
+                df = df.fillna({col: 'Unknown' for col in text_cols})
+                st.success("✅ Missing values pada kolom teks telah diisi dengan 'Unknown'")
                         
-    else:
-        st.success("🎉 Tidak ada missing values dalam dataset!")
+            else:
+                st.success("🎉 Tidak ada missing values dalam dataset!")
+            stage.rows_out = len(df)
 
-    # Duplicate data handling
-    st.markdown("#### Cleaning Data - Penanganan Data Duplikat")
+        with instr.stage("deduplicate", rows_in=len(df)) as stage:
+            # Duplicate data handling
+            st.markdown("#### Cleaning Data - Penanganan Data Duplikat")
 
-    # Show information about the data before removing duplicates
-    st.info(f"Jumlah data sebelum membersihkan duplikat: {len(df)}")
+            # Show information about the data before removing duplicates
+            st.info(f"Jumlah data sebelum membersihkan duplikat: {len(df)}")
 
-    # Identify duplicates before removing them
-    duplicate_mask = df.duplicated(subset=['no_rawat'], keep=False)
-    duplicate_count = duplicate_mask.sum()
+            # Identify duplicates before removing them
+            deduplicator = load_deduplicator()
+            duplicate_mask = deduplicator.duplicated('no_rawat', keep=False, rows=df.index.to_numpy())
+            duplicate_count = duplicate_mask.sum()
 
-    if duplicate_count > 0:
-        st.warning(f"⚠️ Ditemukan {duplicate_count} baris data duplikat berdasarkan no_rawat dari total {len(df)} baris.")
+            if duplicate_count > 0:
+                st.warning(f"⚠️ Ditemukan {duplicate_count} baris data duplikat berdasarkan no_rawat dari total {len(df)} baris.")
         
-        # Show duplicate information BEFORE removing them
-        duplicate_rows = df[duplicate_mask].sort_values('no_rawat')
-        st.write(f"Data duplikat berdasarkan no_rawat:")
-    else:
-        st.success("🎉 Tidak ada data duplikat berdasarkan no_rawat dalam dataset!")
-
-    # Remove duplicates, keeping the first occurrence
-    df = df.drop_duplicates(subset=['no_rawat'], keep='first')
-
-    st.success(f"✅ Berhasil memastikan setiap pasien hanya memiliki satu nomor registrasi (no_rawat). Jumlah data sekarang: {len(df)}")
-    st.dataframe(df, width='stretch')
-
-
-    # Expandable section for detailed data types
-    with st.expander("📋 Info Tipe Data Pasien BPJS Add Antroll"):
-        buffer = pd.io.common.StringIO()
-        df.info(buf=buffer)
-        info_str = buffer.getvalue()
-        st.text(info_str)
+                # Show duplicate information BEFORE removing them
+                duplicate_rows = df[duplicate_mask].sort_values('no_rawat')
+                st.write(f"Data duplikat berdasarkan no_rawat:")
+            else:
+                st.success("🎉 Tidak ada data duplikat berdasarkan no_rawat dalam dataset!")
+
+            # Remove duplicates, keeping the first occurrence
+            df = df[~deduplicator.duplicated('no_rawat', keep='first', rows=df.index.to_numpy())]
+
+            st.success(f"✅ Berhasil memastikan setiap pasien hanya memiliki satu nomor registrasi (no_rawat). Jumlah data sekarang: {len(df)}")
+            grid_index = load_grid_index()
+            render_grid(grid_index, "grid_dedup", rows=grid_index.positions(df.index), source=df)
+            stage.rows_out = len(df)
+
+
+        with instr.stage("describe_all", rows_in=len(df)):
+            # Expandable section for detailed data types
+            with st.expander("📋 Info Tipe Data Pasien BPJS Add Antroll"):
+                info_str, describe_all = describe_all_columns(repr((rollup_range, rollup_filters)), df)
+                st.text(info_str)
         
-        # Add describe with all columns and styled
-        st.subheader("Statistik Deskriptif Semua Kolom")
-        st.dataframe(df.describe(include="all").style.background_gradient(cmap='RdPu'), width='stretch')
-
-# Tab 2: Ringkasan Statistik Deskriptif
-with tab2:
-    st.subheader("📈 Ringkasan Statistik Deskriptif")
-    st.markdown("#### Statistik Deskriptif untuk Kolom Numerik")
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-
-    if numeric_cols:
-        st.dataframe(df[numeric_cols].describe(), width='stretch')
-    else:
-        st.info("Tidak ada kolom numerik dalam dataset untuk ditampilkan statistik deskriptifnya.")
-
-    # Additional descriptive statistics for categorical columns
-    st.markdown("#### Statistik Deskriptif untuk Kolom Kategorikal")
-    categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
-
-    if categorical_cols:
-        for col in categorical_cols[0:3]:  # Display first 3 categorical columns to avoid clutter
-            st.markdown(f"##### Kolom: {col}")
-            value_counts = df[col].value_counts().head(10)  # Top 10 values
-            st.dataframe(value_counts, width='stretch')
-    else:
-        st.info("Tidak ada kolom kategorikal dalam dataset.")
-
-    # Frequency tables for important categorical variables
-    st.subheader("📊 Tabel Frekuensi untuk Variabel Kategorikal")
-
-    # Define important categorical columns to display
-    important_categorical_cols = ['status', 'nm_poli', 'jk', 'nm_pasien']  # Adjust based on actual dataset
-    available_categorical_cols = [col for col in important_categorical_cols if col in df.columns]
-
-    if available_categorical_cols:
-        for col in available_categorical_cols:
-            with st.expander(f"Tabel Frekuensi: {col}"):
-                freq_table = df[col].value_counts().reset_index()
-                freq_table.columns = [col, 'Frekuensi']
-                freq_table['Persentase'] = (freq_table['Frekuensi'] / freq_table['Frekuensi'].sum()) * 100
-                st.dataframe(freq_table, width='stretch')
-    else:
-        st.info("Tidak ada variabel kategorikal penting yang ditemukan dalam dataset.")
-
-    # Correlation Analysis
-    st.subheader("🔗 Analisis Korelasi Antar Variabel")
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-
-    if len(numeric_cols) >= 2:
-        # Create correlation matrix
-        corr_matrix = df[numeric_cols].corr()
+                # Add describe with all columns and styled
+                st.subheader("Statistik Deskriptif Semua Kolom")
+                st.dataframe(describe_all.style.background_gradient(cmap='RdPu'), width='stretch')
+
+    # Tab 2: Ringkasan Statistik Deskriptif
+    with tab2:
+        st.subheader("📈 Ringkasan Statistik Deskriptif")
+        with instr.stage("describe", rows_in=len(df)):
+            st.markdown("#### Statistik Deskriptif untuk Kolom Numerik")
+            stats = load_stats(True).summary(*rollup_range, **rollup_filters)
+            numeric_cols = stats.numeric_columns
+
+            if numeric_cols:
+                # count/mean/std/min/max dari momen; kuartil exact dari data atau perkiraan dari t-digest
+                if approx_mode:
+                    sketches = load_sketches()
+                    quartiles = pd.DataFrame({col: sketches.quantiles(col, [0.25, 0.5, 0.75], *rollup_range, **rollup_filters)
+                                              for col in numeric_cols})
+                else:
+                    quartiles = df[numeric_cols].quantile([0.25, 0.5, 0.75])
+                st.dataframe(stats.describe(quartiles), width='stretch')
+            else:
+                st.info("Tidak ada kolom numerik dalam dataset untuk ditampilkan statistik deskriptifnya.")
+
+            # Additional descriptive statistics for categorical columns
+            st.markdown("#### Statistik Deskriptif untuk Kolom Kategorikal")
+            categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
+
+            if categorical_cols:
+                for col in categorical_cols[0:3]:  # Display first 3 categorical columns to avoid clutter
+                    st.markdown(f"##### Kolom: {col}")
+                    value_counts = df[col].value_counts().head(10)  # Top 10 values
+                    st.dataframe(value_counts, width='stretch')
+            else:
+                st.info("Tidak ada kolom kategorikal dalam dataset.")
+
+        with instr.stage("frequency_tables", rows_in=len(df)):
+            # Frequency tables for important categorical variables
+            st.subheader("📊 Tabel Frekuensi untuk Variabel Kategorikal")
+
+            # Define important categorical columns to display
+            important_categorical_cols = ['status', 'nm_poli', 'jk', 'nm_pasien']  # Adjust based on actual dataset
+            available_categorical_cols = [col for col in important_categorical_cols if col in df.columns]
+
+            if available_categorical_cols:
+                for col in available_categorical_cols:
+                    with st.expander(f"Tabel Frekuensi: {col}"):
+                        freq_table = df[col].value_counts().reset_index()
+                        freq_table.columns = [col, 'Frekuensi']
+                        freq_table['Persentase'] = (freq_table['Frekuensi'] / freq_table['Frekuensi'].sum()) * 100
+                        st.dataframe(freq_table, width='stretch')
+            else:
+                st.info("Tidak ada variabel kategorikal penting yang ditemukan dalam dataset.")
+
+        with instr.stage("correlation", rows_in=len(df)):
+            # Correlation Analysis
+            st.subheader("🔗 Analisis Korelasi Antar Variabel")
+            numeric_cols = stats.numeric_columns
+
+            if len(numeric_cols) >= 2:
+                # Create correlation matrix (digabung dari cross-product per partisi)
+                corr_matrix = stats.corr()
         
-        # Display correlation matrix as heatmap using Plotly
-        fig_corr = px.imshow(
-            corr_matrix,
-            text_auto=True,
-            aspect="auto",
-            title="Heatmap Korelasi Antar Variabel Numerik",
-            color_continuous_scale='RdBu',
-            zmin=-1, zmax=1
-        )
-        fig_corr.update_layout(height=500)
-        st.plotly_chart(fig_corr, width='stretch')
+                # Display correlation matrix as heatmap using Plotly
+                fig_corr = px.imshow(
+                    corr_matrix,
+                    text_auto=True,
+                    aspect="auto",
+                    title="Heatmap Korelasi Antar Variabel Numerik",
+                    color_continuous_scale='RdBu',
+                    zmin=-1, zmax=1
+                )
+                fig_corr.update_layout(height=500)
+                st.plotly_chart(fig_corr, width='stretch')
         
-        # Show top correlations
-        st.markdown("#### Korelasi Tertinggi")
-        # Unstack the correlation matrix to find top correlations
-        corr_pairs = corr_matrix.abs().unstack()
-        # Sort the correlation pairs and remove self-correlations
-        sorted_corr_pairs = corr_pairs.sort_values(kind="quicksort", ascending=False)
-        # Remove self-correlations (correlations of variables with themselves)
-        top_corr_pairs = sorted_corr_pairs[sorted_corr_pairs < 1.0]
+                # Show top correlations
+                st.markdown("#### Korelasi Tertinggi")
+                # Unstack the correlation matrix to find top correlations
+                corr_pairs = corr_matrix.abs().unstack()
+                # Sort the correlation pairs and remove self-correlations
+                sorted_corr_pairs = corr_pairs.sort_values(kind="quicksort", ascending=False)
+                # Remove self-correlations (correlations of variables with themselves)
+                top_corr_pairs = sorted_corr_pairs[sorted_corr_pairs < 1.0]
         
-        if len(top_corr_pairs) > 0:
-            top_5_corr = top_corr_pairs.head(5)
-            top_corr_df = pd.DataFrame({
-                'Pasangan Variabel': top_5_corr.index.map(lambda x: f"{x[0]} - {x[1]}"),
-                'Korelasi': top_5_corr.values
-            })
-            st.dataframe(top_corr_df, width='stretch')
-        else:
-            st.info("Tidak ada korelasi yang dapat dihitung antar variabel numerik.")
-    else:
-        st.info("Tidak cukup variabel numerik dalam dataset untuk melakukan analisis korelasi.")
-
-    # Main KPIs
-    st.subheader("📊 KPI Utama")
-
-    col1, col2, col3, col4 = st.columns(4)
-
-    total_records = len(df)
-    total_success = len(df[df['status'] == 'Sudah'])
-    total_failed = len(df[df['status'] == 'Gagal'])
-    success_rate = (total_success / total_records * 10) if total_records > 0 else 0
-
-    with col1:
-        st.metric(label="Total Registrasi", value=f"{total_records:,}")
-
-    with col2:
-        st.metric(label="Sukses", value=f"{total_success:,}", delta=f"{success_rate:.1f}%")
-
-    with col3:
-        st.metric(label="Gagal", value=f"{total_failed:,}")
-
-    with col4:
-        st.metric(label="Rata-rata Kunjungan/Hari", 
-                  value=f"{df.groupby(df['tgl_registrasi'].dt.date).size().mean():.1f}")
-
-    # Charts
-    st.subheader("📈 Visualisasi Data")
-
-    # Chart 1: Status Distribution
-    col1, col2 = st.columns(2)
-
-    with col1:
-        status_counts = df['status'].value_counts()
-        fig_status = px.bar(
-            x=status_counts.index, 
-            y=status_counts.values,
-            title="Distribusi Status Registrasi",
-            labels={'x': 'Status', 'y': 'Jumlah'},
-            color=status_counts.index,
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        fig_status.update_layout(showlegend=False)
-        st.plotly_chart(fig_status, width='stretch')
-
-    with col2:
-        # Top 5 Poli by Total Registrations
-        top_poli = df['nm_poli'].value_counts().head(5)
-        fig_poli = px.bar(
-            x=top_poli.values, 
-            y=top_poli.index,
-            title="Top 5 Poliklinik",
-            labels={'x': 'Jumlah Registrasi', 'y': 'Poliklinik'},
-            orientation='h',
-            color=top_poli.index,
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        fig_poli.update_layout(showlegend=False)
-        st.plotly_chart(fig_poli, width='stretch')
-
-    # Chart 2: Daily Trend
-    st.subheader("📅 Tren Kunjungan Harian")
-    daily_trend = df.groupby(df['tgl_registrasi'].dt.date).size().reset_index(name='count')
-    fig_trend = px.line(
-        daily_trend, 
-        x='tgl_registrasi', 
-        y='count',
-        title="Tren Kunjungan Harian",
-        labels={'tgl_registrasi': 'Tanggal', 'count': 'Jumlah Kunjungan'}
-    )
-    st.plotly_chart(fig_trend, width='stretch')
-
-    # Chart 3: Status by Poli
-    st.subheader("🏥 Status Registrasi per Poliklinik")
-    status_poli = df.groupby(['nm_poli', 'status']).size().reset_index(name='count')
-    fig_status_poli = px.bar(
-        status_poli, 
-        x='nm_poli', 
-        y='count', 
-        color='status',
-        title="Status Registrasi per Poliklinik",
-        labels={'nm_poli': 'Poliklinik', 'count': 'Jumlah'},
-        barmode='group'
-    )
-    fig_status_poli.update_layout(xaxis_tickangle=-45)
-    st.plotly_chart(fig_status_poli, width='stretch')
-
-    # Chart 4: Age Distribution (if age column exists) or Patient Distribution
-    st.subheader("👥 Distribusi Pasien")
-    if 'umur' in df.columns:
-        fig_age = px.histogram(df, x='umur', nbins=30, title="Distribusi Umur Pasien")
-        st.plotly_chart(fig_age, width='stretch')
-    else:
-        # Distribution by gender if available
-        if 'jk' in df.columns or 'jenis_kelamin' in df.columns:
-            gender_col = 'jk' if 'jk' in df.columns else 'jenis_kelamin'
-            gender_counts = df[gender_col].value_counts()
-            fig_gender = px.pie(
-                values=gender_counts.values, 
-                names=gender_counts.index,
-                title="Distribusi Jenis Kelamin Pasien"
+                if len(top_corr_pairs) > 0:
+                    top_5_corr = top_corr_pairs.head(5)
+                    top_corr_df = pd.DataFrame({
+                        'Pasangan Variabel': top_5_corr.index.map(lambda x: f"{x[0]} - {x[1]}"),
+                        'Korelasi': top_5_corr.values
+                    })
+                    st.dataframe(top_corr_df, width='stretch')
+                else:
+                    st.info("Tidak ada korelasi yang dapat dihitung antar variabel numerik.")
+            else:
+                st.info("Tidak cukup variabel numerik dalam dataset untuk melakukan analisis korelasi.")
+
+        with instr.stage("calculate_kpis", rows_in=len(df)):
+            # Main KPIs
+            st.subheader("📊 KPI Utama")
+
+            col1, col2, col3, col4 = st.columns(4)
+
+            total_records = len(df)
+            total_success = len(df[df['status'] == 'Sudah'])
+            total_failed = len(df[df['status'] == 'Gagal'])
+            success_rate = (total_success / total_records * 10) if total_records > 0 else 0
+
+            with col1:
+                st.metric(label="Total Registrasi", value=f"{total_records:,}")
+
+            with col2:
+                st.metric(label="Sukses", value=f"{total_success:,}", delta=f"{success_rate:.1f}%")
+
+            with col3:
+                st.metric(label="Gagal", value=f"{total_failed:,}")
+
+            with col4:
+                st.metric(label="Rata-rata Kunjungan/Hari", 
+                          value=f"{rollup_slice('day').groupby('tanggal')['count'].sum().mean():.1f}")
+
+        # Charts
+        st.subheader("📈 Visualisasi Data")
+
+        with instr.stage("chart_status_poli_top", rows_in=len(df)):
+            # Chart 1: Status Distribution
+            col1, col2 = st.columns(2)
+
+            with col1:
+                status_counts = df['status'].value_counts()
+                fig_status = px.bar(
+                    x=status_counts.index, 
+                    y=status_counts.values,
+                    title="Distribusi Status Registrasi",
+                    labels={'x': 'Status', 'y': 'Jumlah'},
+                    color=status_counts.index,
+                    color_discrete_sequence=px.colors.qualitative.Set3
+                )
+                fig_status.update_layout(showlegend=False)
+                st.plotly_chart(fig_status, width='stretch')
+
+            with col2:
+                # Top 5 Poli by Total Registrations
+                top_poli = df['nm_poli'].value_counts().head(5)
+                fig_poli = px.bar(
+                    x=top_poli.values, 
+                    y=top_poli.index,
+                    title="Top 5 Poliklinik",
+                    labels={'x': 'Jumlah Registrasi', 'y': 'Poliklinik'},
+                    orientation='h',
+                    color=top_poli.index,
+                    color_discrete_sequence=px.colors.qualitative.Set3
+                )
+                fig_poli.update_layout(showlegend=False)
+                st.plotly_chart(fig_poli, width='stretch')
+
+        with instr.stage("chart_daily_trend", rows_in=len(df)):
+            # Chart 2: Daily Trend
+            st.subheader("📅 Tren Kunjungan Harian")
+            daily_trend = rollup_slice('day').groupby('tanggal')['count'].sum().reset_index()
+            fig_trend = px.line(
+                daily_trend, 
+                x='tanggal', 
+                y='count',
+                title="Tren Kunjungan Harian",
+                labels={'tanggal': 'Tanggal', 'count': 'Jumlah Kunjungan'}
             )
-            st.plotly_chart(fig_gender, width='stretch')
-        else:
-            # Show registration time distribution with 10-minute intervals
-            # Convert time column to string format for grouping
-            df['jam_reg_str'] = df['jam_reg'].astype(str)
-            
-            # Convert time strings to datetime and group into 10-minute intervals
-            time_series = pd.to_datetime(df['jam_reg_str'], format='%H:%M:%S', errors='coerce')
-            df['jam_reg_10min'] = time_series.dt.floor('10min').dt.time.astype(str)
-            
-            # Count occurrences of each 10-minute interval and sort by time
-            time_counts = df['jam_reg_10min'].value_counts().sort_index()
-            
-            # Create line chart showing time distribution
-            fig_time = px.line(
-                x=time_counts.index,
-                y=time_counts.values,
-                title="Distribusi Waktu Registrasi (Interval 10 Menit)",
-                labels={'x': 'Waktu', 'y': 'Jumlah Registrasi'}
+            st.plotly_chart(fig_trend, width='stretch')
+
+        with instr.stage("chart_status_per_poli", rows_in=len(df)):
+            # Chart 3: Status by Poli
+            st.subheader("🏥 Status Registrasi per Poliklinik")
+            status_poli = rollup_slice('day').groupby(['nm_poli', 'status'], observed=True)['count'].sum().reset_index()
+            fig_status_poli = px.bar(
+                status_poli, 
+                x='nm_poli', 
+                y='count', 
+                color='status',
+                title="Status Registrasi per Poliklinik",
+                labels={'nm_poli': 'Poliklinik', 'count': 'Jumlah'},
+                barmode='group'
             )
+            fig_status_poli.update_layout(xaxis_tickangle=-45)
+            st.plotly_chart(fig_status_poli, width='stretch')
+
+        with instr.stage("chart_patient_distribution", rows_in=len(df)):
+            # Chart 4: Age Distribution (if age column exists) or Patient Distribution
+            st.subheader("👥 Distribusi Pasien")
+            if 'umur' in df.columns:
+                fig_age = px.histogram(df, x='umur', nbins=30, title="Distribusi Umur Pasien")
+                st.plotly_chart(fig_age, width='stretch')
+            else:
+                # Distribution by gender if available
+                if 'jk' in df.columns or 'jenis_kelamin' in df.columns:
+                    gender_col = 'jk' if 'jk' in df.columns else 'jenis_kelamin'
+                    gender_counts = df[gender_col].value_counts()
+                    fig_gender = px.pie(
+                        values=gender_counts.values, 
+                        names=gender_counts.index,
+                        title="Distribusi Jenis Kelamin Pasien"
+                    )
+                    st.plotly_chart(fig_gender, width='stretch')
+                else:
+                    # Show registration time distribution with 10-minute intervals
+                    # Bucket 10 menit (detik sejak tengah malam) diambil dari rollup, diurutkan menurut waktu
+                    time_counts = rollup_slice('10min').groupby('bucket')['count'].sum().sort_index()
+                    time_counts.index = [f"{b // 3600:02d}:{b % 3600 // 60:02d}:00" for b in time_counts.index]
             
-            # Rotate x-axis labels for better readability and adjust layout
-            fig_time.update_layout(xaxis_tickangle=-45)
+                    # Create line chart showing time distribution
+                    fig_time = px.line(
+                        x=time_counts.index,
+                        y=time_counts.values,
+                        title="Distribusi Waktu Registrasi (Interval 10 Menit)",
+                        labels={'x': 'Waktu', 'y': 'Jumlah Registrasi'}
+                    )
             
-            # Display the chart in Streamlit
-            st.plotly_chart(fig_time, width='stretch')
-
-# Tab 3: Exploratory Data Analysis (Deskriptif)
-with tab3:
-    st.subheader("🔍 Visualisasi Pola dan Tren yang Lebih Kompleks")
-
-    # Create tabs for different complex visualizations
-    tab3a, tab3b, tab3c = st.tabs(["Distribusi Waktu", "Status vs Poli", "Tren Berdasarkan Hari"])
-
-    with tab3a:
-        st.markdown("#### Distribusi Registrasi Berdasarkan Waktu")
-        if 'jam_reg' in df.columns:
-            # Group by hour
-            df['hour'] = pd.to_datetime(df['jam_reg'], format='%H:%M:%S', errors='coerce').dt.hour
-            df_hourly = df.groupby('hour').size().reset_index(name='count')
+                    # Rotate x-axis labels for better readability and adjust layout
+                    fig_time.update_layout(xaxis_tickangle=-45)
             
-            fig_hourly = px.bar(
-                df_hourly,
-                x='hour',
-                y='count',
-                title="Distribusi Jumlah Registrasi Berdasarkan Jam",
-                labels={'hour': 'Jam', 'count': 'Jumlah Registrasi'},
-                color='count',
-                color_continuous_scale='viridis'
-            )
-            st.plotly_chart(fig_hourly, width='stretch')
-        else:
-            st.info("Kolom waktu registrasi tidak tersedia dalam dataset.")
-
-    with tab3b:
-        st.markdown("#### Status Registrasi Berdasarkan Poliklinik (Heatmap)")
-        if 'nm_poli' in df.columns and 'status' in df.columns:
-            # Create a pivot table for heatmap
-            heatmap_data = df.groupby(['nm_poli', 'status']).size().reset_index(name='count')
-            heatmap_pivot = heatmap_data.pivot(index='nm_poli', columns='status', values='count').fillna(0)
+                    # Display the chart in Streamlit
+                    st.plotly_chart(fig_time, width='stretch')
+
+    # Tab 3: Exploratory Data Analysis (Deskriptif)
+    with tab3:
+        st.subheader("🔍 Visualisasi Pola dan Tren yang Lebih Kompleks")
+
+        # Create tabs for different complex visualizations
+        tab3a, tab3b, tab3c = st.tabs(["Distribusi Waktu", "Status vs Poli", "Tren Berdasarkan Hari"])
+
+        with instr.stage("chart_hourly", rows_in=len(df)):
+            with tab3a:
+                st.markdown("#### Distribusi Registrasi Berdasarkan Waktu")
+                if 'jam_reg' in df.columns:
+                    # Group by hour
+                    df_hourly = rollup_slice('hour').groupby('bucket')['count'].sum().reset_index()
+                    df_hourly['hour'] = df_hourly['bucket'] // 3600
             
-            fig_heatmap = px.imshow(
-                heatmap_pivot,
-                text_auto=True,
-                aspect="auto",
-                title="Heatmap Status Registrasi per Poliklinik",
-                color_continuous_scale='Blues'
-            )
-            fig_heatmap.update_layout(height=500)
-            st.plotly_chart(fig_heatmap, width='stretch')
-        else:
-            st.info("Kolom poliklinik atau status tidak tersedia dalam dataset.")
-
-    with tab3c:
-        st.markdown("#### Tren Harian dengan Indikator Status")
-        if 'tgl_registrasi' in df.columns and 'status' in df.columns:
-            # Group by date and status
-            daily_status = df.groupby([df['tgl_registrasi'].dt.date, 'status']).size().reset_index(name='count')
+                    fig_hourly = px.bar(
+                        df_hourly,
+                        x='hour',
+                        y='count',
+                        title="Distribusi Jumlah Registrasi Berdasarkan Jam",
+                        labels={'hour': 'Jam', 'count': 'Jumlah Registrasi'},
+                        color='count',
+                        color_continuous_scale='viridis'
+                    )
+                    st.plotly_chart(fig_hourly, width='stretch')
+                else:
+                    st.info("Kolom waktu registrasi tidak tersedia dalam dataset.")
+
+        with instr.stage("chart_heatmap", rows_in=len(df)):
+            with tab3b:
+                st.markdown("#### Status Registrasi Berdasarkan Poliklinik (Heatmap)")
+                if 'nm_poli' in df.columns and 'status' in df.columns:
+                    # Create a pivot table for heatmap
+                    heatmap_data = rollup_slice('day').groupby(['nm_poli', 'status'], observed=True)['count'].sum().reset_index()
+                    heatmap_pivot = heatmap_data.pivot(index='nm_poli', columns='status', values='count').fillna(0)
             
-            fig_daily_status = px.line(
-                daily_status,
-                x='tgl_registrasi',
-                y='count',
-                color='status',
-                title="Tren Harian Berdasarkan Status Registrasi",
-                labels={'tgl_registrasi': 'Tanggal', 'count': 'Jumlah Registrasi'}
-            )
-            st.plotly_chart(fig_daily_status, width='stretch')
-        else:
-            st.info("Kolom tanggal registrasi atau status tidak tersedia dalam dataset.")
-
-# Tab 4: Exploratory Data Analysis (Lanjutan)
-with tab4:
-    st.subheader("🔍 EDA Lanjutan")
+                    fig_heatmap = px.imshow(
+                        heatmap_pivot,
+                        text_auto=True,
+                        aspect="auto",
+                        title="Heatmap Status Registrasi per Poliklinik",
+                        color_continuous_scale='Blues'
+                    )
+                    fig_heatmap.update_layout(height=500)
+                    st.plotly_chart(fig_heatmap, width='stretch')
+                else:
+                    st.info("Kolom poliklinik atau status tidak tersedia dalam dataset.")
+
+        with instr.stage("chart_daily_status", rows_in=len(df)):
+            with tab3c:
+                st.markdown("#### Tren Harian dengan Indikator Status")
+                if 'tgl_registrasi' in df.columns and 'status' in df.columns:
+                    # Group by date and status
+                    daily_status = rollup_slice('day').groupby(['tanggal', 'status'], observed=True)['count'].sum().reset_index()
+            
+                    fig_daily_status = px.line(
+                        daily_status,
+                        x='tanggal',
+                        y='count',
+                        color='status',
+                        title="Tren Harian Berdasarkan Status Registrasi",
+                        labels={'tanggal': 'Tanggal', 'count': 'Jumlah Registrasi'}
+                    )
+                    st.plotly_chart(fig_daily_status, width='stretch')
+                else:
+                    st.info("Kolom tanggal registrasi atau status tidak tersedia dalam dataset.")
+
+    # Tab 4: Exploratory Data Analysis (Lanjutan)
+    with tab4:
+        st.subheader("🔍 EDA Lanjutan")
     
-    # Patients with high visit count (>=10 visits)
-    st.subheader("📈 Pasien dengan Banyak Kunjungan")
-    patient_counts = df['nm_pasien'].value_counts()
-    high_visitors = patient_counts[patient_counts >= 10]
+        with instr.stage("high_visitors", rows_in=len(df)):
+            # Patients with high visit count (>=10 visits)
+            st.subheader("📈 Pasien dengan Banyak Kunjungan")
+            high_visitors = load_topk()['nm_pasien'].at_least(10, *rollup_range, **rollup_filters) \
+                .set_index('item')
+            # count adalah batas atas; error > 0 hanya jika ada partisi yang harus dipangkas
+            max_error = int(high_visitors['error'].max()) if len(high_visitors) > 0 else 0
+            high_visitors = high_visitors['count']
     
-    if len(high_visitors) > 0:
-        st.write(f"Jumlah pasien dengan ≥10 kunjungan: {len(high_visitors)}")
-        fig_high_visitors = px.bar(
-            x=high_visitors.index[:10], 
-            y=high_visitors.values[:10],
-            title="Top 10 Pasien dengan Kunjungan Terbanyak",
-            labels={'x': 'Nama Pasien', 'y': 'Jumlah Kunjungan'}
-        )
-        fig_high_visitors.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig_high_visitors, width='stretch')
-    else:
-        st.write("Tidak ada pasien dengan ≥10 kunjungan dalam periode ini.")
+            if len(high_visitors) > 0:
+                st.write(f"Jumlah pasien dengan ≥10 kunjungan: {len(high_visitors)}")
+                if max_error > 0:
+                    st.caption(f"Hitungan dari ringkasan top-K: batas atas, galat maksimum {max_error} kunjungan.")
+                fig_high_visitors = px.bar(
+                    x=high_visitors.index[:10], 
+                    y=high_visitors.values[:10],
+                    title="Top 10 Pasien dengan Kunjungan Terbanyak",
+                    labels={'x': 'Nama Pasien', 'y': 'Jumlah Kunjungan'}
+                )
+                fig_high_visitors.update_layout(xaxis_tickangle=-45)
+                st.plotly_chart(fig_high_visitors, width='stretch')
+            else:
+                st.write("Tidak ada pasien dengan ≥10 kunjungan dalam periode ini.")
     
-    # Error analysis
-    st.subheader("⚠️ Analisis Keterangan Error")
-    error_counts = df[df['status'] == 'Gagal']['keterangan'].value_counts()
-    if len(error_counts) > 0:
-        fig_errors = px.bar(
-            x=error_counts.values[:10], 
-            y=error_counts.index[:10],
-            title="Top 10 Alasan Kegagalan",
-            labels={'x': 'Jumlah', 'y': 'Keterangan Error'},
-            orientation='h'
-        )
-        st.plotly_chart(fig_errors, width='stretch')
-    else:
-        st.write("Tidak ada data error dalam periode ini.")
-
-# Tab 5: Insight & Kesimpulan
-with tab5:
-    # Failed patients table
-    st.subheader("❌ Daftar Pasien Gagal")
-    failed_patients = df[df['status'] == 'Gagal'][['tgl_registrasi', 'nm_pasien', 'nm_poli', 'keterangan', 'USER']]
-    if not failed_patients.empty:
-        st.dataframe(failed_patients, width='stretch')
+        with instr.stage("error_analysis", rows_in=len(df)):
+            # Error analysis
+            st.subheader("⚠️ Analisis Keterangan Error")
+            status_selection = rollup_filters.get('status')
+            if status_selection is not None and len(status_selection) > 0 and 'Gagal' not in list(status_selection):
+                error_counts = pd.Series(dtype='int64')
+            else:
+                error_counts = load_topk()['keterangan'].query(*rollup_range, **{**rollup_filters, 'status': ['Gagal']}) \
+                    .set_index('item')['count']
+            if len(error_counts) > 0:
+                fig_errors = px.bar(
+                    x=error_counts.values[:10], 
+                    y=error_counts.index[:10],
+                    title="Top 10 Alasan Kegagalan",
+                    labels={'x': 'Jumlah', 'y': 'Keterangan Error'},
+                    orientation='h'
+                )
+                st.plotly_chart(fig_errors, width='stretch')
+            else:
+                st.write("Tidak ada data error dalam periode ini.")
+
+    # Tab 5: Insight & Kesimpulan
+    with tab5:
+        with instr.stage("failed_patients", rows_in=len(df)):
+            # Failed patients table
+            st.subheader("❌ Daftar Pasien Gagal")
+            failed_patients = df[df['status'] == 'Gagal'][['tgl_registrasi', 'nm_pasien', 'nm_poli', 'keterangan', 'USER']]
+            if not failed_patients.empty:
+                render_grid(load_grid_index(), "grid_failed", rows=load_grid_index().positions(failed_patients.index),
+                            columns=failed_patients.columns, source=failed_patients)
         
-        # Download button for failed patients
-        csv = failed_patients.to_csv(index=False)
-        st.download_button(
-            label="📥 Download CSV Pasien Gagal",
-            data=csv,
-            file_name="pasien_gagal_bpjs_antrol.csv",
-            mime="text/csv"
-        )
-    else:
-        st.write("Tidak ada pasien gagal dalam periode ini.")
+                # Download pasien gagal (ditulis per chunk di background)
+                render_table_export(get_export_service(), failed_patients, "pasien_gagal_bpjs_antrol",
+                                    load_dataset_version(), filter_state, key="export_failed",
+                                    label="📥 Download Pasien Gagal")
+            else:
+                st.write("Tidak ada pasien gagal dalam periode ini.")
     
-    # Raw data table (optional)
-    with st.expander("📋 Lihat Data"):
-        st.dataframe(df, width='stretch')
+        with instr.stage("raw_data", rows_in=len(df)):
+            # Raw data table (optional)
+            with st.expander("📋 Lihat Data"):
+                render_grid(load_grid_index(), "grid_raw", rows=load_grid_index().positions(df.index), source=df)
         
-        # Download button for raw data
-        csv = df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download CSV Data Pasien BPJS Add Antroll",
-            data=csv,
-            file_name="bpjs_antrol_raw_data.csv",
-            mime="text/csv"
-        )
-    
-    # Insights and Conclusions
-    st.subheader("💡 Insight & Kesimpulan")
-    st.markdown("""
-    ### Temuan Utama Berdasarkan Analisis Data:
-    1. **Tren Registrasi**: Pola registrasi pasien BPJS dapat dianalisis berdasarkan waktu, hari, dan poliklinik yang paling banyak dikunjungi.
-    2. **Tingkat Keberhasilan**: Persentase keberhasilan registrasi dapat diidentifikasi dan dianalisis penyebab kegagalannya.
-    3. **Pola Waktu**: Jam-jam sibuk pendaftaran dapat diidentifikasi untuk membantu manajemen antrian.
-    4. **Distribusi Poliklinik**: Poliklinik mana yang paling banyak digunakan dan perlu diberikan perhatian lebih.
+                # Download data terfilter (ditulis per chunk di background)
+                render_table_export(get_export_service(), df, "bpjs_antrol_raw_data", load_dataset_version(),
+                                    filter_state, key="export_raw", label="📥 Download Data Pasien BPJS Add Antroll")
+
+        # Laporan KPI dan chart untuk rapat (PNG/PDF), dirender di background
+        st.subheader("📄 Laporan KPI")
+
+        def report_contents():
+            total = len(df)
+            success = int((df['status'] == 'Sudah').sum())
+            kpis = {
+                "Total Registrasi": f"{total:,}",
+                "Sukses": f"{success:,}",
+                "Gagal": f"{int((df['status'] == 'Gagal').sum()):,}",
+                "Tingkat Sukses": f"{success / total * 100:.1f}%" if total else "-",
+            }
+            charts = {
+                "Distribusi Status Registrasi": df['status'].value_counts(),
+                "Registrasi per Poliklinik": df['nm_poli'].value_counts(),
+            }
+            return kpis, charts
+
+        render_report_export(get_export_service(), "laporan_bpjs_antrol", load_dataset_version(), filter_state,
+                             key="report_bpjs", title="Dashboard Pasien BPJS Add Antroll", contents=report_contents)
+
+        # Insights and Conclusions
+        st.subheader("💡 Insight & Kesimpulan")
+        st.markdown("""
+        ### Temuan Utama Berdasarkan Analisis Data:
+        1. **Tren Registrasi**: Pola registrasi pasien BPJS dapat dianalisis berdasarkan waktu, hari, dan poliklinik yang paling banyak dikunjungi.
+        2. **Tingkat Keberhasilan**: Persentase keberhasilan registrasi dapat diidentifikasi dan dianalisis penyebab kegagalannya.
+        3. **Pola Waktu**: Jam-jam sibuk pendaftaran dapat diidentifikasi untuk membantu manajemen antrian.
+        4. **Distribusi Poliklinik**: Poliklinik mana yang paling banyak digunakan dan perlu diberikan perhatian lebih.
     
-    ### Rekomendasi:
-    1. **Optimalisasi Pelayanan**: Berdasarkan pola waktu registrasi, dapat diatur penjadwalan petugas yang lebih efisien.
-    2. **Perbaikan Sistem**: Analisis keterangan error dapat digunakan untuk mengidentifikasi dan memperbaiki masalah teknis dalam sistem registrasi.
-    3. **Pengalokasian Sumber Daya**: Berdasarkan distribusi poliklinik, dapat dilakukan pengalokasian sumber daya yang lebih merata sesuai kebutuhan.
-    4. **Peningkatan Kualitas Data**: Dengan pemeriksaan kualitas data yang telah dilakukan, dapat diusulkan perbaikan dalam pengumpulan dan pencatatan data.
-    """)
+        ### Rekomendasi:
+        1. **Optimalisasi Pelayanan**: Berdasarkan pola waktu registrasi, dapat diatur penjadwalan petugas yang lebih efisien.
+        2. **Perbaikan Sistem**: Analisis keterangan error dapat digunakan untuk mengidentifikasi dan memperbaiki masalah teknis dalam sistem registrasi.
+        3. **Pengalokasian Sumber Daya**: Berdasarkan distribusi poliklinik, dapat dilakukan pengalokasian sumber daya yang lebih merata sesuai kebutuhan.
+        4. **Peningkatan Kualitas Data**: Dengan pemeriksaan kualitas data yang telah dilakukan, dapat diusulkan perbaikan dalam pengumpulan dan pencatatan data.
+        """)
     
-    # Executive Summary
-    st.subheader("📋 Ringkasan Eksekutif")
-    st.markdown("""
-    Dashboard ini menyediakan analisis komprehensif terhadap data registrasi pasien BPJS Add Antroll.
-    Dengan menggunakan berbagai teknik eksplorasi data, visualisasi, dan analisis statistik,
-    dashboard ini membantu dalam memahami pola penggunaan layanan, tingkat keberhasilan registrasi,
-    dan faktor-faktor yang mempengaruhi kegagalan sistem.
+        # Executive Summary
+        st.subheader("📋 Ringkasan Eksekutif")
+        st.markdown("""
+        Dashboard ini menyediakan analisis komprehensif terhadap data registrasi pasien BPJS Add Antroll.
+        Dengan menggunakan berbagai teknik eksplorasi data, visualisasi, dan analisis statistik,
+        dashboard ini membantu dalam memahami pola penggunaan layanan, tingkat keberhasilan registrasi,
+        dan faktor-faktor yang mempengaruhi kegagalan sistem.
     
-    Melalui fitur interaktif yang disediakan, pengguna dapat melakukan filtering data berdasarkan tanggal,
-    poliklinik, dan status registrasi untuk mendapatkan insight yang lebih spesifik sesuai kebutuhan.
-    Dashboard ini diharapkan dapat mendukung pengambilan keputusan yang lebih baik dalam
-    pengelolaan layanan kesehatan dan sistem informasi rumah sakit.
-    """)
+        Melalui fitur interaktif yang disediakan, pengguna dapat melakukan filtering data berdasarkan tanggal,
+        poliklinik, dan status registrasi untuk mendapatkan insight yang lebih spesifik sesuai kebutuhan.
+        Dashboard ini diharapkan dapat mendukung pengambilan keputusan yang lebih baik dalam
+        pengelolaan layanan kesehatan dan sistem informasi rumah sakit.
+        """)
     
-    # Footer
-    st.markdown("---")
-    st.markdown("*Dashboard ini menampilkan analisis pendaftaran BPJS (Add Antroll) - Data diperbarui secara real-time dari database*")
\ No newline at end of file
+        # Footer
+        st.markdown("---")
+        st.markdown("*Dashboard ini menampilkan analisis pendaftaran BPJS (Add Antroll) - Data diperbarui secara real-time dari database*")
+
+    render_debug_panel(instr, {"utama": filter_plan})
+finally:
+    # Simpan trace profiling beserta state filter yang menghasilkannya
+    if profile_trace is not None:
+        rerun_profiler.stop(profile_trace, {
+            "filters": filter_state,
+            "query_params": profile_query_params,
+        })
@@ -0,0 +1,59 @@
+"""
+Export Download Component
+"""
+from concurrent.futures import Future
+from typing import Any, Callable, Mapping, Optional, Tuple
+import pandas as pd
+import streamlit as st
+from src.data.export import FORMATS, REPORT_FORMATS, ExportService, available_formats
+
+# Interval polling status pekerjaan background (detik)
+POLL_SECONDS = 1.0
+
+
+def render_job(job: Future, label: str, file_name: str, mime: str, key: str) -> None:
+    """Download button once the background file is ready; until then a self-refreshing status line"""
+    if job.done():
+        if job.exception() is not None:
+            st.error(f"Ekspor gagal: {job.exception()}")
+            return
+        path = job.result()
+        # File dibaca hanya saat tombol diklik (deferred), bukan di setiap rerun
+        st.download_button(label, data=path.read_bytes, file_name=file_name, mime=mime, key=f"{key}_download")
+        return
+
+    @st.fragment(run_every=POLL_SECONDS)
+    def poll() -> None:
+        # Hanya fragment ini yang dijalankan ulang; rerun penuh sekali saat file siap
+        if job.done():
+            st.rerun()
+        st.caption("⏳ Menyiapkan file di background...")
+    poll()
+
+
+def render_table_export(service: ExportService, df: pd.DataFrame, name: str, version: str,
+                        state: Optional[Mapping], key: str, label: str) -> None:
+    """Format picker plus download of df; the file is written in chunks off the request path"""
+    col1, col2 = st.columns([1, 3])
+    fmt = col1.selectbox("Format", available_formats(), key=f"{key}_format")
+    with col2:
+        job = service.find(name, fmt, version, state)
+        if job is None and st.button(f"Siapkan {fmt.upper()} ({len(df):,} baris)", key=f"{key}_prepare"):
+            job = service.table(df, name, fmt, version, state)
+        if job is not None:
+            render_job(job, f"{label} ({fmt.upper()})", f"{name}.{fmt}", FORMATS[fmt], key)
+
+
+def render_report_export(service: ExportService, name: str, version: str, state: Optional[Mapping],
+                         key: str, title: str,
+                         contents: Callable[[], Tuple[Mapping[str, Any], Mapping[str, pd.Series]]]) -> None:
+    """PNG/PDF report download; contents() returns (kpis, charts) and runs only when requested"""
+    col1, col2 = st.columns([1, 3])
+    fmt = col1.selectbox("Format laporan", list(REPORT_FORMATS), key=f"{key}_format")
+    with col2:
+        job = service.find(name, fmt, version, state)
+        if job is None and st.button(f"Buat laporan {fmt.upper()}", key=f"{key}_prepare"):
+            kpis, charts = contents()
+            job = service.report(name, fmt, version, state, title, kpis, charts)
+        if job is not None:
+            render_job(job, f"📥 Download Laporan ({fmt.upper()})", f"{name}.{fmt}", REPORT_FORMATS[fmt], key)
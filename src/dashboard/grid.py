@@ -0,0 +1,32 @@
+"""
+Paginated Data Grid Component
+"""
+from typing import Optional, Sequence
+import numpy as np
+import pandas as pd
+import streamlit as st
+from src.data.grid import GridIndex
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+def render_grid(index: GridIndex, key: str, rows: Optional[np.ndarray] = None,
+                columns: Optional[Sequence[str]] = None, source: Optional[pd.DataFrame] = None) -> None:
+    """Render one page of the table; sorting and slicing happen on the server"""
+    columns = list(columns) if columns is not None else list(index.df.columns)
+    col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
+    with col1:
+        sort_by = st.selectbox("Urutkan berdasarkan", ["(urutan asli)"] + columns, key=f"{key}_sort")
+    with col2:
+        order = st.radio("Arah", ["Naik", "Turun"], horizontal=True, key=f"{key}_order")
+    with col3:
+        page_size = st.selectbox("Baris per halaman", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    with col4:
+        # Tanpa max_value: jumlah halaman berubah mengikuti filter, page di-clamp oleh GridIndex
+        page = st.number_input("Halaman", min_value=1, value=1, step=1, key=f"{key}_page")
+
+    grid_page = index.page(rows, sort_by=None if sort_by == "(urutan asli)" else sort_by,
+                           ascending=order == "Naik", page=page, page_size=page_size)
+    st.dataframe(index.frame(grid_page, columns, source), width='stretch')
+    st.caption(f"Menampilkan baris {grid_page.first_row:,}–{grid_page.last_row:,} dari {grid_page.total_rows:,} "
+               f"(halaman {grid_page.page} dari {grid_page.total_pages})")
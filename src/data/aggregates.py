@@ -0,0 +1,99 @@
+"""
+Student Aggregates Module
+
+Agregat yang sama dengan KPI dashboard, dihitung sekali per versi dataset
+sehingga bisa disajikan berulang kali tanpa groupby ulang.
+"""
+import math
+from typing import Any, Dict, List, Optional
+import pandas as pd
+from src.data.aggregation import Aggregation, Measure, evaluate
+
+
+def _normalized_status(status: pd.Series) -> pd.Series:
+    """Uppercase, stripped status; on categoricals only the categories are touched"""
+    if isinstance(status.dtype, pd.CategoricalDtype):
+        return status.map(lambda s: str(s).strip().upper())
+    return status.astype(str).str.strip().str.upper()
+
+
+def _number(value) -> float:
+    """JSON-safe float (NaN becomes 0.0, like calculate_kpis)"""
+    value = float(value)
+    return 0.0 if math.isnan(value) else value
+
+
+def student_kpis(df: pd.DataFrame, status_column: Optional[str] = "status",
+                 ipk_column: Optional[str] = "ipk") -> Dict[str, Any]:
+    """KPI cards of a mahasiswa table; the dashboard (calculate_kpis) and the API both use this"""
+    total = len(df)
+    total_aktif = total_lulus = 0
+    if status_column is not None:
+        status = _normalized_status(df[status_column])
+        total_aktif, total_lulus = int((status == "AKTIF").sum()), int((status == "LULUS").sum())
+    avg_ipk = 0.0
+    if ipk_column is not None and total > 0:
+        avg_ipk = _number(pd.to_numeric(df[ipk_column], errors="coerce").mean())
+    return {
+        "total_mahasiswa": total,
+        "total_aktif": total_aktif,
+        "total_lulus": total_lulus,
+        "persentase_aktif": (total_aktif / total * 100) if total > 0 else 0.0,
+        "avg_ipk": avg_ipk,
+    }
+
+
+def student_summary(df: pd.DataFrame) -> Dict[str, Any]:
+    """KPIs, prodi distribution and angkatan trend of the mahasiswa table"""
+    status = _normalized_status(df["status"])
+    ipk = pd.to_numeric(df["ipk"], errors="coerce")
+    aktif = status == "AKTIF"
+    lulus = status == "LULUS"
+    kpis = student_kpis(df)
+
+    prodi_counts = df["prodi"].astype(str).str.strip().value_counts()
+    prodi: List[Dict[str, Any]] = [
+        {"prodi": name, "jumlah": int(count)} for name, count in prodi_counts.items()
+    ]
+
+    frame = pd.DataFrame({
+        "angkatan": pd.to_numeric(df["angkatan"], errors="coerce"),
+        "aktif": aktif,
+        "lulus": lulus,
+        "ipk": ipk,
+    }).dropna(subset=["angkatan"])
+    grouped = frame.groupby("angkatan").agg(
+        jumlah=("aktif", "size"), aktif=("aktif", "sum"), lulus=("lulus", "sum"), avg_ipk=("ipk", "mean"),
+    )
+    angkatan = [
+        {
+            "angkatan": int(year),
+            "jumlah": int(row.jumlah),
+            "aktif": int(row.aktif),
+            "lulus": int(row.lulus),
+            "avg_ipk": _number(row.avg_ipk),
+        }
+        for year, row in grouped.iterrows()
+    ]
+    return {"kpis": kpis, "prodi": prodi, "angkatan": angkatan}
+
+
+
+# Ringkasan per kampus (simulasi_kampus_indonesia) sebagai spec deklaratif untuk src/data/aggregation.py
+CAMPUS_SUMMARIES: Dict[str, Aggregation] = {
+    "aktif_per_kampus": Aggregation(
+        ["kampus"], {"jumlah_mahasiswa_aktif": Measure("size")}, where=("status", "AKTIF"),
+        sort_by=["jumlah_mahasiswa_aktif"], ascending=False),
+    "angkatan_trend": Aggregation(["angkatan", "kampus"], {"jumlah_mhs": Measure("size")}),
+    "status_dist": Aggregation(["kampus", "status"], {"jumlah": Measure("size")}),
+    "ipk_summary": Aggregation(
+        ["kampus", "jenjang"], {"jumlah_mhs": Measure("count", "id_mahasiswa"), "rata2_ipk": Measure("mean", "ipk")}),
+    "prodi_dist": Aggregation(
+        ["kampus", "prodi"], {"jumlah_mhs": Measure("size")}, sort_by=["jumlah_mhs"], ascending=False),
+    "jalur_masuk_dist": Aggregation(["kampus", "jalur_masuk"], {"jumlah_mhs": Measure("size")}),
+}
+
+
+def campus_summaries(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """All per-campus summary tables of a mahasiswa table, from one grouped pass"""
+    return evaluate(df, CAMPUS_SUMMARIES)
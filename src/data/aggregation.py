@@ -0,0 +1,119 @@
+"""
+Declarative Aggregation Engine Module
+
+Ringkasan didefinisikan sebagai spec: kolom group, measure, filter opsional,
+dan urutan. Engine menghitung satu cube partial dalam satu pass groupby atas
+gabungan semua kolom group; measure di cube hanya count/sum sehingga dapat
+dijumlah. Setiap ringkasan adalah rollup kecil dari cube tersebut, dan cube
+dari beberapa partisi (mis. shard kampus) cukup digabung dengan menjumlah.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+SEP = "__"
+OPS = ("size", "count", "sum", "mean")
+
+
+class Measure:
+    """One output column: size(), count(column), sum(column) or mean(column)"""
+
+    def __init__(self, op: str, column: Optional[str] = None):
+        if op not in OPS:
+            raise ValueError(f"Unknown aggregation op: {op}")
+        if (op == "size") != (column is None):
+            raise ValueError(f"{op} {'takes no' if op == 'size' else 'needs a'} column")
+        self.op = op
+        self.column = column
+
+    def partials(self) -> List[Tuple[str, Optional[str]]]:
+        """Additive (op, column) pairs stored in the cube"""
+        if self.op == "mean":
+            return [("count", self.column), ("sum", self.column)]
+        return [(self.op, self.column)]
+
+
+class Aggregation:
+    """Group-by summary: keys, named measures, optional `column == value` filter and ordering"""
+
+    def __init__(self, by: Sequence[str], measures: Dict[str, Measure],
+                 where: Optional[Tuple[str, object]] = None,
+                 sort_by: Optional[Sequence[str]] = None, ascending: bool = True):
+        self.by = list(by)
+        self.measures = measures
+        self.where = where
+        self.sort_by = list(sort_by) if sort_by is not None else self.by
+        self.ascending = ascending
+
+    def partials(self) -> List[Tuple[str, Optional[str], Optional[Tuple[str, object]]]]:
+        pairs = [("size", None)] + [pair for measure in self.measures.values() for pair in measure.partials()]
+        return [(op, column, self.where) for op, column in dict.fromkeys(pairs)]
+
+
+def partial_name(op: str, column: Optional[str], where: Optional[Tuple[str, object]]) -> str:
+    parts = [op] + ([column] if column else []) + ([f"{where[0]}={where[1]}"] if where else [])
+    return SEP.join(parts)
+
+
+def cube_dimensions(spec: Dict[str, Aggregation]) -> List[str]:
+    return list(dict.fromkeys(key for aggregation in spec.values() for key in aggregation.by))
+
+
+def build_cube(df: pd.DataFrame, spec: Dict[str, Aggregation]) -> pd.DataFrame:
+    """All partials of a spec in one grouped pass over the union of the group keys"""
+    dims = cube_dimensions(spec)
+    partials = dict.fromkeys(p for aggregation in spec.values() for p in aggregation.partials())
+    frame = pd.DataFrame({dim: df[dim].to_numpy() for dim in dims}, index=df.index)
+    masks: Dict[Tuple[str, object], np.ndarray] = {}
+    for op, column, where in partials:
+        if where is not None and where not in masks:
+            masks[where] = (df[where[0]] == where[1]).fillna(False).to_numpy(dtype=bool)
+        if op == "size":
+            values = np.ones(len(df), dtype=np.int64)
+        elif op == "count":
+            values = df[column].notna().to_numpy(dtype=np.int64)
+        else:
+            values = pd.to_numeric(df[column], errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
+        frame[partial_name(op, column, where)] = values * masks[where] if where is not None else values
+    return frame.groupby(dims, observed=True, dropna=False, sort=False).sum().reset_index()
+
+
+def merge_cubes(cubes: Iterable[pd.DataFrame], spec: Dict[str, Aggregation]) -> pd.DataFrame:
+    """Sum cubes of several partitions (e.g. shards) into one"""
+    dims = cube_dimensions(spec)
+    cubes = [cube for cube in cubes if not cube.empty]
+    if not cubes:
+        return pd.DataFrame(columns=dims)
+    frame = pd.concat(cubes, ignore_index=True)
+    for dim in dims:
+        frame[dim] = frame[dim].astype("object")
+    return frame.groupby(dims, dropna=False, sort=False).sum().reset_index()
+
+
+def rollup(cube: pd.DataFrame, aggregation: Aggregation) -> pd.DataFrame:
+    """Final table of one aggregation from a (merged) cube"""
+    columns = [partial_name(*p) for p in aggregation.partials()]
+    if cube.empty:
+        return pd.DataFrame(columns=aggregation.by + list(aggregation.measures))
+    grouped = cube.groupby(aggregation.by, observed=True, sort=True)[columns].sum()
+    # Filter `where`: grup tanpa baris yang cocok tidak muncul, sama seperti filter sebelum groupby
+    grouped = grouped[grouped[partial_name("size", None, aggregation.where)] > 0]
+    result = pd.DataFrame(index=grouped.index)
+    for name, measure in aggregation.measures.items():
+        if measure.op == "mean":
+            count = grouped[partial_name("count", measure.column, aggregation.where)]
+            total = grouped[partial_name("sum", measure.column, aggregation.where)]
+            result[name] = (total / count.where(count > 0)).astype("float64")
+        else:
+            values = grouped[partial_name(measure.op, measure.column, aggregation.where)]
+            result[name] = values.astype("int64") if measure.op != "sum" else values
+    result = result.reset_index()
+    return result.sort_values(aggregation.sort_by, ascending=aggregation.ascending, kind="stable") \
+        .reset_index(drop=True)
+
+
+def evaluate(df: pd.DataFrame, spec: Dict[str, Aggregation],
+             names: Optional[Sequence[str]] = None) -> Dict[str, pd.DataFrame]:
+    """Evaluate a spec on a table: one cube, then one rollup per aggregation"""
+    cube = build_cube(df, spec)
+    return {name: rollup(cube, spec[name]) for name in (names or spec)}
@@ -0,0 +1,78 @@
+"""
+BPJS Antrol Loading Module
+"""
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (engine="pyarrow" membaca CSV secara multithread)
+    CSV_ENGINE = "pyarrow"
+except ImportError:  # pyarrow opsional; fallback ke parser C bawaan pandas
+    CSV_ENGINE = "c"
+
+BPJS_FILE = "bpjs antrol.csv"
+
+# Kolom yang dipakai dashboard; kolom opsional cukup dilewati jika tidak ada
+BPJS_COLUMNS = [
+    "no_rawat", "tgl_registrasi", "jam_reg", "tanggal_periksa", "nm_pasien", "nm_poli",
+    "status_kirim", "keterangan", "USER", "umur", "jk", "jenis_kelamin",
+]
+DATE_FORMATS = {"tgl_registrasi": "%d/%m/%Y", "tanggal_periksa": "%d/%m/%Y"}
+TIME_FORMATS = {"jam_reg": "%H:%M:%S"}
+
+STATUS_CATEGORIES = ["Sudah", "Gagal", "Ambil Antrian", "Belum"]
+UNKNOWN_STATUS = "Tidak Diketahui"
+
+
+def map_status(status_kirim: pd.Series) -> pd.Series:
+    """Vectorized status_kirim -> status; unrecognised values become 'Tidak Diketahui'"""
+    known = status_kirim.isin(STATUS_CATEGORIES)
+    dtype = pd.CategoricalDtype(STATUS_CATEGORIES + [UNKNOWN_STATUS])
+    return status_kirim.where(known, UNKNOWN_STATUS).astype(dtype).rename("status")
+
+
+def _parse_date(values: pd.Series, fmt: str) -> pd.Series:
+    return pd.to_datetime(values, format=fmt, errors="coerce")
+
+
+def _parse_time(values: pd.Series, fmt: str) -> pd.Series:
+    """Time of day as timedelta64 since midnight (NaT when invalid), not Python time objects"""
+    parsed = pd.to_datetime(values, format=fmt, errors="coerce")
+    return parsed - parsed.dt.normalize()
+
+
+def parse_columns(df: pd.DataFrame, max_workers: Optional[int] = None) -> pd.DataFrame:
+    """Parse date/time columns with explicit formats, one task per column"""
+    tasks: Dict[str, Tuple[Callable[[pd.Series, str], pd.Series], pd.Series, str]] = {}
+    for col, fmt in DATE_FORMATS.items():
+        if col in df.columns:
+            tasks[col] = (_parse_date, df[col], fmt)
+    for col, fmt in TIME_FORMATS.items():
+        if col in df.columns:
+            tasks[col] = (_parse_time, df[col], fmt)
+
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(tasks), 1)) as pool:
+        futures = {col: pool.submit(*task) for col, task in tasks.items()}
+        parsed = {col: future.result() for col, future in futures.items()}
+    return df.assign(**parsed)
+
+
+def load_bpjs(path: Union[str, Path], columns: Optional[List[str]] = None,
+              max_workers: Optional[int] = None) -> pd.DataFrame:
+    """Load the BPJS antrol CSV: needed columns only, parsed dates and a categorical status"""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {path}")
+    wanted = BPJS_COLUMNS if columns is None else columns
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [col for col in header if col in wanted]
+
+    # Tanggal/jam dibaca sebagai teks lalu di-parse dengan format eksplisit
+    text_columns = {col: "string" for col in list(DATE_FORMATS) + list(TIME_FORMATS) if col in usecols}
+    df = pd.read_csv(path, usecols=usecols, dtype=text_columns, engine=CSV_ENGINE)
+    df = parse_columns(df, max_workers=max_workers)
+    if "status_kirim" in df.columns:
+        df["status"] = map_status(df["status_kirim"])
+    return df
@@ -0,0 +1,128 @@
+"""
+Data Cleaning Rules Module
+
+Aturan pembersihan dideklarasikan per tabel (CleaningConfig.RULES di
+config/config.py) dan diterapkan DataLoader saat ingest:
+
+- strip: buang spasi di awal/akhir nilai teks; kamus kategori dinormalisasi
+  sekali per nilai unik lalu dipetakan ke baris lewat kode, bukan per baris
+- clamp: batasi kolom numerik ke rentang [low, high]
+- semester: normalisasi label semester ke 'YYYY/YYYY+1 Ganjil|Genap'; label
+  yang tidak dapat dikenali menjadi kosong
+
+Jumlah nilai yang diubah per aturan disimpan di df.attrs["cleaning"], dan
+baris yang diubah (bitset np.packbits) di df.attrs["cleaning_rows"] sehingga
+DataProfiler tetap dapat menandai anomali aslinya setelah dibersihkan.
+"""
+import hashlib
+import json
+import re
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+RULE_KINDS = ("strip", "clamp", "semester")
+# Tahun awal boleh terpotong ('202/2023 Ganjil'); tahun akhir yang menentukan
+SEMESTER_FORMAT = r"^\s*(\d{1,4})\s*/\s*(\d{4})\s+(ganjil|genap)\s*$"
+_SEMESTER_RE = re.compile(SEMESTER_FORMAT, re.IGNORECASE)
+
+
+def rules_key(rules: Optional[Dict]) -> str:
+    """Short stable hash of a rule set, used to version derived stores"""
+    payload = json.dumps(rules or {}, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=4).hexdigest()
+
+
+def _dictionary(series: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """(codes, unique values) of a column; -1 marks missing values"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    codes, uniques = pd.factorize(series)
+    return codes, pd.Index(uniques)
+
+
+def _recode(series: pd.Series, codes: np.ndarray, values: pd.Series) -> pd.Series:
+    """Rebuild a column from its codes and the normalized dictionary (NaN = missing)"""
+    new_codes, uniques = pd.factorize(values)
+    row_codes = np.where(codes >= 0, np.append(new_codes, -1)[codes], -1)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return pd.Series(pd.Categorical.from_codes(row_codes, categories=uniques),
+                         index=series.index, name=series.name)
+    lookup = np.append(np.asarray(uniques, dtype=object), np.nan)
+    return pd.Series(lookup[row_codes], index=series.index, name=series.name).astype(series.dtype)
+
+
+def _row_mask(per_value: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Row mask from a mask over the dictionary (missing rows are never flagged)"""
+    return np.where(codes >= 0, np.append(per_value, False)[codes], False)
+
+
+def strip_values(series: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+    """Strip surrounding whitespace (empty text becomes missing); returns (column, rows changed)"""
+    codes, uniques = _dictionary(series)
+    values = pd.Series(uniques, dtype=object)
+    stripped = values.map(lambda v: (v.strip() or np.nan) if isinstance(v, str) else v)
+    rows = _row_mask((stripped != values).to_numpy(dtype=bool), codes)
+    if not rows.any():
+        return series, rows
+    return _recode(series, codes, stripped), rows
+
+
+def clamp_values(series: pd.Series, low: float, high: float) -> Tuple[pd.Series, np.ndarray]:
+    """Clip a numeric column to [low, high]; returns (column, rows changed)"""
+    values = pd.to_numeric(series, errors="coerce")
+    rows = ((values < low) | (values > high)).to_numpy(dtype=bool)
+    if not rows.any():
+        return series, rows
+    return values.clip(low, high), rows
+
+
+def canonical_semester(label) -> Optional[str]:
+    """'202/2023 ganjil' -> '2022/2023 Ganjil'; None when the label cannot be read"""
+    match = _SEMESTER_RE.match(label) if isinstance(label, str) else None
+    if match is None:
+        return None
+    start, end, term = match.groups()
+    # Tahun awal harus tahun akhir - 1, atau awalan terpotong darinya
+    if not str(int(end) - 1).startswith(start):
+        return None
+    return f"{int(end) - 1}/{end} {term.capitalize()}"
+
+
+def normalize_semesters(series: pd.Series) -> Tuple[pd.Series, np.ndarray, np.ndarray]:
+    """Canonical semester labels; returns (column, rows repaired, rows invalidated)"""
+    codes, uniques = _dictionary(series)
+    labels = pd.Series(uniques, dtype=object)
+    canonical = labels.map(canonical_semester)
+    repaired = _row_mask((canonical.notna() & (canonical != labels)).to_numpy(dtype=bool), codes)
+    invalid = _row_mask(canonical.isna().to_numpy(dtype=bool), codes)
+    if not repaired.any() and not invalid.any():
+        return series, repaired, invalid
+    return _recode(series, codes, canonical.where(canonical.notna(), np.nan)), repaired, invalid
+
+
+def clean_table(df: pd.DataFrame, rules: Dict) -> pd.DataFrame:
+    """Copy of df with one table's rules applied (rows are never dropped)"""
+    unknown = set(rules) - set(RULE_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown cleaning rules: {sorted(unknown)}")
+    columns: Dict[str, pd.Series] = {}
+    masks: Dict[str, np.ndarray] = {}
+
+    def current(col: str) -> pd.Series:
+        return columns.get(col, df[col])
+
+    for col in rules.get("strip", []):
+        if col in df.columns:
+            columns[col], masks[f"{col}_stripped"] = strip_values(current(col))
+    for col, (low, high) in rules.get("clamp", {}).items():
+        if col in df.columns:
+            columns[col], masks[f"{col}_clamped"] = clamp_values(current(col), low, high)
+    for col in rules.get("semester", []):
+        if col in df.columns:
+            columns[col], masks[f"{col}_repaired"], masks[f"{col}_invalid"] = normalize_semesters(current(col))
+
+    result = df.assign(**{col: values for col, values in columns.items() if values is not df[col]})
+    result.attrs["cleaning"] = {name: int(mask.sum()) for name, mask in masks.items()}
+    result.attrs["cleaning_rows"] = {name: np.packbits(mask) for name, mask in masks.items() if mask.any()}
+    return result
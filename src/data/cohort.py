@@ -0,0 +1,180 @@
+"""
+Cohort Survival / Retention Engine Module
+
+Riwayat KRS dipadatkan sekali menjadi matriks aktivitas mahasiswa x semester
+relatif (semester 1 = semester Ganjil tahun angkatan) yang disimpan bit-packed.
+Retensi, laju aktivitas, hazard dropout dan lama studi untuk slice kohort apa
+pun dihitung sebagai reduksi vektor atas matriks tersebut, tanpa membaca ulang
+KRS.
+"""
+from typing import Iterable, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+SEMESTER_PATTERN = r"(\d+)/(\d{4})\s*(Ganjil|Genap)"
+TERMS = {"Ganjil": 0, "Genap": 1}
+GRADUATED = "LULUS"
+DROPOUT = "DO"
+
+
+def semester_ordinal(values: pd.Series) -> pd.Series:
+    """'2022/2023 Genap' -> 2 * 2022 + 1; unparseable values become <NA>
+
+    The start year is derived from the end year, so typos such as
+    '202/2023 Ganjil' still map to the right semester.
+    """
+    parts = values.astype("string").str.extract(SEMESTER_PATTERN)
+    end_year = pd.to_numeric(parts[1], errors="coerce")
+    term = parts[2].map(TERMS).astype("float64")
+    return ((end_year - 1) * 2 + term).astype("Int64")
+
+
+def semester_name(ordinal) -> str:
+    """Inverse of semester_ordinal: 4045 -> '2022/2023 Genap'"""
+    if pd.isna(ordinal):
+        return "Tidak Diketahui"
+    year, term = divmod(int(ordinal), 2)
+    return f"{year}/{year + 1} {'Genap' if term else 'Ganjil'}"
+
+
+def semester_labels(count: int) -> list:
+    return [f"Semester {i + 1}" for i in range(count)]
+
+
+class CohortMatrix:
+    """Bit-packed student x relative-semester KRS activity, built once"""
+
+    def __init__(self, students: pd.DataFrame, krs: pd.DataFrame, id_column: str = "id_mahasiswa",
+                 cohort_column: str = "angkatan", status_column: str = "status",
+                 semester_column: str = "semester_akademik"):
+        self.cohort_column = cohort_column
+        students = students.dropna(subset=[id_column, cohort_column]).drop_duplicates(id_column)
+        self.students = students.reset_index(drop=True)
+        status = self.students[status_column].astype("string").str.strip().str.upper()
+        self._graduated = status.eq(GRADUATED).fillna(False).to_numpy(dtype=bool)
+        self._dropout = status.eq(DROPOUT).fillna(False).to_numpy(dtype=bool)
+
+        # Semester ordinal awal tiap mahasiswa: Ganjil tahun angkatan
+        start = self.students[cohort_column].to_numpy(dtype=np.int64) * 2
+        rows = pd.Index(self.students[id_column]).get_indexer(krs[id_column])
+        ordinal = semester_ordinal(krs[semester_column]).to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = (rows >= 0) & ~np.isnan(ordinal)
+        relative = np.full(len(krs), -1, dtype=np.int64)
+        relative[valid] = ordinal[valid].astype(np.int64) - start[rows[valid]]
+        # KRS sebelum semester angkatan tidak konsisten dan tidak dihitung
+        valid &= relative >= 0
+        self.invalid_rows = int(len(krs) - valid.sum())
+
+        if valid.any():
+            first, last = int(ordinal[valid].min()), int(ordinal[valid].max())
+            self.n_semesters = int(last - start.min() + 1)
+            # Rentang semester yang teramati oleh data KRS, relatif terhadap angkatan
+            self.window_start = np.clip(first - start, 0, None)
+            self.window_end = last - start
+        else:
+            self.n_semesters = 0
+            self.window_start = np.zeros(len(start), dtype=np.int64)
+            self.window_end = np.full(len(start), -1, dtype=np.int64)
+
+        bits = np.zeros((len(self.students), self.n_semesters), dtype=bool)
+        bits[rows[valid], relative[valid]] = True
+        self._packed = np.packbits(bits, axis=1)
+        # Semester aktif terakhir (0-based), -1 jika tidak ada KRS
+        reversed_first = np.argmax(bits[:, ::-1], axis=1)
+        self.last_active = np.where(bits.any(axis=1), self.n_semesters - 1 - reversed_first, -1)
+
+    def __len__(self) -> int:
+        return len(self.students)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the packed activity matrix"""
+        return int(self._packed.nbytes)
+
+    @property
+    def semesters(self) -> np.ndarray:
+        return np.arange(self.n_semesters)
+
+    def _rows(self, rows: Optional[np.ndarray]) -> np.ndarray:
+        return np.arange(len(self.students)) if rows is None else np.asarray(rows, dtype=np.int64)
+
+    def bits(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Unpacked activity of the selected students (bool, students x semesters)"""
+        packed = self._packed if rows is None else self._packed[self._rows(rows)]
+        return np.unpackbits(packed, axis=1, count=self.n_semesters).astype(bool)
+
+    def observed(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Which relative semesters of each student fall inside the KRS window"""
+        rows = self._rows(rows)
+        j = self.semesters
+        return (j >= self.window_start[rows, None]) & (j <= self.window_end[rows, None])
+
+    def select(self, **filters: Optional[Iterable]) -> np.ndarray:
+        """Row positions of students matching column filters; an empty selection means no filter"""
+        mask = np.ones(len(self.students), dtype=bool)
+        for col, values in filters.items():
+            if values is None or len(values) == 0:
+                continue
+            mask &= self.students[col].isin(list(values)).to_numpy(dtype=bool)
+        return np.flatnonzero(mask)
+
+    def _groups(self, by: str, rows: np.ndarray) -> Tuple[np.ndarray, pd.Index]:
+        codes, labels = pd.factorize(self.students[by].to_numpy()[rows], sort=True, use_na_sentinel=True)
+        return codes, pd.Index(labels, name=by)
+
+    def _ratio(self, numerator: np.ndarray, denominator: np.ndarray, by: str,
+               rows: np.ndarray) -> pd.DataFrame:
+        """Sum both student x semester matrices per group and divide (NaN where nothing is observed)"""
+        codes, labels = self._groups(by, rows)
+        keep = codes >= 0
+        num = np.zeros((len(labels), self.n_semesters))
+        den = np.zeros((len(labels), self.n_semesters))
+        np.add.at(num, codes[keep], numerator[keep])
+        np.add.at(den, codes[keep], denominator[keep])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values = np.where(den > 0, num / den, np.nan)
+        return pd.DataFrame(values, index=labels, columns=semester_labels(self.n_semesters))
+
+    def retention(self, by: Optional[str] = None, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Share of students still enrolled (KRS in that semester or later) per relative semester"""
+        by = by or self.cohort_column
+        rows = self._rows(rows)
+        observed = self.observed(rows)
+        enrolled = self.last_active[rows, None] >= self.semesters
+        return self._ratio(enrolled & observed, observed, by, rows)
+
+    def activity_rate(self, by: Optional[str] = None, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Share of still-enrolled students that took KRS in each semester (gaps are leave/CUTI)"""
+        by = by or self.cohort_column
+        rows = self._rows(rows)
+        observed = self.observed(rows)
+        enrolled = (self.last_active[rows, None] >= self.semesters) & observed
+        return self._ratio(self.bits(rows) & observed, enrolled, by, rows)
+
+    def dropout_hazard(self, by: Optional[str] = None, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """P(drop out in semester j | enrolled through semester j-1) for DO students"""
+        by = by or self.cohort_column
+        rows = self._rows(rows)
+        observed = self.observed(rows)
+        previous = self.last_active[rows, None] - (self.semesters - 1)
+        at_risk = (previous >= 0) & observed
+        # Mahasiswa DO keluar pada semester setelah KRS terakhirnya
+        events = (previous == 0) & self._dropout[rows, None] & observed
+        return self._ratio(events, at_risk, by, rows)
+
+    def time_to_graduation(self, by: Optional[str] = None, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Semesters until graduation (last KRS semester) of LULUS students per group"""
+        by = by or self.cohort_column
+        rows = self._rows(rows)
+        graduated = self._graduated[rows]
+        durations = np.where(graduated & (self.last_active[rows] >= 0), self.last_active[rows] + 1.0, np.nan)
+        frame = pd.DataFrame({by: self.students[by].to_numpy()[rows], "lulus": graduated, "semester": durations})
+        grouped = frame.groupby(by, sort=True).agg(
+            jumlah_lulus=("lulus", "sum"),
+            tercatat=("semester", "count"),
+            rata_rata_semester=("semester", "mean"),
+            median_semester=("semester", "median"),
+            min_semester=("semester", "min"),
+            max_semester=("semester", "max"),
+        )
+        return grouped.astype({"jumlah_lulus": "int64", "tercatat": "int64"})
@@ -0,0 +1,137 @@
+"""
+Memory-mapped NumPy Column Store Module
+"""
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional
+from src.data import versioned
+
+MANIFEST_FILE = "manifest.json"
+
+# Kolom "panas" tabel mahasiswa yang disimpan sebagai array .npy
+STUDENT_NUMERIC_COLUMNS = ["ipk", "angkatan"]
+STUDENT_CATEGORY_COLUMNS = ["prodi", "status", "jenis_kelamin", "jenjang"]
+
+
+def _code_dtype(n_categories: int) -> np.dtype:
+    """Smallest signed integer dtype able to hold the category codes (and -1)"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+class ColumnStore:
+    """Directory of .npy column files that can be opened with np.load(mmap_mode='r')"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._path: Optional[Path] = None
+        self._manifest: Optional[Dict] = None
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    @property
+    def path(self) -> Path:
+        """Directory holding the files: the version published under directory, or directory itself"""
+        # Dikunci setelah ditemukan: manifest dan array selalu berasal dari versi yang sama
+        if self._path is None:
+            self._path = versioned.current(self.directory)
+        return self._path or self.directory
+
+    @property
+    def manifest(self) -> Dict:
+        if self._manifest is None:
+            manifest_path = self.path / MANIFEST_FILE
+            if not manifest_path.exists():
+                raise FileNotFoundError(f"Column store not found: {self.directory}")
+            self._manifest = json.loads(manifest_path.read_text())
+        return self._manifest
+
+    @property
+    def n_rows(self) -> int:
+        return self.manifest["n_rows"]
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.manifest["columns"])
+
+    def exists(self) -> bool:
+        return (self.path / MANIFEST_FILE).exists()
+
+    def is_fresh(self, source: Path) -> bool:
+        """Check whether the store was built from the current version of source"""
+        if not self.exists():
+            return False
+        stat = Path(source).stat()
+        return self.manifest.get("source") == {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    @classmethod
+    def write(cls, df: pd.DataFrame, directory: str, numeric: List[str],
+              categorical: List[str], source: Optional[Path] = None,
+              atomic: bool = True) -> "ColumnStore":
+        """
+        Materialize columns of df as .npy files, replacing any existing store.
+
+        The files go to a new version under directory that is published
+        atomically (src/data/versioned.py). atomic=False writes them straight
+        into directory, for callers that version a parent directory themselves.
+        """
+        directory = Path(directory)
+        if not atomic:
+            cls._write_files(df, directory, numeric, categorical, source)
+            return cls(directory)
+        # Pembaca lain tetap membaca versi lama sampai pointer CURRENT ditukar
+        versioned.publish(directory, lambda path: cls._write_files(df, path, numeric, categorical, source))
+        return cls(directory)
+
+    @staticmethod
+    def _write_files(df: pd.DataFrame, directory: Path, numeric: List[str],
+                     categorical: List[str], source: Optional[Path]) -> None:
+        directory.mkdir(parents=True)
+        manifest = {"n_rows": len(df), "columns": {}, "source": None}
+        for col in numeric:
+            values = df[col].to_numpy()
+            np.save(directory / f"{col}.npy", values, allow_pickle=False)
+            manifest["columns"][col] = {"kind": "numeric", "dtype": str(values.dtype)}
+        for col in categorical:
+            codes, uniques = pd.factorize(df[col], sort=True)
+            codes = codes.astype(_code_dtype(len(uniques)))
+            np.save(directory / f"{col}.npy", codes, allow_pickle=False)
+            manifest["columns"][col] = {
+                "kind": "categorical",
+                "dtype": str(codes.dtype),
+                "categories": [str(value) for value in uniques],
+            }
+        if source is not None:
+            stat = Path(source).stat()
+            manifest["source"] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        (directory / MANIFEST_FILE).write_text(json.dumps(manifest))
+
+    def array(self, column: str, mmap_mode: Optional[str] = "r") -> np.ndarray:
+        """Open one column (values or category codes) as a memory-mapped array"""
+        if column not in self.manifest["columns"]:
+            raise KeyError(f"Column not in store: {column}")
+        if column not in self._arrays:
+            self._arrays[column] = np.load(self.path / f"{column}.npy",
+                                           mmap_mode=mmap_mode, allow_pickle=False)
+        return self._arrays[column]
+
+    def categories(self, column: str) -> List[str]:
+        """Category dictionary for a coded column"""
+        meta = self.manifest["columns"][column]
+        if meta["kind"] != "categorical":
+            raise ValueError(f"Column is not categorical: {column}")
+        return meta["categories"]
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Build a DataFrame view; categorical columns become pandas Categoricals"""
+        data = {}
+        for col in columns or self.columns:
+            values = self.array(col)
+            if self.manifest["columns"][col]["kind"] == "categorical":
+                data[col] = pd.Categorical.from_codes(values, categories=self.categories(col))
+            else:
+                data[col] = values
+        return pd.DataFrame(data, copy=False)
@@ -0,0 +1,135 @@
+"""
+Course Aggregates Module
+
+KRS diringkas sekali menjadi partial per (prodi, kode_mk, semester): jumlah
+pengambil, count/sum/sum kuadrat nilai_angka, distribusi huruf mutu, dan total
+SKS. Drill-down prodi -> mata kuliah -> semester cukup menjumlahkan partial
+terpilih, tanpa menyentuh baris KRS mentah.
+"""
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+from src.data.cohort import semester_name, semester_ordinal
+
+GRADE_LETTERS = ["A", "B", "C", "D", "E"]
+SEMESTER_KEY = "semester_ordinal"
+UNKNOWN = "Tidak Diketahui"
+# Kolom partial yang dapat dijumlah antar semester/mata kuliah
+ADDITIVE = ["jumlah_krs", "jumlah_nilai", "sum_nilai", "sumsq_nilai", "total_sks"] + GRADE_LETTERS
+
+
+def finish(partials: pd.DataFrame) -> pd.DataFrame:
+    """Derive mean/stdev of nilai_angka from summed partials (sample stdev, like pandas)"""
+    n, total, squares = partials["jumlah_nilai"], partials["sum_nilai"], partials["sumsq_nilai"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / n
+        var = (squares - total * total / n) / (n - 1)
+    result = partials.drop(columns=["sum_nilai", "sumsq_nilai"])
+    result["rata_rata_nilai"] = mean.where(n > 0)
+    result["std_nilai"] = np.sqrt(var.clip(lower=0)).where(n > 1)
+    return result
+
+
+class CourseAggregates:
+    """Per-course x semester KRS partials with prodi SKS load, built once"""
+
+    def __init__(self, krs: pd.DataFrame, courses: pd.DataFrame, id_column: str = "id_mahasiswa"):
+        courses = courses.drop_duplicates("kode_mk").set_index("kode_mk")
+        frame = pd.DataFrame({
+            "kode_mk": krs["kode_mk"].astype("object").where(krs["kode_mk"].notna(), UNKNOWN),
+            SEMESTER_KEY: semester_ordinal(krs["semester_akademik"]).astype("float64"),
+        })
+        course = frame["kode_mk"].map(courses["prodi"])
+        frame["prodi"] = course.astype("object").where(course.notna(), UNKNOWN)
+        nilai = pd.to_numeric(krs["nilai_angka"], errors="coerce")
+        frame["jumlah_krs"] = 1
+        frame["jumlah_nilai"] = nilai.notna().astype("int64")
+        frame["sum_nilai"] = nilai.fillna(0.0)
+        frame["sumsq_nilai"] = nilai.fillna(0.0) ** 2
+        frame["total_sks"] = frame["kode_mk"].map(courses["sks"]).astype("float64").fillna(0.0)
+        letters = pd.Categorical(krs["nilai_huruf"], categories=GRADE_LETTERS).codes
+        for code, letter in enumerate(GRADE_LETTERS):
+            frame[letter] = (letters == code).astype("int64")
+
+        keys = ["prodi", "kode_mk", SEMESTER_KEY]
+        partials = frame.groupby(keys, dropna=False, sort=True)[ADDITIVE].sum().reset_index()
+        partials.insert(2, "nama_mk", partials["kode_mk"].map(courses["nama_mk"]))
+        partials.insert(3, "sks", partials["kode_mk"].map(courses["sks"]))
+        partials.insert(5, "semester", partials[SEMESTER_KEY].map(semester_name))
+        self.partials = partials
+
+        # Beban SKS per prodi x semester: mahasiswa unik dihitung sekali di sini (tidak additive)
+        self.id_column = id_column
+        frame[id_column] = krs[id_column].to_numpy()
+        self.enrolled = frame.dropna(subset=[id_column]) \
+            .drop_duplicates(["prodi", SEMESTER_KEY, id_column])[["prodi", SEMESTER_KEY, id_column]]
+        self.load = self._load(frame, self.enrolled, ["prodi", SEMESTER_KEY])
+        # Total semua prodi per semester: mahasiswa yang mengambil MK di beberapa prodi dihitung sekali,
+        # sehingga jumlah_mahasiswa bukan penjumlahan baris self.load
+        self.semester_totals = self._load(frame, self.enrolled, [SEMESTER_KEY])
+
+    def _load(self, frame: pd.DataFrame, enrolled: pd.DataFrame, keys: list) -> pd.DataFrame:
+        """jumlah_krs, total_sks, distinct students and SKS per student per group of keys"""
+        students = enrolled.drop_duplicates(keys + [self.id_column]) \
+            .groupby(keys, dropna=False).size().rename("jumlah_mahasiswa")
+        load = frame.groupby(keys, dropna=False)[["jumlah_krs", "total_sks"]].sum() \
+            .join(students).fillna({"jumlah_mahasiswa": 0}).reset_index()
+        load["jumlah_mahasiswa"] = load["jumlah_mahasiswa"].astype("int64")
+        load["semester"] = load[SEMESTER_KEY].map(semester_name)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            load["sks_per_mahasiswa"] = (load["total_sks"] / load["jumlah_mahasiswa"]).where(load["jumlah_mahasiswa"] > 0)
+        return load
+
+    def select(self, prodi: Optional[Iterable] = None, kode_mk: Optional[Iterable] = None,
+               semester: Optional[Iterable] = None) -> pd.DataFrame:
+        """Partials matching the filters; an empty selection means no filter"""
+        mask = np.ones(len(self.partials), dtype=bool)
+        for col, values in (("prodi", prodi), ("kode_mk", kode_mk), ("semester", semester)):
+            if values is not None and len(values) > 0:
+                mask &= self.partials[col].isin(list(values)).to_numpy(dtype=bool)
+        return self.partials[mask]
+
+    def programs(self) -> pd.DataFrame:
+        """One row per prodi: courses, enrollments, grade statistics and SKS taken"""
+        grouped = self.partials.groupby("prodi", sort=True)
+        result = grouped[ADDITIVE].sum()
+        result.insert(0, "jumlah_mk", grouped["kode_mk"].nunique())
+        return finish(result)
+
+    def courses(self, prodi: Optional[Iterable] = None) -> pd.DataFrame:
+        """One row per course, merged over semesters"""
+        selected = self.select(prodi=prodi)
+        result = selected.groupby(["kode_mk", "nama_mk", "sks", "prodi"], dropna=False, sort=True)[ADDITIVE].sum()
+        return finish(result).reset_index().sort_values("jumlah_krs", ascending=False, kind="stable")
+
+    def semesters(self, prodi: Optional[Iterable] = None, kode_mk: Optional[Iterable] = None) -> pd.DataFrame:
+        """One row per semester (chronological, unknown last) for a prodi/course selection"""
+        selected = self.select(prodi=prodi, kode_mk=kode_mk)
+        result = selected.groupby([SEMESTER_KEY, "semester"], dropna=False, sort=True)[ADDITIVE].sum()
+        return finish(result).reset_index().drop(columns=SEMESTER_KEY).set_index("semester")
+
+    def grade_distribution(self, prodi: Optional[Iterable] = None, kode_mk: Optional[Iterable] = None,
+                           semester: Optional[Iterable] = None) -> pd.Series:
+        """Number of each grade letter under the filters"""
+        selected = self.select(prodi=prodi, kode_mk=kode_mk, semester=semester)
+        return selected[GRADE_LETTERS].sum().astype("int64").rename("jumlah")
+
+    def sks_load(self, prodi: Optional[Iterable] = None) -> pd.DataFrame:
+        """SKS taken and SKS per student per (prodi, semester)"""
+        load = self.load
+        if prodi is not None and len(prodi) > 0:
+            load = load[load["prodi"].isin(list(prodi))]
+        return load.drop(columns=SEMESTER_KEY)
+
+    def semester_load(self, prodi: Optional[Iterable] = None) -> pd.DataFrame:
+        """SKS load per semester over the selected prodi (all when empty); students are counted once"""
+        if prodi is None or len(prodi) == 0:
+            return self.semester_totals.drop(columns=SEMESTER_KEY)
+        prodi = list(prodi)
+        if len(prodi) == 1:
+            return self.sks_load(prodi).drop(columns="prodi")
+        # Beberapa prodi: mahasiswa unik dihitung dari pasangan (prodi, semester, mahasiswa) yang sudah disimpan
+        load = self.load[self.load["prodi"].isin(prodi)]
+        totals = load.groupby(SEMESTER_KEY, dropna=False)[["jumlah_krs", "total_sks"]].sum()
+        enrolled = self.enrolled[self.enrolled["prodi"].isin(prodi)]
+        return self._load(totals.reset_index(), enrolled, [SEMESTER_KEY]).drop(columns=SEMESTER_KEY)
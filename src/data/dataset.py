@@ -0,0 +1,30 @@
+"""
+Dataset Preparation Module
+"""
+import numpy as np
+import pandas as pd
+from typing import List, Tuple
+from src.data.dedup import Deduplicator
+
+
+def prepare_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Return a cleaned, typed copy: duplicates removed and text columns as categories"""
+    keep = ~Deduplicator(df).duplicated()
+    rows = df.attrs.get("cleaning_rows")
+    df = df[keep].reset_index(drop=True)
+    if rows:
+        # Bitset baris hasil pembersihan ikut disaring agar tetap sejajar dengan baris
+        df.attrs["cleaning_rows"] = {name: np.packbits(np.unpackbits(bits, count=len(keep)).astype(bool)[keep])
+                                     for name, bits in rows.items()}
+    for col in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].astype("category")
+    return df
+
+
+def split_columns(df: pd.DataFrame) -> Tuple[List[str], List[str]]:
+    """Split columns into (numeric, categorical) for array-based storage"""
+    numeric = [col for col in df.columns
+               if pd.api.types.is_numeric_dtype(df[col]) and not isinstance(df[col].dtype, pd.CategoricalDtype)]
+    categorical = [col for col in df.columns if col not in numeric]
+    return numeric, categorical
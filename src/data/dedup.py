@@ -0,0 +1,75 @@
+"""
+Hash-based Deduplication Module
+"""
+import hashlib
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Union
+
+ROW_KEY = "row"
+
+
+def fingerprint(df: pd.DataFrame, subset: Optional[List[str]] = None) -> np.ndarray:
+    """Compute a 64-bit fingerprint per row (full row or a key subset)"""
+    frame = df if subset is None else df[subset]
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy(dtype=np.uint64)
+
+
+def dataset_version(df: pd.DataFrame) -> str:
+    """Content hash of the table, stable across processes and restarts"""
+    return hashlib.blake2b(fingerprint(df).tobytes(), digest_size=8).hexdigest()
+
+
+class Deduplicator:
+    """Store row fingerprints computed once at ingest and answer dedup queries"""
+
+    def __init__(self, df: Optional[pd.DataFrame] = None,
+                 subsets: Optional[Dict[str, List[str]]] = None):
+        # Kunci "row" selalu ada (seluruh kolom), subset tambahan opsional
+        self.subsets: Dict[str, Optional[List[str]]] = {ROW_KEY: None}
+        self.subsets.update(subsets or {})
+        self._fingerprints = {key: np.empty(0, dtype=np.uint64) for key in self.subsets}
+        self._seen = {key: np.empty(0, dtype=np.uint64) for key in self.subsets}
+        if df is not None:
+            self.append(df)
+
+    def __len__(self) -> int:
+        return len(self._fingerprints[ROW_KEY])
+
+    def fingerprints(self, key: str = ROW_KEY) -> np.ndarray:
+        """Return stored fingerprints for a key"""
+        self._check_key(key)
+        return self._fingerprints[key]
+
+    def duplicated(self, key: str = ROW_KEY, keep: Union[str, bool] = "first",
+                   rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Duplicate mask over stored rows, optionally restricted to row positions"""
+        self._check_key(key)
+        fps = self._fingerprints[key]
+        if rows is not None:
+            fps = fps[rows]
+        return pd.Series(fps).duplicated(keep=keep).to_numpy()
+
+    def append(self, batch: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Hash only the new batch and store its fingerprints.
+
+        Returns a duplicate mask per key marking batch rows already seen in
+        earlier data or earlier in the same batch.
+        """
+        masks = {}
+        for key, subset in self.subsets.items():
+            fps = fingerprint(batch, subset)
+            seen = self._seen[key]
+            in_existing = np.zeros(len(fps), dtype=bool)
+            if len(seen):
+                pos = np.searchsorted(seen, fps).clip(max=len(seen) - 1)
+                in_existing = seen[pos] == fps
+            masks[key] = in_existing | pd.Series(fps).duplicated(keep="first").to_numpy()
+            self._fingerprints[key] = np.concatenate([self._fingerprints[key], fps])
+            self._seen[key] = np.union1d(seen, fps)
+        return masks
+
+    def _check_key(self, key: str) -> None:
+        if key not in self.subsets:
+            raise KeyError(f"Unknown dedup key: {key}")
@@ -0,0 +1,233 @@
+"""
+Export Service Module
+
+Data terfilter ditulis ke CSV, Parquet atau XLSX per chunk baris, sehingga
+ekspor besar tidak pernah membuat salinan teks/tabel utuh di memori. Laporan
+KPI dan chart (PNG/PDF) dirender dengan matplotlib yang baru di-import di
+worker. Semua pekerjaan berjalan di thread pool dan hasilnya disimpan sebagai
+file dengan kunci (versi dataset, state filter): unduhan berulang langsung
+memakai file yang sudah ada.
+"""
+import hashlib
+import importlib.util
+import json
+import math
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
+import pandas as pd
+
+CHUNK_ROWS = 50_000
+# Batas baris satu sheet Excel (termasuk header)
+XLSX_MAX_ROWS = 1_048_576
+
+# Format -> MIME type; ekstensi file sama dengan nama format
+FORMATS = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+REPORT_FORMATS = {"png": "image/png", "pdf": "application/pdf"}
+
+
+def _xlsx_engine() -> Optional[str]:
+    for engine in ("xlsxwriter", "openpyxl"):
+        if importlib.util.find_spec(engine) is not None:
+            return engine
+    return None
+
+
+def available_formats() -> List[str]:
+    """Export formats whose optional writer is installed"""
+    optional = {
+        "parquet": importlib.util.find_spec("pyarrow") is not None,
+        "xlsx": _xlsx_engine() is not None,
+    }
+    return [fmt for fmt in FORMATS if optional.get(fmt, True)]
+
+
+def iter_chunks(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def write_csv(df: pd.DataFrame, path: Path, chunk_rows: int = CHUNK_ROWS) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for i, chunk in enumerate(iter_chunks(df, chunk_rows)):
+            chunk.to_csv(f, header=i == 0, index=False)
+
+
+def write_parquet(df: pd.DataFrame, path: Path, chunk_rows: int = CHUNK_ROWS) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in iter_chunks(df, chunk_rows):
+            # Skema chunk pertama dipakai untuk semua chunk (kolom kosong tetap bertipe sama)
+            table = pa.Table.from_pandas(chunk, schema=writer.schema if writer else None, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_xlsx(df: pd.DataFrame, path: Path, chunk_rows: int = CHUNK_ROWS) -> None:
+    engine = _xlsx_engine()
+    if engine is None:
+        raise ImportError("XLSX export needs xlsxwriter or openpyxl")
+    if len(df) + 1 > XLSX_MAX_ROWS:
+        raise ValueError(f"{len(df):,} rows do not fit in one Excel sheet")
+    # Mode constant_memory xlsxwriter menulis baris berurutan tanpa menahan seluruh sheet
+    kwargs = {"engine_kwargs": {"options": {"constant_memory": True}}} if engine == "xlsxwriter" else {}
+    with pd.ExcelWriter(path, engine=engine, **kwargs) as writer:
+        row = 0
+        for chunk in iter_chunks(df, chunk_rows):
+            chunk.to_excel(writer, sheet_name="data", startrow=row, header=row == 0, index=False)
+            row += len(chunk) + (1 if row == 0 else 0)
+
+
+WRITERS: Dict[str, Callable[[pd.DataFrame, Path, int], None]] = {
+    "csv": write_csv,
+    "parquet": write_parquet,
+    "xlsx": write_xlsx,
+}
+
+
+def render_report(path: Path, fmt: str, title: str, kpis: Mapping[str, Any],
+                  charts: Mapping[str, pd.Series], top_n: int = 15) -> None:
+    """KPI tiles plus one horizontal bar chart per series, as a PNG or single-page PDF"""
+    # matplotlib berat: baru dimuat saat laporan pertama dibuat, tanpa pyplot (aman di thread)
+    from matplotlib.figure import Figure
+
+    chart_rows = math.ceil(len(charts) / 2)
+    fig = Figure(figsize=(11.69, 1.8 + 3.6 * chart_rows), layout="constrained")
+    grid = fig.add_gridspec(1 + chart_rows, 2, height_ratios=[0.5] + [1] * chart_rows)
+    fig.suptitle(title, fontsize=16, fontweight="bold")
+
+    header = fig.add_subplot(grid[0, :])
+    header.axis("off")
+    for i, (label, value) in enumerate(kpis.items()):
+        x = (i + 0.5) / max(len(kpis), 1)
+        header.text(x, 0.65, str(value), ha="center", va="center", fontsize=18, color="#1f4e79")
+        header.text(x, 0.15, label, ha="center", va="center", fontsize=10, color="#555555")
+
+    for i, (name, series) in enumerate(charts.items()):
+        ax = fig.add_subplot(grid[1 + i // 2, i % 2])
+        values = series.head(top_n)[::-1]
+        ax.barh([str(label) for label in values.index], values.to_numpy(), color="#2e75b6")
+        ax.set_title(name, fontsize=11)
+        ax.tick_params(labelsize=8)
+    fig.savefig(path, format=fmt, dpi=120)
+
+
+def _json_default(value: Any) -> Any:
+    # Array/Series (mis. opsi multiselect) sebagai list utuh, tanggal dan lainnya sebagai teks
+    return value.tolist() if hasattr(value, "tolist") else str(value)
+
+
+def export_key(*parts: Any) -> str:
+    """Stable key of (dataset version, filter state, ...); dict order does not matter"""
+    payload = json.dumps(parts, sort_keys=True, default=_json_default, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=10).hexdigest()
+
+
+class ExportService:
+    """Background exports and reports cached as files per (dataset version, filter state)"""
+
+    def __init__(self, directory: str, max_workers: int = 2, chunk_rows: int = CHUNK_ROWS,
+                 max_files: int = 50):
+        self.directory = Path(directory)
+        self.chunk_rows = chunk_rows
+        self.max_files = max_files
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._pending: Dict[Path, Future] = {}
+        self._lock = threading.Lock()
+
+    def path(self, name: str, ext: str, version: str, state: Optional[Mapping] = None) -> Path:
+        return self.directory / f"{name}-{export_key(version, state or {}, name, ext)}.{ext}"
+
+    def table(self, df: pd.DataFrame, name: str, fmt: str, version: str,
+              state: Optional[Mapping] = None) -> Future:
+        """Future of the file holding df in fmt (resolved at once when cached)"""
+        if fmt not in WRITERS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        path = self.path(name, fmt, version, state)
+        return self._submit(path, lambda tmp: WRITERS[fmt](df, tmp, self.chunk_rows))
+
+    def report(self, name: str, fmt: str, version: str, state: Optional[Mapping], title: str,
+               kpis: Mapping[str, Any], charts: Mapping[str, pd.Series]) -> Future:
+        """Future of the rendered KPI/chart report (PNG or PDF)"""
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"Unknown report format: {fmt}")
+        path = self.path(name, fmt, version, state)
+        return self._submit(path, lambda tmp: render_report(tmp, fmt, title, kpis, charts))
+
+    def find(self, name: str, fmt: str, version: str, state: Optional[Mapping] = None) -> Optional[Future]:
+        """Future of an export/report that is cached or being written, else None (nothing is started)"""
+        with self._lock:
+            return self._lookup(self.path(name, fmt, version, state))
+
+    def _lookup(self, path: Path) -> Optional[Future]:
+        if path in self._pending:
+            return self._pending[path]
+        try:
+            os.utime(path)  # File sudah ada: tandai baru dipakai untuk eviksi LRU
+        except FileNotFoundError:
+            return None
+        future: Future = Future()
+        future.set_result(path)
+        return future
+
+    def _submit(self, path: Path, write: Callable[[Path], None]) -> Future:
+        with self._lock:
+            future = self._lookup(path)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._write, path, write)
+            self._pending[path] = future
+        future.add_done_callback(lambda _: self._done(path))
+        return future
+
+    def _write(self, path: Path, write: Callable[[Path], None]) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.stem}.tmp-{os.getpid()}-{threading.get_ident()}{path.suffix}")
+        try:
+            write(tmp)
+            os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        self._evict()
+        return path
+
+    def _done(self, path: Path) -> None:
+        with self._lock:
+            self._pending.pop(path, None)
+
+    def _evict(self) -> None:
+        """Keep only the max_files most recently used exports"""
+        # Satu eviksi pada satu waktu per service; file yang dihapus proses lain dilewati
+        with self._lock:
+            files = []
+            for path in self.directory.iterdir():
+                if path.name.startswith("."):
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if path.is_file():
+                    files.append((stat.st_mtime_ns, path))
+            if len(files) <= self.max_files:
+                return
+            files.sort(reverse=True)
+            for _, stale in files[self.max_files:]:
+                stale.unlink(missing_ok=True)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,465 @@
+"""
+Declarative Filter Module
+
+State filter sidebar dinyatakan sebagai pohon predikat (Eq, In, Between,
+DateIn, digabung dengan And). Pohon dikompilasi sekali per state menjadi Plan:
+setiap predikat didorong ke backend termurah yang mendukungnya -- mask dari
+kode kategori yang dihitung sekali, klausa WHERE pada salinan tabel di
+database SQLite, atau mask pandas biasa -- dan Plan melaporkan strategi yang
+dipakai. Backend lain cukup mengikuti antarmuka Backend dan diberikan ke
+FilterEngine.
+"""
+import datetime
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+# Kolom dengan nilai unik lebih banyak dari ini tidak dikodekan (mis. nama pasien)
+MAX_CODE_CARDINALITY = 4096
+PLAN_CACHE_SIZE = 128
+ROW_COLUMN = "_row"
+META_TABLE = "_filter_meta"
+# Salinan filter disimpan di tabel sendiri, tidak pernah menimpa tabel sumber (DATA_SOURCE=sqlite)
+COPY_PREFIX = "_filter_"
+
+logger = logging.getLogger(__name__)
+
+Mask = Callable[[], np.ndarray]
+
+
+class Predicate:
+    """Filter node; equal trees (ignoring order of values/children) share one key"""
+
+    column: Optional[str] = None
+
+    def key(self) -> Tuple:
+        raise NotImplementedError
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        """Boolean row mask evaluated with pandas (reference semantics)"""
+        raise NotImplementedError
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Predicate) and self.key() == other.key()
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}{self.key()[1:]}"
+
+
+class Eq(Predicate):
+    """column == value"""
+
+    def __init__(self, column: str, value):
+        self.column = column
+        self.value = value
+
+    def key(self) -> Tuple:
+        return ("eq", self.column, self.value)
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        return (df[self.column] == self.value).fillna(False).to_numpy(dtype=bool)
+
+
+class In(Predicate):
+    """column in values"""
+
+    def __init__(self, column: str, values: Sequence):
+        self.column = column
+        self.values = list(dict.fromkeys(values))
+
+    def key(self) -> Tuple:
+        return ("in", self.column, frozenset(self.values))
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        return df[self.column].isin(self.values).to_numpy(dtype=bool)
+
+
+class Between(Predicate):
+    """low <= column <= high; None leaves that end open"""
+
+    def __init__(self, column: str, low=None, high=None):
+        self.column = column
+        self.low = low
+        self.high = high
+
+    def key(self) -> Tuple:
+        return ("between", self.column, self.low, self.high)
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        values = df[self.column]
+        mask = np.ones(len(df), dtype=bool)
+        if self.low is not None:
+            mask &= (values >= self.low).fillna(False).to_numpy(dtype=bool)
+        if self.high is not None:
+            mask &= (values <= self.high).fillna(False).to_numpy(dtype=bool)
+        return mask
+
+
+class DateIn(Predicate):
+    """Calendar date of a datetime column in dates"""
+
+    def __init__(self, column: str, dates: Sequence[datetime.date]):
+        self.column = column
+        self.dates = list(dict.fromkeys(dates))
+
+    def key(self) -> Tuple:
+        return ("date_in", self.column, frozenset(self.dates))
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        days = pd.to_datetime(df[self.column]).dt.normalize()
+        return days.isin(pd.to_datetime(self.dates)).to_numpy(dtype=bool)
+
+
+class And(Predicate):
+    """Conjunction; nested Ands are flattened and And() matches every row"""
+
+    def __init__(self, *children: Predicate):
+        flat: List[Predicate] = []
+        for child in children:
+            flat.extend(child.children if isinstance(child, And) else [child])
+        self.children = list(dict.fromkeys(flat))
+
+    def key(self) -> Tuple:
+        return ("and", frozenset(self.children))
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        mask = np.ones(len(df), dtype=bool)
+        for child in self.children:
+            mask &= child.mask(df)
+        return mask
+
+    def __repr__(self) -> str:
+        return f"And({', '.join(map(repr, self.children))})"
+
+
+class Backend:
+    """Evaluates the predicates it supports as one row mask over the engine's table"""
+
+    name = "backend"
+    # Backend dengan cost lebih kecil dipilih lebih dulu
+    cost = 0
+
+    def supports(self, predicate: Predicate) -> bool:
+        raise NotImplementedError
+
+    def compile(self, predicates: List[Predicate]) -> Mask:
+        raise NotImplementedError
+
+
+class CategoryCodeBackend(Backend):
+    """Lookup tables over integer codes: one gather per predicate instead of comparing values
+
+    Codes are built lazily, once per column: categorical columns reuse their
+    own codes, other low-cardinality columns are factorized and datetime
+    columns are coded by calendar day (for DateIn).
+    """
+
+    name = "category_codes"
+    cost = 0
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._codes: Dict[str, Optional[Tuple[np.ndarray, pd.Index]]] = {}
+
+    def codes(self, column: str) -> Optional[Tuple[np.ndarray, pd.Index]]:
+        """(codes, categories) of a column, or None when it is not worth coding"""
+        if column not in self._codes:
+            self._codes[column] = self._build(column) if column in self.df.columns else None
+        return self._codes[column]
+
+    def _build(self, column: str) -> Optional[Tuple[np.ndarray, pd.Index]]:
+        values = self.df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return values.cat.codes.to_numpy(), values.cat.categories
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.dt.normalize()
+        elif pd.api.types.is_float_dtype(values) or pd.api.types.is_timedelta64_dtype(values):
+            return None
+        codes, uniques = pd.factorize(values)
+        if len(uniques) > MAX_CODE_CARDINALITY:
+            return None
+        return codes, pd.Index(uniques)
+
+    def supports(self, predicate: Predicate) -> bool:
+        if not isinstance(predicate, (Eq, In, DateIn)) or self.codes(predicate.column) is None:
+            return False
+        # Kode tanggal hanya untuk DateIn; Eq/In pada datetime membandingkan waktu penuh
+        is_datetime = pd.api.types.is_datetime64_any_dtype(self.df[predicate.column])
+        return is_datetime == isinstance(predicate, DateIn)
+
+    def _lookup(self, predicate: Predicate) -> Tuple[np.ndarray, np.ndarray]:
+        codes, categories = self.codes(predicate.column)
+        if isinstance(predicate, DateIn):
+            matched = categories.isin(pd.to_datetime(predicate.dates))
+        else:
+            matched = categories.isin([predicate.value] if isinstance(predicate, Eq) else predicate.values)
+        # Slot terakhir untuk kode -1 (nilai kosong): seperti Series.isin, In cocok dengan baris kosong
+        # jika NaN/None ada di nilai yang dipilih; Eq (==) tidak pernah cocok dengan nilai kosong
+        missing = isinstance(predicate, In) and _has_missing(predicate.values)
+        return np.append(np.asarray(matched, dtype=bool), missing), codes
+
+    def compile(self, predicates: List[Predicate]) -> Mask:
+        lookups = [self._lookup(predicate) for predicate in predicates]
+
+        def evaluate() -> np.ndarray:
+            mask = np.ones(len(self.df), dtype=bool)
+            for table, codes in lookups:
+                mask &= table[codes]
+            return mask
+        return evaluate
+
+
+class PandasBackend(Backend):
+    """Fallback: every predicate evaluated as a pandas mask"""
+
+    name = "pandas"
+    cost = 10
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+    def supports(self, predicate: Predicate) -> bool:
+        return predicate.column in self.df.columns
+
+    def compile(self, predicates: List[Predicate]) -> Mask:
+        return lambda: And(*predicates).mask(self.df)
+
+
+def _is_missing(value) -> bool:
+    return value is None or (np.ndim(value) == 0 and bool(pd.isna(value)))
+
+
+def _has_missing(values: Sequence) -> bool:
+    return any(_is_missing(value) for value in values)
+
+
+def _sql_value(value):
+    if isinstance(value, (pd.Timestamp, datetime.datetime)):
+        return pd.Timestamp(value).isoformat(" ")
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def table_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a table, to detect a stale SQLite copy"""
+    hashed = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.blake2b(hashed.tobytes(), digest_size=16)
+    digest.update(",".join(map(str, df.columns)).encode())
+    return digest.hexdigest()
+
+
+class SqliteBackend(Backend):
+    """WHERE clause on a copy of the table in SQLite; rows map back by their position
+
+    The copy of ``table`` lives in its own table ``_filter_<table>``, written by
+    ``SqliteBackend.write`` (with indexes on the filter columns), and is only
+    used by ``open`` when its fingerprint still matches the in-memory table.
+    """
+
+    name = "sqlite"
+    cost = 5
+
+    def __init__(self, path: str, table: str, n_rows: int, columns: Sequence[str]):
+        self.path = Path(path)
+        self.table = self.copy_table(table)
+        self.n_rows = n_rows
+        self.columns = set(columns)
+
+    @staticmethod
+    def copy_table(table: str) -> str:
+        """Name of the filter copy of a table"""
+        return f"{COPY_PREFIX}{table}"
+
+    @staticmethod
+    def _sql_columns(df: pd.DataFrame) -> List[str]:
+        return [col for col in df.columns if not pd.api.types.is_timedelta64_dtype(df[col])]
+
+    @classmethod
+    def write(cls, df: pd.DataFrame, path: str, table: str,
+              index_columns: Sequence[str] = ()) -> "SqliteBackend":
+        """Copy df into the database (replacing the previous copy) and index the given columns"""
+        columns = cls._sql_columns(df)
+        frame = df[columns].copy()
+        frame.insert(0, ROW_COLUMN, np.arange(len(df), dtype=np.int64))
+        copy = cls.copy_table(table)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(path) as conn:
+            frame.to_sql(copy, conn, if_exists="replace", index=False,
+                         dtype={ROW_COLUMN: "INTEGER PRIMARY KEY"})
+            for col in index_columns:
+                if col in columns:
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS "ix_{copy}_{col}" ON "{copy}" ("{col}")')
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {META_TABLE} "
+                         "(tbl TEXT PRIMARY KEY, fingerprint TEXT, n_rows INTEGER)")
+            conn.execute(f"INSERT OR REPLACE INTO {META_TABLE} VALUES (?, ?, ?)",
+                         (copy, table_fingerprint(df[columns]), len(df)))
+        return cls(path, table, len(df), columns)
+
+    @classmethod
+    def open(cls, path: str, table: str, df: pd.DataFrame) -> Optional["SqliteBackend"]:
+        """Backend over an existing copy of df, or None when missing or stale"""
+        if not Path(path).exists():
+            return None
+        columns = cls._sql_columns(df)
+        try:
+            with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as conn:
+                row = conn.execute(f"SELECT fingerprint, n_rows FROM {META_TABLE} WHERE tbl = ?",
+                                   (cls.copy_table(table),)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None or row != (table_fingerprint(df[columns]), len(df)):
+            return None
+        return cls(path, table, len(df), columns)
+
+    def supports(self, predicate: Predicate) -> bool:
+        return isinstance(predicate, (Eq, In, Between, DateIn)) and predicate.column in self.columns
+
+    @staticmethod
+    def clause(predicate: Predicate) -> Tuple[str, List]:
+        """SQL condition and parameters of one predicate"""
+        column = f'"{predicate.column}"'
+        if isinstance(predicate, Eq):
+            return f"{column} = ?", [_sql_value(predicate.value)]
+        if isinstance(predicate, In):
+            values = [v for v in predicate.values if not _is_missing(v)]
+            marks = ", ".join("?" * len(values)) or "NULL"
+            sql = f"{column} IN ({marks})"
+            # NULL tidak pernah cocok dengan IN; nilai kosong yang dipilih dicek terpisah
+            if len(values) < len(predicate.values):
+                sql = f"{sql} OR {column} IS NULL"
+            return sql, [_sql_value(v) for v in values]
+        if isinstance(predicate, DateIn):
+            marks = ", ".join("?" * len(predicate.dates)) or "NULL"
+            return f"date({column}) IN ({marks})", [_sql_value(d) for d in predicate.dates]
+        parts, params = [], []
+        if predicate.low is not None:
+            parts.append(f"{column} >= ?")
+            params.append(_sql_value(predicate.low))
+        if predicate.high is not None:
+            parts.append(f"{column} <= ?")
+            params.append(_sql_value(predicate.high))
+        return " AND ".join(parts) or "1", params
+
+    def where(self, predicates: List[Predicate]) -> Tuple[str, List]:
+        clauses = [self.clause(predicate) for predicate in predicates]
+        return " AND ".join(f"({sql})" for sql, _ in clauses) or "1", \
+            [param for _, params in clauses for param in params]
+
+    def compile(self, predicates: List[Predicate]) -> Mask:
+        where, params = self.where(predicates)
+        sql = f'SELECT {ROW_COLUMN} FROM "{self.table}" WHERE {where}'
+
+        def evaluate() -> np.ndarray:
+            with sqlite3.connect(f"file:{self.path}?mode=ro", uri=True) as conn:
+                rows = np.fromiter((row[0] for row in conn.execute(sql, params)), dtype=np.int64)
+            mask = np.zeros(self.n_rows, dtype=bool)
+            mask[rows] = True
+            return mask
+        return evaluate
+
+
+def default_backends(df: pd.DataFrame) -> List[Backend]:
+    return [CategoryCodeBackend(df), PandasBackend(df)]
+
+
+def build_engine(df: pd.DataFrame, database: Optional[str] = None,
+                 table: Optional[str] = None, cache_size: int = PLAN_CACHE_SIZE,
+                 index_columns: Sequence[str] = ()) -> "FilterEngine":
+    """Engine with the default backends, plus the SQLite copy of df (rewritten when stale)"""
+    backends = default_backends(df)
+    if database is not None and table is not None:
+        sqlite = SqliteBackend.open(database, table, df)
+        if sqlite is None:
+            try:
+                sqlite = SqliteBackend.write(df, database, table, index_columns)
+            except (sqlite3.Error, OSError, ValueError) as e:
+                # Database read-only/terkunci: filter tetap berjalan lewat kode kategori dan pandas
+                logger.warning("SQLite filter copy of %s not written: %s", table, e)
+        if sqlite is not None:
+            backends.append(sqlite)
+    return FilterEngine(df, backends, cache_size=cache_size)
+
+
+class Plan:
+    """Compiled filter: predicates grouped per backend; the mask is computed once"""
+
+    def __init__(self, df: pd.DataFrame, predicate: Predicate,
+                 steps: List[Tuple[Backend, List[Predicate]]]):
+        self.df = df
+        self.predicate = predicate
+        self.steps = [(backend, predicates, backend.compile(predicates)) for backend, predicates in steps]
+        self._mask: Optional[np.ndarray] = None
+
+    @property
+    def strategy(self) -> str:
+        """Backends used, cheapest first ('all' when nothing is filtered)"""
+        return " + ".join(backend.name for backend, _, _ in self.steps) or "all"
+
+    def explain(self) -> pd.DataFrame:
+        """One row per predicate with the backend that evaluates it"""
+        return pd.DataFrame([{"predikat": repr(predicate), "strategi": backend.name}
+                             for backend, predicates, _ in self.steps for predicate in predicates],
+                            columns=["predikat", "strategi"])
+
+    def mask(self) -> np.ndarray:
+        if self._mask is None:
+            mask = np.ones(len(self.df), dtype=bool)
+            for _, _, evaluate in self.steps:
+                mask &= evaluate()
+            self._mask = mask
+        return self._mask
+
+    def apply(self) -> pd.DataFrame:
+        """Matching rows; a shallow copy of the table when nothing is filtered"""
+        # Tabel engine dibagi antar sesi (cache_resource): jangan pernah mengembalikan objek yang sama,
+        # agar perubahan di satu sesi tidak menular (copy dangkal murah di bawah copy-on-write)
+        return self.df[self.mask()] if self.steps else self.df.copy(deep=False)
+
+
+class FilterEngine:
+    """Compile predicate trees against one table, caching the plan of each state"""
+
+    def __init__(self, df: pd.DataFrame, backends: Optional[Sequence[Backend]] = None,
+                 cache_size: int = PLAN_CACHE_SIZE):
+        self.df = df
+        backends = default_backends(df) if backends is None else backends
+        self.backends = sorted(backends, key=lambda backend: backend.cost)
+        self.cache_size = cache_size
+        self._plans: "OrderedDict[Predicate, Plan]" = OrderedDict()
+        # Engine dibagi antar sesi Streamlit (thread berbeda)
+        self._lock = threading.Lock()
+
+    def compile(self, predicate: Predicate) -> Plan:
+        """Push every conjunct to the cheapest backend that supports it"""
+        predicate = predicate if isinstance(predicate, And) else And(predicate)
+        with self._lock:
+            if predicate in self._plans:
+                self._plans.move_to_end(predicate)
+                return self._plans[predicate]
+        groups: Dict[int, List[Predicate]] = {}
+        for child in predicate.children:
+            for position, backend in enumerate(self.backends):
+                if backend.supports(child):
+                    groups.setdefault(position, []).append(child)
+                    break
+            else:
+                raise ValueError(f"No backend supports {child!r}")
+        plan = Plan(self.df, predicate, [(self.backends[pos], groups[pos]) for pos in sorted(groups)])
+        with self._lock:
+            self._plans[predicate] = plan
+            if len(self._plans) > self.cache_size:
+                self._plans.popitem(last=False)
+        return plan
+
+    def apply(self, predicate: Predicate) -> pd.DataFrame:
+        return self.compile(predicate).apply()
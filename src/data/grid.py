@@ -0,0 +1,90 @@
+"""
+Paginated Grid Index Module
+
+Permutasi urutan setiap kolom dihitung sekali (lazy) atas seluruh dataset.
+Untuk subset baris hasil filter, urutan cukup diambil dengan menyaring
+permutasi tersebut (O(n), tanpa sort ulang), lalu hanya satu halaman yang
+dipotong dan dikirim ke browser.
+"""
+import math
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+
+class GridPage:
+    """One page of a sorted, filtered view"""
+
+    def __init__(self, positions: np.ndarray, page: int, page_size: int, total_rows: int):
+        self.positions = positions
+        self.page = page
+        self.page_size = page_size
+        self.total_rows = total_rows
+
+    @property
+    def total_pages(self) -> int:
+        return max(math.ceil(self.total_rows / self.page_size), 1)
+
+    @property
+    def first_row(self) -> int:
+        """1-based number of the first row on this page (0 when empty)"""
+        return (self.page - 1) * self.page_size + 1 if self.total_rows else 0
+
+    @property
+    def last_row(self) -> int:
+        return self.first_row + len(self.positions) - 1 if self.total_rows else 0
+
+
+class GridIndex:
+    """Presorted row permutations of a table for server-side sorting and paging"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._permutations: Dict[Tuple[str, bool], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def positions(self, labels: pd.Index) -> np.ndarray:
+        """Row positions of index labels (e.g. of a filtered view of the same table)"""
+        return self.df.index.get_indexer(labels)
+
+    def permutation(self, column: str, ascending: bool = True) -> np.ndarray:
+        """Row positions ordered by a column (stable, missing values last), computed once"""
+        key = (column, ascending)
+        if key not in self._permutations:
+            if column not in self.df.columns:
+                raise KeyError(f"Unknown grid column: {column}")
+            codes, _ = pd.factorize(self.df[column], sort=True, use_na_sentinel=True)
+            codes = codes.astype(np.int64)
+            # Kode -1 (missing) selalu di akhir, untuk urutan naik maupun turun
+            primary = np.where(codes < 0, np.iinfo(np.int64).max, codes if ascending else -codes)
+            self._permutations[key] = np.argsort(primary, kind="stable")
+        return self._permutations[key]
+
+    def page(self, rows: Optional[np.ndarray] = None, sort_by: Optional[str] = None, ascending: bool = True,
+             page: int = 1, page_size: int = 50) -> GridPage:
+        """Positions of the requested page among `rows` (all rows when None)"""
+        if sort_by is None:
+            ordered = np.arange(len(self.df)) if rows is None else np.sort(np.asarray(rows, dtype=np.int64))
+        else:
+            ordered = self.permutation(sort_by, ascending)
+            if rows is not None:
+                selected = np.zeros(len(self.df), dtype=bool)
+                selected[np.asarray(rows, dtype=np.int64)] = True
+                ordered = ordered[selected[ordered]]
+        total = len(ordered)
+        page_size = max(int(page_size), 1)
+        page = min(max(int(page), 1), max(math.ceil(total / page_size), 1))
+        start = (page - 1) * page_size
+        return GridPage(ordered[start:start + page_size], page, page_size, total)
+
+    def frame(self, grid_page: GridPage, columns: Optional[Sequence[str]] = None,
+              source: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Rows of a page; `source` may be a cleaned view sharing this table's row labels"""
+        if source is not None:
+            labels = self.df.index[grid_page.positions]
+            result = source.loc[labels]
+        else:
+            result = self.df.iloc[grid_page.positions]
+        return result if columns is None else result[list(columns)]
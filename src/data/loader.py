@@ -1,32 +1,189 @@
 """
 Data Loading Module
 """
+import sqlite3
 import pandas as pd
 from pathlib import Path
-from typing import Union
+from typing import Dict, List, Optional, Union
+from src.data.cleaning import clean_table, rules_key
+from src.data.column_store import (
+    ColumnStore,
+    STUDENT_CATEGORY_COLUMNS,
+    STUDENT_NUMERIC_COLUMNS,
+)
+from src.data.dataset import prepare_table
+from src.data.shards import CampusShards
+from src.data.shared import SharedDataset
+
+# Sumber tabel yang didukung load(): file CSV/Excel di data_path, atau tabel di database SQLite
+SOURCES = ("csv", "excel", "sqlite")
 
 class DataLoader:
     """Handle data loading operations"""
     
-    def __init__(self, data_path: str = "./database/data"):
+    def __init__(self, data_path: str = "./database/data", cleaning_rules: Optional[Dict[str, Dict]] = None,
+                 source: str = "csv", db_path: Optional[str] = None, max_workers: Optional[int] = None):
+        if source not in SOURCES:
+            raise ValueError(f"Unknown data source: {source}")
+        if source == "sqlite" and db_path is None:
+            raise ValueError("The sqlite data source needs db_path")
         self.data_path = Path(data_path)
+        # Aturan pembersihan per tabel (CleaningConfig.RULES), diterapkan setiap kali file dibaca
+        self.cleaning_rules = cleaning_rules or {}
+        self.source = source
+        self.db_path = Path(db_path) if db_path is not None else None
+        # Worker penulisan shard per kampus (None = default ThreadPoolExecutor)
+        self.max_workers = max_workers
+    
+    @classmethod
+    def from_config(cls, source_path: Optional[str] = None) -> "DataLoader":
+        """
+        Loader for the current DataConfig / DatabaseConfig / CleaningConfig values.
+
+        source_path (e.g. the path a DataRefresher watches) replaces DATA_PATH,
+        or DB_PATH when the source is sqlite.
+        """
+        # Diimpor saat dipanggil: nilai konfigurasi bisa dimuat ulang selama proses berjalan
+        from config.config import CleaningConfig, DatabaseConfig, DataConfig
+        source = DataConfig.DATA_SOURCE
+        data_path, db_path = DataConfig.DATA_PATH, DatabaseConfig.DB_PATH
+        if source_path is not None:
+            if source == "sqlite":
+                db_path = source_path
+            else:
+                data_path = source_path
+        return cls(data_path, CleaningConfig.rules(), source=source, db_path=db_path,
+                   max_workers=DataConfig.SHARD_WORKERS or None)
+    
+    @staticmethod
+    def table_name(filename: str) -> str:
+        """Table of a data file, used to look up its rules: 'krs_simulasi.csv' -> 'krs'"""
+        return Path(filename).stem.removesuffix("_simulasi")
+    
+    def clean(self, df: pd.DataFrame, filename: str) -> pd.DataFrame:
+        """Apply the cleaning rules of the file's table, if any"""
+        rules = self.cleaning_rules.get(self.table_name(filename))
+        return clean_table(df, rules) if rules else df
+    
+    def store_name(self, filename: str) -> str:
+        """Name of stores derived from a file; changes with its source and cleaning rules so they get rebuilt"""
+        rules = self.cleaning_rules.get(self.table_name(filename))
+        parts = [Path(filename).stem]
+        if self.source != "csv":
+            parts.append(self.source)
+        if rules:
+            parts.append(rules_key(rules))
+        return "-".join(parts)
+    
+    def source_path(self, filename: str) -> Path:
+        """File whose mtime/size versions the table: the data file, or the whole SQLite database"""
+        return self.db_path if self.source == "sqlite" else self.data_path / filename
+    
+    def load(self, filename: str) -> pd.DataFrame:
+        """Load a table from the configured source; with sqlite the table is table_name(filename)"""
+        if self.source == "sqlite":
+            return self.load_sqlite(self.table_name(filename))
+        if self.source == "excel":
+            return self.load_excel(filename)
+        return self.load_csv(filename)
     
     def load_csv(self, filename: str) -> pd.DataFrame:
         """Load CSV file"""
         file_path = self.data_path / filename
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
-        return pd.read_csv(file_path)
+        return self.clean(pd.read_csv(file_path), filename)
     
     def load_excel(self, filename: str, sheet_name: str = 0) -> pd.DataFrame:
         """Load Excel file"""
         file_path = self.data_path / filename
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
-        return pd.read_excel(file_path, sheet_name=sheet_name)
+        return self.clean(pd.read_excel(file_path, sheet_name=sheet_name), filename)
+    
+    def load_sqlite(self, table: str) -> pd.DataFrame:
+        """Load a table from the SQLite database"""
+        if self.db_path is None or not self.db_path.exists():
+            raise FileNotFoundError(f"Database not found: {self.db_path}")
+        with sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True) as conn:
+            df = pd.read_sql_query(f'SELECT * FROM "{table}"', conn)
+        return self.clean(df, table)
+    
+    def load_students(self, filename: str, shared: bool = False) -> pd.DataFrame:
+        """
+        The mahasiswa table exactly as the dashboard and the aggregate API use it.
+        
+        shared=True attaches the deduplicated, typed table from shared memory
+        (load_shared); otherwise the cleaned file is used with date columns parsed.
+        """
+        if shared:
+            # Mode shared memory: tabel bersih dipublikasikan sekali dan di-attach zero-copy oleh setiap replika
+            return self.load_shared(filename)
+        df = self.load(filename)
+        # Convert date columns if they exist
+        for col in df.columns:
+            if 'tanggal' in col.lower() or 'date' in col.lower() or 'waktu' in col.lower() or 'time' in col.lower():
+                try:
+                    df[col] = pd.to_datetime(df[col], errors='coerce')
+                except (TypeError, ValueError):
+                    pass
+        return df
     
     def save_csv(self, df: pd.DataFrame, filename: str) -> None:
         """Save DataFrame to CSV"""
         file_path = self.data_path / filename
         df.to_csv(file_path, index=False)
         print(f"Data saved to {file_path}")
+    
+    def column_store_path(self, filename: str) -> Path:
+        """Directory of the .npy column store built from a data file"""
+        return self.data_path / ".column_store" / self.store_name(filename)
+    
+    def materialize_column_store(self, filename: str,
+                                 numeric: Optional[List[str]] = None,
+                                 categorical: Optional[List[str]] = None) -> ColumnStore:
+        """Write hot columns of a table as memory-mappable .npy files"""
+        numeric = STUDENT_NUMERIC_COLUMNS if numeric is None else numeric
+        categorical = STUDENT_CATEGORY_COLUMNS if categorical is None else categorical
+        df = self.load(filename)
+        return ColumnStore.write(df, self.column_store_path(filename), numeric, categorical,
+                                 source=self.source_path(filename))
+    
+    def load_column_store(self, filename: str, **kwargs) -> ColumnStore:
+        """Open the column store of a table, rebuilding it when its source changed"""
+        store = ColumnStore(self.column_store_path(filename))
+        if not store.is_fresh(self.source_path(filename)):
+            store = self.materialize_column_store(filename, **kwargs)
+        return store
+    
+    def shards_path(self, filename: str) -> Path:
+        """Directory of the per-campus shards built from a data file"""
+        return self.data_path / ".shards" / self.store_name(filename)
+    
+    def load_sharded(self, filename: str, campus_column: str = "kampus") -> CampusShards:
+        """Open the per-campus shards of a table, rebuilding them when its source changed"""
+        shards = CampusShards(self.shards_path(filename), campus_column)
+        source = self.source_path(filename)
+        if not shards.is_fresh(source):
+            shards = CampusShards.write(prepare_table(self.load(filename)), self.shards_path(filename),
+                                        campus_column, source=source, max_workers=self.max_workers)
+        return shards
+    
+    def load_shared(self, filename: str, root: Optional[str] = None) -> pd.DataFrame:
+        """
+        Load a cleaned, typed table from shared memory.
+        
+        The first process to see a new version of the file publishes it;
+        every other process attaches to the same pages without copying.
+        """
+        source = self.source_path(filename)
+        if not source.exists():
+            raise FileNotFoundError(f"File not found: {source}")
+        shared = SharedDataset(self.store_name(filename), root=root)
+        with shared.lock():
+            if not shared.is_current(source):
+                shared.publish(prepare_table(self.load(filename)), source=source)
+        store = shared.attach()
+        df = store.to_frame()
+        df.attrs["dataset_version"] = store.directory.name
+        return df
@@ -0,0 +1,163 @@
+"""
+Data Quality Profiler Module
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional
+
+# Format semester akademik yang valid, contoh: "2023/2024 Ganjil"
+SEMESTER_PATTERN = r"^(\d{4})/(\d{4}) (Ganjil|Genap)$"
+
+# Aturan kualitas data per tabel hasil simulasi
+TABLE_RULES = {
+    "mahasiswa": {
+        "ranges": {"ipk": (1.0, 4.0)},
+        "allowed": {},
+        "padded": ["prodi"],
+        "semester": [],
+    },
+    "mata_kuliah": {
+        "ranges": {},
+        "allowed": {"sks": [2, 3]},
+        "padded": ["nama_mk", "prodi"],
+        "semester": [],
+    },
+    "krs": {
+        "ranges": {"nilai_angka": (0.0, 100.0)},
+        "allowed": {},
+        "padded": [],
+        "semester": ["semester_akademik"],
+    },
+}
+
+
+def padded_mask(series: pd.Series) -> np.ndarray:
+    """Flag values with leading/trailing whitespace, checking each category once"""
+    codes, uniques = pd.factorize(series)
+    if len(uniques) == 0:
+        return np.zeros(len(series), dtype=bool)
+    uniques = pd.Index(uniques).astype(str)
+    padded = np.asarray(uniques.str.strip() != uniques)
+    return np.where(codes >= 0, padded[codes], False)
+
+
+def semester_mask(series: pd.Series) -> np.ndarray:
+    """Flag semester labels that are not 'YYYY/YYYY+1 Ganjil|Genap'"""
+    codes, uniques = pd.factorize(series)
+    if len(uniques) == 0:
+        return np.zeros(len(series), dtype=bool)
+    parts = pd.Index(uniques).astype(str).str.extract(SEMESTER_PATTERN)
+    start = pd.to_numeric(parts[0], errors="coerce")
+    end = pd.to_numeric(parts[1], errors="coerce")
+    invalid = np.asarray(~(end - start == 1))
+    return np.where(codes >= 0, invalid[codes], False)
+
+
+class QualityReport:
+    """Hasil profiling satu tabel: jumlah per pemeriksaan dan bitset baris"""
+
+    def __init__(self, table: str, n_rows: int, bitsets: Dict[str, np.ndarray],
+                 missing_per_column: Dict[str, int]):
+        self.table = table
+        self.n_rows = n_rows
+        self.bitsets = bitsets
+        self.missing_per_column = missing_per_column
+        self.counts = {name: int(np.unpackbits(bits, count=n_rows).sum())
+                       for name, bits in bitsets.items()}
+
+    @property
+    def checks(self) -> List[str]:
+        return list(self.bitsets)
+
+    def mask(self, check: str) -> np.ndarray:
+        """Return boolean row mask for a check"""
+        if check not in self.bitsets:
+            raise KeyError(f"Unknown check '{check}' for table '{self.table}'")
+        return np.unpackbits(self.bitsets[check], count=self.n_rows).astype(bool)
+
+    def flagged(self, checks: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Return rows flagged by any of the given checks (default: all)"""
+        checks = self.checks if checks is None else list(checks)
+        combined = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for check in checks:
+            if check in self.bitsets:
+                combined |= self.bitsets[check]
+        return np.unpackbits(combined, count=self.n_rows).astype(bool)
+
+    def summary(self) -> pd.DataFrame:
+        """Compact report as DataFrame"""
+        total = max(self.n_rows, 1)
+        return pd.DataFrame({
+            "Pemeriksaan": list(self.counts),
+            "Jumlah Baris": list(self.counts.values()),
+            "Persentase": [count / total * 100 for count in self.counts.values()],
+        })
+
+    def to_dict(self) -> Dict:
+        return {
+            "table": self.table,
+            "n_rows": self.n_rows,
+            "counts": dict(self.counts),
+            "missing_per_column": dict(self.missing_per_column),
+        }
+
+
+class DataProfiler:
+    """Detect the simulated data anomalies in one vectorized pass per table"""
+
+    def __init__(self, rules: Optional[Dict] = None):
+        self.rules = rules if rules is not None else TABLE_RULES
+
+    def profile(self, df: pd.DataFrame, table: str,
+                cleaned: Optional[Dict[str, np.ndarray]] = None) -> QualityReport:
+        """
+        Profile a table and return its quality report.
+
+        cleaned holds the rows changed at ingest (df.attrs["cleaning_rows"]);
+        they stay flagged under the check that would have caught them before cleaning.
+        """
+        if table not in self.rules:
+            raise ValueError(f"No quality rules defined for table: {table}")
+        rules = self.rules[table]
+        masks = {}
+
+        isnull = df.isna()
+        masks["missing"] = isnull.to_numpy().any(axis=1)
+        masks["duplicate"] = df.duplicated(keep="first").to_numpy()
+
+        for col, (low, high) in rules["ranges"].items():
+            if col in df.columns:
+                values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+                masks[f"{col}_out_of_range"] = (values < low) | (values > high)
+
+        for col, allowed in rules["allowed"].items():
+            if col in df.columns:
+                values = df[col]
+                masks[f"{col}_invalid"] = (values.notna() & ~values.isin(allowed)).to_numpy()
+
+        for col in rules["padded"]:
+            if col in df.columns:
+                masks[f"{col}_padded"] = padded_mask(df[col])
+
+        for col in rules["semester"]:
+            if col in df.columns:
+                masks[f"{col}_invalid_format"] = semester_mask(df[col])
+
+        # Nilai yang sudah di-clamp/strip/diperbaiki saat ingest tetap dihitung sebagai anomali
+        sources = {f"{col}_out_of_range": [f"{col}_clamped"] for col in rules["ranges"]}
+        sources.update({f"{col}_invalid": [f"{col}_clamped"] for col in rules["allowed"]})
+        sources.update({f"{col}_padded": [f"{col}_stripped"] for col in rules["padded"]})
+        sources.update({f"{col}_invalid_format": [f"{col}_repaired", f"{col}_invalid"]
+                        for col in rules["semester"]})
+        for check, names in sources.items():
+            for name in names:
+                if check in masks and cleaned and name in cleaned:
+                    masks[check] = masks[check] | np.unpackbits(cleaned[name], count=len(df)).astype(bool)
+
+        bitsets = {name: np.packbits(mask.astype(bool)) for name, mask in masks.items()}
+        missing_per_column = {col: int(n) for col, n in isnull.sum().items()}
+        return QualityReport(table, len(df), bitsets, missing_per_column)
+
+    def profile_all(self, tables: Dict[str, pd.DataFrame]) -> Dict[str, QualityReport]:
+        """Profile several tables keyed by table name"""
+        return {name: self.profile(df, name) for name, df in tables.items()}
@@ -0,0 +1,152 @@
+"""
+Background Data Refresh Module
+"""
+import logging
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Ekstensi berkas yang dipantau di DATA_PATH
+WATCHED_SUFFIXES = (".csv", ".xls", ".xlsx")
+
+BuildFunction = Callable[[Path], Tuple[pd.DataFrame, Dict[str, Any]]]
+
+
+class Snapshot:
+    """Immutable view of one dataset version and its derived artifacts"""
+
+    __slots__ = ("version", "data", "artifacts", "created_at")
+
+    def __init__(self, version: int, data: pd.DataFrame, artifacts: Dict[str, Any]):
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "data", data)
+        object.__setattr__(self, "artifacts", MappingProxyType(dict(artifacts)))
+        object.__setattr__(self, "created_at", time.time())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Snapshot is immutable")
+
+    def __getitem__(self, key: str) -> Any:
+        return self.artifacts[key]
+
+
+class DataRefresher:
+    """Watch a data directory and rebuild the snapshot off the request path"""
+
+    def __init__(self, data_path: str, build: BuildFunction, interval: float = 30.0,
+                 key: Optional[Callable[[], Hashable]] = None):
+        self.data_path = Path(data_path)
+        self.build = build
+        self.interval = interval
+        # Bagian tambahan signature (mis. generasi konfigurasi): build ulang saat nilainya berubah
+        self.key = key
+        self.last_error: Optional[BaseException] = None
+        self._snapshot: Optional[Snapshot] = None
+        self._signature: Optional[Tuple] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._build_lock = threading.Lock()
+        self._wake = threading.Event()
+
+    @classmethod
+    def from_config(cls, build: BuildFunction) -> "DataRefresher":
+        """Refresher on DataConfig.source_path() that follows configuration reloads while running"""
+        from config.config import DataConfig, generation, reload_if_changed
+        refresher = cls(DataConfig.source_path(), build, interval=DataConfig.REFRESH_INTERVAL)
+
+        def settings_key() -> int:
+            # Dipanggil setiap poll: .env yang diubah dimuat ulang, sumber/interval baru diterapkan,
+            # dan setiap perubahan nilai konfigurasi memicu build ulang snapshot
+            reload_if_changed()
+            refresher.configure(DataConfig.source_path(), DataConfig.REFRESH_INTERVAL)
+            return generation()
+
+        refresher.key = settings_key
+        return refresher
+
+    @property
+    def snapshot(self) -> Optional[Snapshot]:
+        """Current snapshot; reading the reference is atomic"""
+        return self._snapshot
+
+    def signature(self) -> Tuple:
+        """(name, mtime_ns, size) of every watched file in the data directory, plus key()"""
+        # key() lebih dulu: boleh mengganti data_path (configure) sebelum file di-stat
+        key = self.key() if self.key is not None else None
+        if self.data_path.is_file():
+            files = [self.data_path]
+        elif self.data_path.is_dir():
+            files = sorted(p for p in self.data_path.iterdir()
+                           if p.is_file() and p.suffix.lower() in WATCHED_SUFFIXES)
+        else:
+            files = []
+        entries = []
+        for path in files:
+            stat = path.stat()
+            entries.append((path.name, stat.st_mtime_ns, stat.st_size))
+        if self.key is not None:
+            entries.append(("key", key))
+        return tuple(entries)
+
+    def configure(self, data_path: Optional[str] = None, interval: Optional[float] = None) -> None:
+        """Apply reloaded settings to a running refresher; the poll loop picks them up at once"""
+        changed = False
+        if data_path is not None and Path(data_path) != self.data_path:
+            self.data_path, changed = Path(data_path), True
+        if interval is not None and interval != self.interval:
+            self.interval, changed = interval, True
+        if changed:
+            self.wake()
+
+    def wake(self) -> None:
+        """Poll now instead of at the end of the current interval"""
+        self._wake.set()
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild and swap the snapshot if the watched files changed"""
+        with self._build_lock:
+            signature = self.signature()
+            if not force and self._snapshot is not None and signature == self._signature:
+                return False
+            try:
+                data, artifacts = self.build(self.data_path)
+            except Exception as e:
+                # Snapshot lama tetap dipakai sampai build berikutnya berhasil
+                self.last_error = e
+                logger.exception("Data refresh failed for %s", self.data_path)
+                return False
+            version = self._snapshot.version + 1 if self._snapshot is not None else 1
+            self._snapshot = Snapshot(version, data, artifacts)
+            self._signature = signature
+            self.last_error = None
+            return True
+
+    def start(self) -> "DataRefresher":
+        """Build the first snapshot synchronously, then poll in a daemon thread"""
+        if self._snapshot is None:
+            self.refresh()
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="data-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.wake()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            # configure() membangunkan loop agar sumber/interval baru langsung berlaku
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            self.refresh()
@@ -0,0 +1,119 @@
+"""
+Time-series Rollup Module
+
+Jumlah registrasi BPJS dihitung sekali per (tanggal, jam/10 menit, poli, status)
+lalu disimpan terurut berdasarkan tanggal. Filter rentang tanggal cukup memotong
+rollup dengan searchsorted, tanpa groupby ulang atas data mentah.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+# Grain -> lebar bucket dalam detik sejak tengah malam (None = per hari)
+GRAINS: Dict[str, Optional[int]] = {"day": None, "hour": 3600, "10min": 600}
+
+DATE_KEY = "tanggal"
+BUCKET_KEY = "bucket"
+COUNT_KEY = "count"
+
+
+def seconds_of_day(values: pd.Series) -> pd.Series:
+    """Whole seconds since midnight (nullable Int64) from timedelta64 or integer seconds"""
+    if pd.api.types.is_timedelta64_dtype(values):
+        return (values // pd.Timedelta(seconds=1)).astype("Int64")
+    if pd.api.types.is_integer_dtype(values):
+        return values.astype("Int64")
+    raise TypeError(f"Expected timedelta64 or integer seconds, got {values.dtype}")
+
+
+def slice_dates(table: pd.DataFrame, start=None, end=None, date_key: str = DATE_KEY) -> pd.DataFrame:
+    """Rows of a table sorted by date_key between start and end (inclusive days)"""
+    dates = table[date_key].to_numpy(dtype="datetime64[ns]")
+    lo = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start), "ns"), "left")
+    hi = len(table) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end), "ns"), "right")
+    return table.iloc[lo:hi]
+
+
+def filter_dimensions(table: pd.DataFrame, dimensions: Sequence[str],
+                      filters: Dict[str, Optional[Iterable]]) -> pd.DataFrame:
+    """Keep rows whose dimension values are selected; an empty selection means no filter"""
+    for dim, values in filters.items():
+        if dim not in dimensions:
+            raise KeyError(f"Unknown rollup dimension: {dim}")
+        # Pilihan kosong berarti tidak difilter, sama seperti multiselect di dashboard
+        if values is not None and len(values) > 0:
+            table = table[table[dim].isin(list(values))]
+    return table
+
+
+class RollupStore:
+    """Incrementally maintained registration counts per day, hour and 10 minutes"""
+
+    def __init__(self, date_column: str = "tgl_registrasi", time_column: str = "jam_reg",
+                 dimensions: Sequence[str] = ("nm_poli", "status")):
+        self.date_column = date_column
+        self.time_column = time_column
+        self.dimensions = list(dimensions)
+        self._tables: Dict[str, pd.DataFrame] = {
+            grain: self._empty(grain) for grain in GRAINS
+        }
+
+    def _keys(self, grain: str) -> List[str]:
+        bucket = [] if GRAINS[grain] is None else [BUCKET_KEY]
+        return [DATE_KEY] + bucket + self.dimensions
+
+    def _empty(self, grain: str) -> pd.DataFrame:
+        return pd.DataFrame(columns=self._keys(grain) + [COUNT_KEY])
+
+    @property
+    def last_date(self) -> Optional[pd.Timestamp]:
+        """Latest day present in the rollup"""
+        table = self._tables["day"]
+        return None if table.empty else table[DATE_KEY].iloc[-1]
+
+    def table(self, grain: str) -> pd.DataFrame:
+        self._check_grain(grain)
+        return self._tables[grain]
+
+    def _aggregate(self, batch: pd.DataFrame, grain: str) -> pd.DataFrame:
+        frame = pd.DataFrame({DATE_KEY: batch[self.date_column].dt.normalize()})
+        width = GRAINS[grain]
+        if width is not None:
+            seconds = seconds_of_day(batch[self.time_column])
+            frame[BUCKET_KEY] = seconds // width * width
+        for dim in self.dimensions:
+            frame[dim] = batch[dim].to_numpy()
+        # Baris tanpa tanggal/jam tidak punya bucket; dimensi kosong tetap dihitung
+        frame = frame.dropna(subset=[key for key in (DATE_KEY, BUCKET_KEY) if key in frame.columns])
+        return frame.groupby(self._keys(grain), observed=True, dropna=False).size() \
+            .reset_index(name=COUNT_KEY)
+
+    def append(self, batch: pd.DataFrame) -> None:
+        """Add the counts of a batch of raw registrations to every grain"""
+        if batch.empty:
+            return
+        for grain in GRAINS:
+            partial = self._aggregate(batch, grain)
+            current = self._tables[grain]
+            if not current.empty:
+                keys = self._keys(grain)
+                partial = pd.concat([current, partial], ignore_index=True) \
+                    .groupby(keys, observed=True, dropna=False)[COUNT_KEY].sum().reset_index()
+            self._tables[grain] = partial.sort_values(self._keys(grain), kind="stable") \
+                .reset_index(drop=True)
+
+    def update(self, df: pd.DataFrame) -> int:
+        """Append only the days after last_date; returns the number of rows added"""
+        last = self.last_date
+        batch = df if last is None else df[df[self.date_column] >= last + pd.Timedelta(days=1)]
+        self.append(batch)
+        return len(batch)
+
+    def slice(self, grain: str, start=None, end=None, **filters: Optional[Iterable]) -> pd.DataFrame:
+        """Counts between start and end (inclusive days), optionally restricted per dimension"""
+        table = slice_dates(self.table(grain), start, end)
+        return filter_dimensions(table, self.dimensions, filters)
+
+    def _check_grain(self, grain: str) -> None:
+        if grain not in GRAINS:
+            raise KeyError(f"Unknown rollup grain: {grain}")
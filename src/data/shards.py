@@ -0,0 +1,156 @@
+"""
+Campus Shard Store Module
+
+Tabel mahasiswa dipecah per kampus: setiap shard adalah column store sendiri
+beserta cube partial ringkasan CAMPUS_SUMMARIES (src/data/aggregation.py).
+Tampilan satu kampus hanya membuka satu shard; tampilan lintas kampus
+menjumlahkan cube antar shard secara paralel, sehingga menambah kampus tidak
+memperlambat dashboard kampus lain.
+"""
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import pandas as pd
+from src.data.aggregates import CAMPUS_SUMMARIES
+from src.data.aggregation import build_cube, merge_cubes, rollup
+from src.data import versioned
+from src.data.column_store import ColumnStore
+from src.data.dataset import split_columns
+
+MANIFEST_FILE = "manifest.json"
+TABLE_DIR = "table"
+CUBE_FILE = "cube.csv"
+UNKNOWN_CAMPUS = "Tidak Diketahui"
+# Naikkan jika tata letak shard berubah; shard format lama dibangun ulang
+SHARD_FORMAT = 2
+
+
+def shard_name(campus: str) -> str:
+    """Filesystem-safe, stable directory name of a campus"""
+    slug = "".join(ch if ch.isalnum() else "-" for ch in campus.lower()).strip("-")
+    digest = hashlib.blake2b(campus.encode(), digest_size=4).hexdigest()
+    return f"{slug[:40]}-{digest}"
+
+
+class CampusShards:
+    """Per-campus column stores and partial aggregates of one table"""
+
+    def __init__(self, directory: str, campus_column: str = "kampus"):
+        self.directory = Path(directory)
+        self.campus_column = campus_column
+        # (direktori versi, manifest) terakhir yang dibaca; diganti utuh saat versi baru terbit
+        self._version: Optional[Tuple[Path, Dict]] = None
+
+    @property
+    def path(self) -> Path:
+        """Currently published version under directory (directory itself when nothing is published)"""
+        return versioned.current(self.directory) or self.directory
+
+    def _resolve(self) -> Tuple[Path, Dict]:
+        # Pointer CURRENT dibaca ulang setiap operasi: objek yang di-cache lama mengikuti versi terbaru
+        # dan tidak pernah memegang versi yang sudah dihapus garbage collection
+        path = self.path
+        version = self._version
+        if version is None or version[0] != path:
+            manifest_path = path / MANIFEST_FILE
+            if not manifest_path.exists():
+                raise FileNotFoundError(f"Shard store not found: {self.directory}")
+            version = (path, json.loads(manifest_path.read_text()))
+            self._version = version
+        return version
+
+    @property
+    def manifest(self) -> Dict:
+        return self._resolve()[1]
+
+    def exists(self) -> bool:
+        return (self.path / MANIFEST_FILE).exists()
+
+    def is_fresh(self, source: Path) -> bool:
+        if not self.exists():
+            return False
+        stat = Path(source).stat()
+        return self.manifest.get("format") == SHARD_FORMAT and \
+            self.manifest.get("source") == {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    @property
+    def campuses(self) -> List[str]:
+        return list(self.manifest["shards"])
+
+    @classmethod
+    def write(cls, df: pd.DataFrame, directory: str, campus_column: str = "kampus",
+              source: Optional[Path] = None, max_workers: Optional[int] = None) -> "CampusShards":
+        """
+        Split df by campus and write every shard (in parallel), replacing any existing store.
+
+        The shards and manifest form one version published atomically, so a
+        reader holding the previous manifest keeps finding its shard directories.
+        """
+        versioned.publish(directory, lambda path: cls._write_shards(df, path, campus_column, source, max_workers))
+        return cls(directory, campus_column)
+
+    @staticmethod
+    def _write_shards(df: pd.DataFrame, directory: Path, campus_column: str,
+                      source: Optional[Path], max_workers: Optional[int]) -> None:
+        directory.mkdir(parents=True)
+        campus = df[campus_column].astype("object").where(df[campus_column].notna(), UNKNOWN_CAMPUS)
+        groups = {str(name): part for name, part in df.groupby(campus, sort=True)}
+        numeric, categorical = split_columns(df)
+
+        def write_shard(name: str) -> None:
+            shard_dir = directory / shard_name(name)
+            part = groups[name].reset_index(drop=True)
+            ColumnStore.write(part, shard_dir / TABLE_DIR, numeric, categorical, atomic=False)
+            build_cube(part, CAMPUS_SUMMARIES).to_csv(shard_dir / CUBE_FILE, index=False)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(write_shard, groups))
+
+        manifest = {"format": SHARD_FORMAT, "shards": {name: shard_name(name) for name in groups},
+                    "rows": {name: len(part) for name, part in groups.items()}, "source": None}
+        if source is not None:
+            stat = Path(source).stat()
+            manifest["source"] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        (directory / MANIFEST_FILE).write_text(json.dumps(manifest))
+
+    def _shard_dir(self, campus: str, version: Optional[Tuple[Path, Dict]] = None) -> Path:
+        path, manifest = version or self._resolve()
+        if campus not in manifest["shards"]:
+            raise KeyError(f"Unknown campus shard: {campus}")
+        return path / manifest["shards"][campus]
+
+    def store(self, campus: str) -> ColumnStore:
+        """Column store of one campus (memory-mapped)"""
+        return ColumnStore(self._shard_dir(campus) / TABLE_DIR)
+
+    def load(self, campus: str) -> pd.DataFrame:
+        """Rows of one campus; no other shard is touched"""
+        return self.store(campus).to_frame()
+
+    def cube(self, campus: str, version: Optional[Tuple[Path, Dict]] = None) -> pd.DataFrame:
+        """Additive partials of one campus for every CAMPUS_SUMMARIES aggregation"""
+        return pd.read_csv(self._shard_dir(campus, version) / CUBE_FILE)
+
+    def aggregates(self, campuses: Optional[Sequence[str]] = None,
+                   max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+        """Final aggregate tables of the selected campuses (all when None)
+
+        Shard cubes are read in parallel and summed; each summary is then rolled
+        up from the merged cube in its own worker.
+        """
+        for attempt in range(2):
+            # Semua cube dibaca dari satu versi agar hasil gabungan konsisten
+            version = self._resolve()
+            selected = list(version[1]["shards"]) if campuses is None or len(campuses) == 0 else list(campuses)
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    cube = merge_cubes(executor.map(lambda name: self.cube(name, version), selected),
+                                       CAMPUS_SUMMARIES)
+                    tables = executor.map(lambda name: rollup(cube, CAMPUS_SUMMARIES[name]), CAMPUS_SUMMARIES)
+                    return dict(zip(CAMPUS_SUMMARIES, tables))
+            except FileNotFoundError:
+                # Versi dihapus di tengah pembacaan (dua build baru sekaligus): ulangi sekali dengan versi terbaru
+                if attempt:
+                    raise
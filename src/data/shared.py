@@ -0,0 +1,139 @@
+"""
+Shared-Memory Dataset Module
+
+Tabel yang sudah dibersihkan dipublikasikan sekali sebagai column store di
+/dev/shm, lalu setiap worker melakukan attach secara zero-copy lewat mmap.
+"""
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+import pandas as pd
+from src.data.column_store import ColumnStore
+from src.data.dataset import split_columns
+
+try:
+    import fcntl
+except ImportError:  # Windows tidak punya fcntl; publish tidak dikunci
+    fcntl = None
+
+CURRENT_FILE = "CURRENT"
+LEASE_DIR = "leases"
+
+
+def default_shared_root() -> Path:
+    """Use tmpfs (/dev/shm) when available so pages live in shared memory"""
+    shm = Path("/dev/shm")
+    base = shm if shm.is_dir() else Path(tempfile.gettempdir())
+    return base / "university-dashboard"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedDataset:
+    """Versioned, shared-memory copy of one table with lease-based refcounting"""
+
+    def __init__(self, name: str, root: Optional[str] = None):
+        self.name = name
+        self.root = (Path(root) if root is not None else default_shared_root()) / name
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._attached_version: Optional[str] = None
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Exclusive lock across processes for publish/garbage collection"""
+        with open(self.root / ".lock", "w") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    @property
+    def version(self) -> Optional[str]:
+        """Currently published version, or None"""
+        try:
+            return (self.root / CURRENT_FILE).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def store(self, version: Optional[str] = None) -> ColumnStore:
+        version = version or self.version
+        if version is None:
+            raise FileNotFoundError(f"No published version for shared dataset: {self.name}")
+        return ColumnStore(self.root / version)
+
+    def is_current(self, source: Path) -> bool:
+        """Check whether the published version was built from source as it is now"""
+        return self.version is not None and self.store().is_fresh(source)
+
+    def publish(self, df: pd.DataFrame, source: Optional[Path] = None) -> str:
+        """Write a new version and swap the CURRENT pointer atomically (call under lock())"""
+        version = f"v{time.time_ns()}"
+        numeric, categorical = split_columns(df)
+        ColumnStore.write(df, self.root / version, numeric, categorical, source=source, atomic=False)
+
+        pointer_tmp = self.root / f"{CURRENT_FILE}.tmp-{os.getpid()}"
+        pointer_tmp.write_text(version)
+        os.replace(pointer_tmp, self.root / CURRENT_FILE)
+        self.collect_garbage()
+        return version
+
+    def attach(self) -> ColumnStore:
+        """Lease the current version and open it zero-copy"""
+        with self.lock():
+            version = self.version
+            if version is None:
+                raise FileNotFoundError(f"No published version for shared dataset: {self.name}")
+            if version != self._attached_version:
+                lease_dir = self.root / version / LEASE_DIR
+                lease_dir.mkdir(exist_ok=True)
+                (lease_dir / str(os.getpid())).touch()
+                self._release_versions(keep=version)
+                self._attached_version = version
+        return self.store(version)
+
+    def release(self) -> None:
+        """Drop this process's leases on every version"""
+        self._release_versions(keep=None)
+        self._attached_version = None
+
+    def _release_versions(self, keep: Optional[str]) -> None:
+        # Mmap yang masih dipakai tetap valid walau berkas versinya dihapus
+        for lease in self.root.glob(f"v*/{LEASE_DIR}/{os.getpid()}"):
+            if lease.parent.parent.name != keep:
+                lease.unlink(missing_ok=True)
+
+    def is_stale(self) -> bool:
+        """True when a newer version was published after this process attached"""
+        return self._attached_version is not None and self._attached_version != self.version
+
+    def collect_garbage(self) -> None:
+        """Remove old versions that no live process still leases (call under lock())"""
+        current = self.version
+        for path in self.root.iterdir():
+            if not path.is_dir() or path.name == current or not path.name.startswith("v"):
+                continue
+            lease_dir = path / LEASE_DIR
+            leases = list(lease_dir.iterdir()) if lease_dir.exists() else []
+            live = False
+            for lease in leases:
+                if lease.name.isdigit() and _pid_alive(int(lease.name)):
+                    live = True
+                else:
+                    lease.unlink(missing_ok=True)
+            if not live:
+                shutil.rmtree(path, ignore_errors=True)
@@ -1,6 +1,26 @@
+"""
+Simulasi Data Kampus Indonesia
+
+Generator dataset mahasiswa, mata kuliah dan KRS (dengan noise dan anomali
+yang disengaja), serta ringkasan per kampus. Import modul ini tidak
+menjalankan apa pun: data dibuat lewat generate_dataset(), ringkasan dihitung
+oleh engine agregasi deklaratif (CAMPUS_SUMMARIES di src/data/aggregates.py).
+Atribut lama (students, aktif_per_kampus, ...) tetap tersedia dan baru
+dihitung saat pertama diakses.
+"""
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Tuple
 import numpy as np
 import pandas as pd
 
+if __package__ in (None, ""):
+    # Dijalankan langsung sebagai script: root proyek belum ada di sys.path
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.aggregates import CAMPUS_SUMMARIES, campus_summaries
+
 # ============================================================
 # 1. DAFTAR KAMPUS (GANTI SENDIRI DENGAN KAMPUS INDONESIA)
 # ============================================================
@@ -13,9 +33,9 @@ campuses = [
 # 2. SIMULASI DATA MAHASISWA
 # ============================================================
 
-np.random.seed(42)  # supaya hasil konsisten
-
-n_students = 42000  # total mahasiswa simulasi (termasuk S1-S3 dan profesi) - 30000 sekarang + 6000 baru (2024-2025)
+N_STUDENTS = 42000  # total mahasiswa simulasi (termasuk S1-S3 dan profesi) - 30000 sekarang + 6000 baru (2024-2025)
+N_COURSES = 150
+N_KRS = 45000
 
 prodi_rumpun = [
     # Fakultas Teknologi Industri
@@ -86,161 +106,123 @@ jalur_probs = [0.45, 0.25, 0.20, 0.10]
 jenjang_probs = [0.08, 0.05, 0.75, 0.07, 0.01, 0.04]
 kelamin_probs = [0.48, 0.52]
 
-# Generate angkatan choices first so we can use them for both ID and angkatan field
-angkatan_values = np.random.choice(angkatan_choices, size=n_students)
-
-students = pd.DataFrame({
-    "id_mahasiswa": [
-        int(f"{angkatan}{str(i).zfill(6)}")
-        for angkatan, i in zip(
-            angkatan_values,
-            range(1, n_students + 1)
-        )
-    ],
-    "kampus": np.random.choice(campuses, size=n_students),
-    "prodi": np.random.choice(prodi_rumpun, size=n_students),
-    "angkatan": angkatan_values,
-    "status": np.random.choice(status_choices, p=status_probs, size=n_students),
-    "jalur_masuk": np.random.choice(jalur_masuk_choices, p=jalur_probs, size=n_students),
-    "jenjang": np.random.choice(jenjang_choices, p=jenjang_probs, size=n_students),
-    "jenis_kelamin": np.random.choice(kelamin_choices, p=kelamin_probs, size=n_students),
-})
-students = students.sort_values(['angkatan', 'prodi', 'id_mahasiswa']).reset_index(drop=True)
-
-# IPK realistis
-base_gpa = np.random.normal(loc=3.15, scale=0.25, size=n_students)
-students["ipk"] = base_gpa.clip(2.0, 4.0)
-
-mask_lulus = students["status"] == "LULUS"
-students.loc[mask_lulus, "ipk"] = (
-    students.loc[mask_lulus, "ipk"] + np.random.normal(0.15, 0.10, mask_lulus.sum())
-).clip(2.5, 4.0)
-
-# Menambahkan noise dan anomali ke data agar lebih realistis
-np.random.seed(42)  # untuk konsistensi
-
-# 1. Menambahkan missing values (data hilang)
-missing_fraction = 0.05  # 5% data akan hilang
-for col in students.columns:
-    if col not in ['id_mahasiswa', 'angkatan']:  # jangan hapus ID dan angkatan
-        mask = np.random.rand(len(students)) < missing_fraction
-        students.loc[mask, col] = np.nan
-
-# 2. Menambahkan beberapa data duplikat
-n_duplicates = int(n_students * 0.02)  # 2% data akan diduplikat
-duplicate_indices = np.random.choice(students.index, size=n_duplicates, replace=True)
-duplicate_rows = students.loc[duplicate_indices].copy()
-students = pd.concat([students, duplicate_rows], ignore_index=True)
-
-# 3. Menambahkan beberapa outliers pada IPK
-outlier_fraction = 0.005  # 0.5% data IPK akan menjadi outlier
-outlier_indices = np.random.choice(students.index, size=int(len(students) * outlier_fraction), replace=False)
-students.loc[outlier_indices, 'ipk'] = np.random.uniform(0, 1, size=len(outlier_indices))
-
-# 4. Menambahkan beberapa data dengan nilai tidak valid
-# Beberapa jenis kelamin dengan nilai tidak valid
-invalid_gender_indices = np.random.choice(students.index, size=int(len(students) * 0.005), replace=False)
-students.loc[invalid_gender_indices, 'jenis_kelamin'] = np.random.choice(['L', 'P'], size=len(invalid_gender_indices))
-
-# 5. Menambahkan beberapa nilai IPK di luar rentang normal (di atas 4.0)
-high_gpa_indices = np.random.choice(students.index, size=int(len(students) * 0.002), replace=False)
-students.loc[high_gpa_indices, 'ipk'] = np.random.uniform(4.1, 5.0, size=len(high_gpa_indices))
-
-# 6. Menambahkan whitespace dan formatting tidak konsisten
-whitespace_indices = np.random.choice(students.index, size=int(len(students) * 0.03), replace=False)
-students.loc[whitespace_indices, 'prodi'] = students.loc[whitespace_indices, 'prodi'].apply(lambda x: f" {x} " if pd.notna(x) else x)
-
-# 7. Menambahkan beberapa nilai status yang tidak valid
-invalid_status_indices = np.random.choice(students.index, size=int(len(students) * 0.003), replace=False)
-students.loc[invalid_status_indices, 'status'] = np.random.choice(['AKTIF', 'LULUS', 'DO', 'CUTI'], size=len(invalid_status_indices))
-
-# 8. Menambahkan beberapa jalur masuk yang tidak valid
-invalid_jalur_indices = np.random.choice(students.index, size=int(len(students) * 0.003), replace=False)
-students.loc[invalid_jalur_indices, 'jalur_masuk'] = np.random.choice(["Mandiri", "Beasiswa", "Transfer", "Alih Jenjang"], size=len(invalid_jalur_indices))
+
+def generate_students(n_students: int = N_STUDENTS) -> pd.DataFrame:
+    """Student table with missing values, duplicates, outliers and formatting noise"""
+    np.random.seed(42)  # supaya hasil konsisten
+
+    # Generate angkatan choices first so we can use them for both ID and angkatan field
+    angkatan_values = np.random.choice(angkatan_choices, size=n_students)
+
+    students = pd.DataFrame({
+        "id_mahasiswa": [
+            int(f"{angkatan}{str(i).zfill(6)}")
+            for angkatan, i in zip(
+                angkatan_values,
+                range(1, n_students + 1)
+            )
+        ],
+        "kampus": np.random.choice(campuses, size=n_students),
+        "prodi": np.random.choice(prodi_rumpun, size=n_students),
+        "angkatan": angkatan_values,
+        "status": np.random.choice(status_choices, p=status_probs, size=n_students),
+        "jalur_masuk": np.random.choice(jalur_masuk_choices, p=jalur_probs, size=n_students),
+        "jenjang": np.random.choice(jenjang_choices, p=jenjang_probs, size=n_students),
+        "jenis_kelamin": np.random.choice(kelamin_choices, p=kelamin_probs, size=n_students),
+    })
+    students = students.sort_values(['angkatan', 'prodi', 'id_mahasiswa']).reset_index(drop=True)
+
+    # IPK realistis
+    base_gpa = np.random.normal(loc=3.15, scale=0.25, size=n_students)
+    students["ipk"] = base_gpa.clip(2.0, 4.0)
+
+    mask_lulus = students["status"] == "LULUS"
+    students.loc[mask_lulus, "ipk"] = (
+        students.loc[mask_lulus, "ipk"] + np.random.normal(0.15, 0.10, mask_lulus.sum())
+    ).clip(2.5, 4.0)
+
+    # Menambahkan noise dan anomali ke data agar lebih realistis
+    np.random.seed(42)  # untuk konsistensi
+
+    # 1. Menambahkan missing values (data hilang)
+    missing_fraction = 0.05  # 5% data akan hilang
+    for col in students.columns:
+        if col not in ['id_mahasiswa', 'angkatan']:  # jangan hapus ID dan angkatan
+            mask = np.random.rand(len(students)) < missing_fraction
+            students.loc[mask, col] = np.nan
+
+    # 2. Menambahkan beberapa data duplikat
+    n_duplicates = int(n_students * 0.02)  # 2% data akan diduplikat
+    duplicate_indices = np.random.choice(students.index, size=n_duplicates, replace=True)
+    duplicate_rows = students.loc[duplicate_indices].copy()
+    students = pd.concat([students, duplicate_rows], ignore_index=True)
+
+    # 3. Menambahkan beberapa outliers pada IPK
+    outlier_fraction = 0.005  # 0.5% data IPK akan menjadi outlier
+    outlier_indices = np.random.choice(students.index, size=int(len(students) * outlier_fraction), replace=False)
+    students.loc[outlier_indices, 'ipk'] = np.random.uniform(0, 1, size=len(outlier_indices))
+
+    # 4. Menambahkan beberapa data dengan nilai tidak valid
+    # Beberapa jenis kelamin dengan nilai tidak valid
+    invalid_gender_indices = np.random.choice(students.index, size=int(len(students) * 0.005), replace=False)
+    students.loc[invalid_gender_indices, 'jenis_kelamin'] = np.random.choice(['L', 'P'], size=len(invalid_gender_indices))
+
+    # 5. Menambahkan beberapa nilai IPK di luar rentang normal (di atas 4.0)
+    high_gpa_indices = np.random.choice(students.index, size=int(len(students) * 0.002), replace=False)
+    students.loc[high_gpa_indices, 'ipk'] = np.random.uniform(4.1, 5.0, size=len(high_gpa_indices))
+
+    # 6. Menambahkan whitespace dan formatting tidak konsisten
+    whitespace_indices = np.random.choice(students.index, size=int(len(students) * 0.03), replace=False)
+    students.loc[whitespace_indices, 'prodi'] = students.loc[whitespace_indices, 'prodi'].apply(lambda x: f" {x} " if pd.notna(x) else x)
+
+    # 7. Menambahkan beberapa nilai status yang tidak valid
+    invalid_status_indices = np.random.choice(students.index, size=int(len(students) * 0.003), replace=False)
+    students.loc[invalid_status_indices, 'status'] = np.random.choice(['AKTIF', 'LULUS', 'DO', 'CUTI'], size=len(invalid_status_indices))
+
+    # 8. Menambahkan beberapa jalur masuk yang tidak valid
+    invalid_jalur_indices = np.random.choice(students.index, size=int(len(students) * 0.003), replace=False)
+    students.loc[invalid_jalur_indices, 'jalur_masuk'] = np.random.choice(["Mandiri", "Beasiswa", "Transfer", "Alih Jenjang"], size=len(invalid_jalur_indices))
+
+    return students
 
 
 # ============================================================
 # 3. SIMULASI DATA MATA KULIAH & KRS
 # ============================================================
 
-# Duplicate definition removed - already defined earlier in the file
-
-n_courses = 150
-
-courses = pd.DataFrame({
-    "kode_mk": [f"MK{str(i).zfill(3)}" for i in range(1, n_courses + 1)],
-    "nama_mk": [f"Mata Kuliah {i}" for i in range(1, n_courses + 1)],
-    "sks": np.random.choice([2, 3], size=n_courses, p=[0.3, 0.7]),
-    "prodi": np.random.choice(prodi_rumpun, size=n_courses),
-})
-
-# Menambahkan noise dan anomali ke data mata kuliah
-np.random.seed(42)
-
-# 1. Menambahkan missing values ke data mata kuliah
-missing_fraction_courses = 0.03  # 3% data akan hilang
-for col in courses.columns:
-    if col != 'kode_mk':  # jangan hapus kode_mk karena itu ID
-        mask = np.random.rand(len(courses)) < missing_fraction_courses
-        courses.loc[mask, col] = np.nan
-
-# 2. Menambahkan beberapa data duplikat
-n_duplicates_courses = int(n_courses * 0.01)  # 1% data akan diduplikat
-duplicate_indices_courses = np.random.choice(courses.index, size=n_duplicates_courses, replace=True)
-duplicate_rows_courses = courses.loc[duplicate_indices_courses].copy()
-courses = pd.concat([courses, duplicate_rows_courses], ignore_index=True)
-
-# 3. Menambahkan beberapa nilai SKS yang tidak valid
-invalid_sks_indices = np.random.choice(courses.index, size=int(len(courses) * 0.005), replace=False)
-courses.loc[invalid_sks_indices, 'sks'] = np.random.choice([0, 1, 4, 5, 6], size=len(invalid_sks_indices))
-
-# 4. Menambahkan whitespace dan formatting tidak konsisten
-whitespace_indices_courses = np.random.choice(courses.index, size=int(len(courses) * 0.02), replace=False)
-courses.loc[whitespace_indices_courses, 'nama_mk'] = courses.loc[whitespace_indices_courses, 'nama_mk'].apply(lambda x: f" {x} " if pd.notna(x) else x)
-
-n_krs = 45000
-
-krs = pd.DataFrame({
-    "id_krs": range(1, n_krs + 1),
-    "id_mahasiswa": np.random.choice(students["id_mahasiswa"], size=n_krs),
-    "kode_mk": np.random.choice(courses["kode_mk"], size=n_krs),
-    "semester_akademik": np.random.choice(
-        ["202/2023 Ganjil", "2022/2023 Genap", "2023/2024 Ganjil"],
-        size=n_krs,
-    ),
-})
-
-nilai_angka = np.random.normal(loc=78, scale=8, size=n_krs).clip(40, 100)
-krs["nilai_angka"] = nilai_angka
-
-# Menambahkan noise dan anomali ke data KRS
-np.random.seed(42)
-
-# 1. Menambahkan missing values ke data KRS
-missing_fraction_krs = 0.04  # 4% data akan hilang
-for col in krs.columns:
-    if col != 'id_krs':  # jangan hapus ID
-        mask = np.random.rand(len(krs)) < missing_fraction_krs
-        krs.loc[mask, col] = np.nan
-
-# 2. Menambahkan beberapa data duplikat
-n_duplicates_krs = int(n_krs * 0.03)  # 3% data akan diduplikat
-duplicate_indices_krs = np.random.choice(krs.index, size=n_duplicates_krs, replace=True)
-duplicate_rows_krs = krs.loc[duplicate_indices_krs].copy()
-krs = pd.concat([krs, duplicate_rows_krs], ignore_index=True)
-
-# 3. Menambahkan beberapa nilai nilai_angka yang tidak valid (outliers)
-outlier_fraction = 0.005  # 0.5% data nilai_angka akan menjadi outlier
-outlier_indices = np.random.choice(krs.index, size=int(len(krs) * outlier_fraction), replace=False)
-krs.loc[outlier_indices, 'nilai_angka'] = np.random.uniform(0, 39, size=len(outlier_indices))
-
-# 4. Menambahkan beberapa nilai nilai_angka yang di atas rentang normal
-high_nilai_indices = np.random.choice(krs.index, size=int(len(krs) * 0.005), replace=False)
-krs.loc[high_nilai_indices, 'nilai_angka'] = np.random.uniform(101, 150, size=len(high_nilai_indices))
-
-# 5. Menambahkan beberapa semester yang tidak valid
-invalid_semester_indices = np.random.choice(krs.index, size=int(len(krs) * 0.01), replace=False)
-krs.loc[invalid_semester_indices, 'semester_akademik'] = np.random.choice(['2021/2022 Ganjil', '2021/2022 Genap', '2024/2025 Ganjil'], size=len(invalid_semester_indices))
+def generate_courses(n_courses: int = N_COURSES) -> pd.DataFrame:
+    """Course table; continues the global RNG state left by generate_students()"""
+    courses = pd.DataFrame({
+        "kode_mk": [f"MK{str(i).zfill(3)}" for i in range(1, n_courses + 1)],
+        "nama_mk": [f"Mata Kuliah {i}" for i in range(1, n_courses + 1)],
+        "sks": np.random.choice([2, 3], size=n_courses, p=[0.3, 0.7]),
+        "prodi": np.random.choice(prodi_rumpun, size=n_courses),
+    })
+
+    # Menambahkan noise dan anomali ke data mata kuliah
+    np.random.seed(42)
+
+    # 1. Menambahkan missing values ke data mata kuliah
+    missing_fraction_courses = 0.03  # 3% data akan hilang
+    for col in courses.columns:
+        if col != 'kode_mk':  # jangan hapus kode_mk karena itu ID
+            mask = np.random.rand(len(courses)) < missing_fraction_courses
+            courses.loc[mask, col] = np.nan
+
+    # 2. Menambahkan beberapa data duplikat
+    n_duplicates_courses = int(n_courses * 0.01)  # 1% data akan diduplikat
+    duplicate_indices_courses = np.random.choice(courses.index, size=n_duplicates_courses, replace=True)
+    duplicate_rows_courses = courses.loc[duplicate_indices_courses].copy()
+    courses = pd.concat([courses, duplicate_rows_courses], ignore_index=True)
+
+    # 3. Menambahkan beberapa nilai SKS yang tidak valid
+    invalid_sks_indices = np.random.choice(courses.index, size=int(len(courses) * 0.005), replace=False)
+    courses.loc[invalid_sks_indices, 'sks'] = np.random.choice([0, 1, 4, 5, 6], size=len(invalid_sks_indices))
+
+    # 4. Menambahkan whitespace dan formatting tidak konsisten
+    whitespace_indices_courses = np.random.choice(courses.index, size=int(len(courses) * 0.02), replace=False)
+    courses.loc[whitespace_indices_courses, 'nama_mk'] = courses.loc[whitespace_indices_courses, 'nama_mk'].apply(lambda x: f" {x} " if pd.notna(x) else x)
+    return courses
 
 
 def konversi_huruf(x: float) -> str:
@@ -255,75 +237,98 @@ def konversi_huruf(x: float) -> str:
     return "E"
 
 
-krs["nilai_huruf"] = krs["nilai_angka"].apply(konversi_huruf)
+def generate_krs(students: pd.DataFrame, courses: pd.DataFrame, n_krs: int = N_KRS) -> pd.DataFrame:
+    """KRS rows of random students and courses, with noisy grades and semesters"""
+    krs = pd.DataFrame({
+        "id_krs": range(1, n_krs + 1),
+        "id_mahasiswa": np.random.choice(students["id_mahasiswa"], size=n_krs),
+        "kode_mk": np.random.choice(courses["kode_mk"], size=n_krs),
+        "semester_akademik": np.random.choice(
+            ["202/2023 Ganjil", "2022/2023 Genap", "2023/2024 Ganjil"],
+            size=n_krs,
+        ),
+    })
+
+    nilai_angka = np.random.normal(loc=78, scale=8, size=n_krs).clip(40, 100)
+    krs["nilai_angka"] = nilai_angka
+
+    # Menambahkan noise dan anomali ke data KRS
+    np.random.seed(42)
+
+    # 1. Menambahkan missing values ke data KRS
+    missing_fraction_krs = 0.04  # 4% data akan hilang
+    for col in krs.columns:
+        if col != 'id_krs':  # jangan hapus ID
+            mask = np.random.rand(len(krs)) < missing_fraction_krs
+            krs.loc[mask, col] = np.nan
+
+    # 2. Menambahkan beberapa data duplikat
+    n_duplicates_krs = int(n_krs * 0.03)  # 3% data akan diduplikat
+    duplicate_indices_krs = np.random.choice(krs.index, size=n_duplicates_krs, replace=True)
+    duplicate_rows_krs = krs.loc[duplicate_indices_krs].copy()
+    krs = pd.concat([krs, duplicate_rows_krs], ignore_index=True)
+
+    # 3. Menambahkan beberapa nilai nilai_angka yang tidak valid (outliers)
+    outlier_fraction = 0.005  # 0.5% data nilai_angka akan menjadi outlier
+    outlier_indices = np.random.choice(krs.index, size=int(len(krs) * outlier_fraction), replace=False)
+    krs.loc[outlier_indices, 'nilai_angka'] = np.random.uniform(0, 39, size=len(outlier_indices))
+
+    # 4. Menambahkan beberapa nilai nilai_angka yang di atas rentang normal
+    high_nilai_indices = np.random.choice(krs.index, size=int(len(krs) * 0.005), replace=False)
+    krs.loc[high_nilai_indices, 'nilai_angka'] = np.random.uniform(101, 150, size=len(high_nilai_indices))
+
+    # 5. Menambahkan beberapa semester yang tidak valid
+    invalid_semester_indices = np.random.choice(krs.index, size=int(len(krs) * 0.01), replace=False)
+    krs.loc[invalid_semester_indices, 'semester_akademik'] = np.random.choice(['2021/2022 Ganjil', '2021/2022 Genap', '2024/2025 Ganjil'], size=len(invalid_semester_indices))
+
+    krs["nilai_huruf"] = krs["nilai_angka"].apply(konversi_huruf)
+    return krs
+
+
+def generate_dataset() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """(students, courses, krs), generated in the order that keeps the seeded output stable"""
+    students = generate_students()
+    courses = generate_courses()
+    krs = generate_krs(students, courses)
+    return students, courses, krs
 
 
 # ============================================================
 # 4. AGREGASI UNTUK DASHBOARD (ALA MUS, VERSI KAMPUS INDONESIA)
 # ============================================================
 
-# a. Jumlah mahasiswa aktif per kampus
-aktif_per_kampus = (
-    students[students["status"] == "AKTIF"]
-    .groupby("kampus")
-    .size()
-    .reset_index(name="jumlah_mahasiswa_aktif")
-    .sort_values("jumlah_mahasiswa_aktif", ascending=False)
-)
-
-# b. Tren angkatan per kampus
-angkatan_trend = (
-    students
-    .groupby(["angkatan", "kampus"])
-    .size()
-    .reset_index(name="jumlah_mhs")
-    .sort_values(["angkatan", "kampus"])
-)
-
-# c. Distribusi status studi
-status_dist = (
-    students
-    .groupby(["kampus", "status"])
-    .size()
-    .reset_index(name="jumlah")
-    .sort_values(["kampus", "status"])
-)
-
-# d. Rata-rata IPK per kampus dan jenjang
-ipk_summary = (
-    students
-    .groupby(["kampus", "jenjang"])
-    .agg(
-        jumlah_mhs=("id_mahasiswa", "count"),
-        rata2_ipk=("ipk", "mean"),
-    )
-    .reset_index()
-    .sort_values(["kampus", "jenjang"])
-)
-
-# e. Distribusi mahasiswa per prodi
-prodi_dist = (
-    students
-    .groupby(["kampus", "prodi"])
-    .size()
-    .reset_index(name="jumlah_mhs")
-    .sort_values("jumlah_mhs", ascending=False)
-)
-
-# f. Jalur masuk per kampus
-jalur_masuk_dist = (
-    students
-    .groupby(["kampus", "jalur_masuk"])
-    .size()
-    .reset_index(name="jumlah_mhs")
-    .sort_values(["kampus", "jalur_masuk"])
-)
+def summaries(students: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """aktif_per_kampus, angkatan_trend, status_dist, ipk_summary, prodi_dist, jalur_masuk_dist"""
+    return campus_summaries(students)
+
+
+@lru_cache(maxsize=1)
+def _simulation() -> Dict[str, pd.DataFrame]:
+    students, courses, krs = generate_dataset()
+    return {"students": students, "courses": courses, "krs": krs, **summaries(students)}
+
+
+def __getattr__(name: str):
+    # Kompatibilitas: `simulasi_kampus_indonesia.status_dist` dll. dihitung saat pertama diakses
+    if name in ("students", "courses", "krs") or name in CAMPUS_SUMMARIES:
+        return _simulation()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # ============================================================
 # 5. CONTOH OUTPUT RINGKAS DI TERMINAL
 # ============================================================
 
-if __name__ == "__main__":
+def main():
+    students, courses, krs = generate_dataset()
+    tables = summaries(students)
+    aktif_per_kampus = tables["aktif_per_kampus"]
+    angkatan_trend = tables["angkatan_trend"]
+    status_dist = tables["status_dist"]
+    ipk_summary = tables["ipk_summary"]
+    prodi_dist = tables["prodi_dist"]
+    jalur_masuk_dist = tables["jalur_masuk_dist"]
+
     print("==== CONTOH DATA MAHASISWA ====")
     print(students.head(), "\n")
 
@@ -382,3 +387,6 @@ if __name__ == "__main__":
     invalid_gender = students[students['jenis_kelamin'].isin(['Laki-laki', 'Perempuan', 'M', 'F', 'X'])]
     print(f"Jumlah jenis kelamin dengan format tidak valid: {len(invalid_gender)}")
 
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+Approximate Distinct-Count and Quantile Sketch Module
+
+HyperLogLog (jumlah nilai unik) dan t-digest (kuantil) dibangun per partisi
+saat ingest. Keduanya mergeable: register HLL digabung dengan max, centroid
+t-digest digabung lalu dikompres ulang. Kunci partisi disimpan sekali dalam
+tabel kecil yang dipotong seperti rollup; register HLL disimpan dense (array
+partisi x 2^precision per kolom), sehingga query cukup satu max() atas baris
+partisi terpilih.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from src.data.rollup import DATE_KEY, filter_dimensions, slice_dates
+
+PARTITION_KEY = "partition"
+MEAN_KEY = "mean"
+WEIGHT_KEY = "weight"
+
+
+def hash_values(values: pd.Series) -> np.ndarray:
+    """64-bit hash per non-null value; equal values always hash equal"""
+    values = values.dropna()
+    return pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    """Vectorized int.bit_length for uint64 arrays"""
+    x = x.copy()
+    length = np.zeros(x.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        mask = x >= (np.uint64(1) << np.uint64(shift))
+        length[mask] += shift
+        x[mask] >>= np.uint64(shift)
+    return length + (x > 0)
+
+
+def hll_registers(hashes: np.ndarray, precision: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(register index, rank) per hash: first `precision` bits pick the register"""
+    width = 64 - precision
+    index = (hashes >> np.uint64(width)).astype(np.int64)
+    rest = hashes & np.uint64((1 << width) - 1)
+    rank = (width - _bit_length(rest) + 1).astype(np.uint8)
+    return index, rank
+
+
+def hll_estimate(registers: np.ndarray) -> float:
+    """HyperLogLog cardinality estimate with linear counting for small ranges"""
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.power(2.0, -registers.astype(np.float64)))
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros > 0:
+        return m * np.log(m / zeros)
+    return float(estimate)
+
+
+def _k1_cluster(q_mid: np.ndarray, compression: float) -> np.ndarray:
+    # k1(q) = delta / (2 pi) * asin(2q - 1): cluster kecil di ekor, besar di tengah
+    k = compression / (2 * np.pi) * np.arcsin(2 * q_mid - 1)
+    return np.floor(k + compression / 4).astype(np.int64)
+
+
+def tdigest_compress(means: np.ndarray, weights: np.ndarray,
+                     compression: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge centroids so each cluster spans at most one unit of the k1 scale function"""
+    if len(means) == 0:
+        return means, weights
+    order = np.argsort(means, kind="stable")
+    means, weights = means[order], weights[order]
+    q_mid = (np.cumsum(weights) - weights / 2) / weights.sum()
+    cluster = _k1_cluster(q_mid, compression)
+    merged_weights = np.bincount(cluster, weights=weights)
+    merged_means = np.bincount(cluster, weights=means * weights)
+    used = merged_weights > 0
+    return merged_means[used] / merged_weights[used], merged_weights[used]
+
+
+def compress_centroids(frame: pd.DataFrame, keys: List[str], compression: float) -> pd.DataFrame:
+    """tdigest_compress applied to every group of a long-form (keys, mean, weight) table"""
+    frame = frame.sort_values(keys + [MEAN_KEY], kind="stable")
+    weights = frame[WEIGHT_KEY].to_numpy(dtype=np.float64)
+    grouped = frame.groupby(keys, observed=True, dropna=False, sort=False)[WEIGHT_KEY]
+    q_mid = (grouped.cumsum().to_numpy(dtype=np.float64) - weights / 2) / \
+        grouped.transform("sum").to_numpy(dtype=np.float64)
+    frame = frame.assign(cluster=_k1_cluster(q_mid, compression),
+                         weighted=frame[MEAN_KEY].to_numpy(dtype=np.float64) * weights)
+    merged = frame.groupby(keys + ["cluster"], observed=True, dropna=False)[["weighted", WEIGHT_KEY]].sum()
+    merged[MEAN_KEY] = merged["weighted"] / merged[WEIGHT_KEY]
+    return merged.reset_index()[keys + [MEAN_KEY, WEIGHT_KEY]]
+
+
+def tdigest_quantile(means: np.ndarray, weights: np.ndarray, qs: Sequence[float],
+                     minimum: float, maximum: float) -> np.ndarray:
+    """Interpolate quantiles between centroid midpoints, clamped to the exact min/max"""
+    qs = np.asarray(qs, dtype=np.float64)
+    if len(means) == 0:
+        return np.full(qs.shape, np.nan)
+    order = np.argsort(means, kind="stable")
+    means, weights = means[order], weights[order]
+    total = weights.sum()
+    positions = np.concatenate([[0.0], np.cumsum(weights) - weights / 2, [total]])
+    values = np.concatenate([[minimum], means, [maximum]])
+    return np.interp(qs * total, positions, values)
+
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch (standard error ~1.04 / sqrt(2^precision))"""
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, values: pd.Series) -> "HyperLogLog":
+        index, rank = hll_registers(hash_values(values), self.precision)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> float:
+        return hll_estimate(self.registers)
+
+
+class TDigest:
+    """Mergeable quantile sketch with exact count, min and max"""
+
+    def __init__(self, compression: float = 100.0):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def add(self, values: pd.Series) -> "TDigest":
+        values = pd.to_numeric(values, errors="coerce").dropna().to_numpy(dtype=np.float64)
+        if len(values):
+            self.min = min(self.min, values.min())
+            self.max = max(self.max, values.max())
+            self._compress(values, np.ones(len(values)))
+        return self
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        if other.count:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress(other.means, other.weights)
+        return self
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        self.means, self.weights = tdigest_compress(
+            np.concatenate([self.means, means]), np.concatenate([self.weights, weights]), self.compression)
+
+    def quantile(self, qs: Sequence[float]) -> np.ndarray:
+        return tdigest_quantile(self.means, self.weights, qs, self.min, self.max)
+
+
+class SketchIndex:
+    """HyperLogLog and t-digest partials per partition, merged for the active filter"""
+
+    def __init__(self, distinct_columns: Sequence[str], quantile_columns: Sequence[str] = (),
+                 date_column: Optional[str] = "tgl_registrasi", dimensions: Sequence[str] = ("nm_poli", "status"),
+                 precision: int = 12, compression: float = 100.0):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.distinct_columns = list(distinct_columns)
+        self.quantile_columns = list(quantile_columns)
+        self.date_column = date_column
+        self.dimensions = list(dimensions)
+        self.precision = precision
+        self.compression = compression
+        # Satu baris per partisi (kunci + id), urut tanggal agar bisa dipotong seperti rollup
+        self._keys = pd.DataFrame(columns=self._partition_keys + [PARTITION_KEY])
+        self._ids: Dict[tuple, int] = {}
+        # Register HLL dense per kolom: satu baris 2^precision register per id partisi
+        self._registers = {col: np.zeros((0, 1 << precision), dtype=np.uint8) for col in self.distinct_columns}
+        # Centroid t-digest per kolom (partisi, mean, weight) dan min/max exact per partisi
+        self._centroids = {col: pd.DataFrame({PARTITION_KEY: np.empty(0, dtype=np.int64), MEAN_KEY: np.empty(0),
+                                              WEIGHT_KEY: np.empty(0)}) for col in self.quantile_columns}
+        self._extremes = {col: np.empty((0, 2)) for col in self.quantile_columns}
+
+    @property
+    def _partition_keys(self) -> List[str]:
+        return ([DATE_KEY] if self.date_column else []) + self.dimensions
+
+    @property
+    def n_partitions(self) -> int:
+        return len(self._ids)
+
+    def _partitions(self, batch: pd.DataFrame) -> pd.DataFrame:
+        frame = pd.DataFrame(index=batch.index)
+        if self.date_column:
+            frame[DATE_KEY] = batch[self.date_column].dt.normalize()
+        for dim in self.dimensions:
+            frame[dim] = batch[dim]
+        return frame
+
+    def _partition_ids(self, partitions: pd.DataFrame) -> np.ndarray:
+        """Id per row; partitions seen for the first time get the next free ids"""
+        keys = self._partition_keys
+        if not keys:
+            groups, uniques = np.zeros(len(partitions), dtype=np.int64), partitions.iloc[:1]
+        else:
+            groups = partitions.groupby(keys, observed=True, dropna=False, sort=False).ngroup().to_numpy()
+            # Baris pertama tiap grup, diurutkan menurut nomor grup (grup NaN tidak selalu urut kemunculan)
+            first = pd.Series(np.arange(len(groups))).groupby(groups).first().to_numpy()
+            uniques = partitions.iloc[first]
+        lookup = np.empty(len(uniques), dtype=np.int64)
+        known = len(self._ids)
+        new = []
+        for i, row in enumerate(uniques.itertuples(index=False, name=None)):
+            # Nilai kosong dinormalisasi ke None agar kunci dict stabil (NaN != NaN)
+            key = tuple(None if pd.isna(v) else v for v in row)
+            if key not in self._ids:
+                self._ids[key] = len(self._ids)
+                new.append(i)
+            lookup[i] = self._ids[key]
+        if new:
+            fresh = uniques.iloc[new].assign(**{PARTITION_KEY: lookup[new]})
+            frames = [fresh] if self._keys.empty else [self._keys, fresh]
+            self._keys = pd.concat(frames, ignore_index=True)
+            if self.date_column:
+                self._keys = self._keys.sort_values(DATE_KEY, kind="stable").reset_index(drop=True)
+            grow = len(self._ids) - known
+            for col in self.distinct_columns:
+                self._registers[col] = np.vstack([self._registers[col],
+                                                  np.zeros((grow, 1 << self.precision), dtype=np.uint8)])
+            for col in self.quantile_columns:
+                self._extremes[col] = np.vstack([self._extremes[col], np.tile([np.inf, -np.inf], (grow, 1))])
+        return lookup[groups]
+
+    def append(self, batch: pd.DataFrame) -> None:
+        """Sketch a batch of raw rows per partition and merge into the index"""
+        partitions = self._partitions(batch)
+        if self.date_column:
+            partitions = partitions[partitions[DATE_KEY].notna()]
+            batch = batch.loc[partitions.index]
+        if batch.empty:
+            return
+        ids = self._partition_ids(partitions)
+        width = 1 << self.precision
+
+        for col in self.distinct_columns:
+            present = batch[col].notna().to_numpy()
+            index, rank = hll_registers(hash_values(batch[col]), self.precision)
+            # Register yang sama dalam satu partisi digabung dengan max
+            np.maximum.at(self._registers[col].reshape(-1), ids[present] * width + index, rank)
+
+        for col in self.quantile_columns:
+            values = pd.to_numeric(batch[col], errors="coerce").to_numpy(dtype=np.float64)
+            present = ~np.isnan(values)
+            fresh = pd.DataFrame({PARTITION_KEY: ids[present], MEAN_KEY: values[present], WEIGHT_KEY: 1.0})
+            if fresh.empty:
+                continue
+            extremes = fresh.groupby(PARTITION_KEY)[MEAN_KEY].agg(["min", "max"])
+            rows = extremes.index.to_numpy()
+            current = self._extremes[col]
+            current[rows, 0] = np.minimum(current[rows, 0], extremes["min"].to_numpy())
+            current[rows, 1] = np.maximum(current[rows, 1], extremes["max"].to_numpy())
+            merged = pd.concat([self._centroids[col], fresh], ignore_index=True)
+            self._centroids[col] = compress_centroids(merged, [PARTITION_KEY], self.compression) \
+                .sort_values(PARTITION_KEY, kind="stable").reset_index(drop=True)
+
+    def _select(self, start, end, filters: Dict[str, Optional[Iterable]]) -> np.ndarray:
+        """Ids of the partitions selected by a date range and dimension filters"""
+        table = self._keys
+        if self.date_column and not table.empty:
+            table = slice_dates(table, start, end)
+        table = filter_dimensions(table, self.dimensions, filters)
+        return table[PARTITION_KEY].to_numpy(dtype=np.int64)
+
+    def nunique(self, column: str, start=None, end=None, **filters: Optional[Iterable]) -> int:
+        """Approximate distinct non-null values of a column under a filter"""
+        if column not in self.distinct_columns:
+            raise KeyError(f"No distinct-count sketch for column: {column}")
+        ids = self._select(start, end, filters)
+        if len(ids) == 0:
+            return 0
+        return int(round(hll_estimate(self._registers[column][ids].max(axis=0))))
+
+    def quantiles(self, column: str, qs: Sequence[float], start=None, end=None,
+                  **filters: Optional[Iterable]) -> pd.Series:
+        """Approximate quantiles of a numeric column under a filter"""
+        if column not in self.quantile_columns:
+            raise KeyError(f"No quantile sketch for column: {column}")
+        ids = self._select(start, end, filters)
+        centroids = self._centroids[column]
+        selected = centroids[np.isin(centroids[PARTITION_KEY].to_numpy(), ids)]
+        extremes = self._extremes[column][ids]
+        means, weights = tdigest_compress(selected[MEAN_KEY].to_numpy(dtype=np.float64),
+                                          selected[WEIGHT_KEY].to_numpy(dtype=np.float64), self.compression)
+        values = tdigest_quantile(means, weights, qs, extremes[:, 0].min(initial=np.inf),
+                                  extremes[:, 1].max(initial=-np.inf))
+        return pd.Series(values, index=list(qs), name=column)
@@ -0,0 +1,168 @@
+"""
+Descriptive Statistics Engine Module
+
+Satu pass saat ingest menghitung momen yang dapat digabung per partisi:
+jumlah non-null, sum, sum kuadrat, min/max per kolom numerik, serta
+cross-product per pasangan kolom (untuk korelasi pairwise). Tampilan terfilter
+cukup menjumlahkan partisi terpilih, tanpa memindai ulang data.
+"""
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from src.data.rollup import DATE_KEY, filter_dimensions, slice_dates
+
+ROWS_KEY = "rows"
+SEP = "__"
+
+
+class StatsSummary:
+    """Merged moments of one filtered view"""
+
+    def __init__(self, totals: pd.Series, columns: Sequence[str], numeric_columns: Sequence[str]):
+        self.totals = totals
+        self.columns = list(columns)
+        self.numeric_columns = list(numeric_columns)
+
+    def _get(self, *parts: str) -> float:
+        return self.totals[SEP.join(parts)]
+
+    @property
+    def rows(self) -> int:
+        return int(self.totals[ROWS_KEY])
+
+    def non_null(self) -> pd.Series:
+        return pd.Series({col: int(self._get(col, "count")) for col in self.columns}, dtype="int64")
+
+    def nulls(self) -> pd.Series:
+        return self.rows - self.non_null()
+
+    def describe(self, quantiles: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Same layout as DataFrame.describe(); quartile rows are taken from `quantiles` if given"""
+        stats = {}
+        for col in self.numeric_columns:
+            n = self._get(col, "count")
+            total, squares = self._get(col, "sum"), self._get(col, "sumsq")
+            mean = total / n if n else np.nan
+            var = (squares - total * total / n) / (n - 1) if n > 1 else np.nan
+            stats[col] = {
+                "count": n,
+                "mean": mean + self._get(col, "shift") if n else np.nan,
+                "std": np.sqrt(max(var, 0.0)) if n > 1 else np.nan,
+                "min": self._get(col, "min") if n else np.nan,
+                "25%": np.nan, "50%": np.nan, "75%": np.nan,
+                "max": self._get(col, "max") if n else np.nan,
+            }
+        frame = pd.DataFrame(stats, index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"])
+        if quantiles is not None:
+            frame.loc[["25%", "50%", "75%"], quantiles.columns] = quantiles.loc[[0.25, 0.5, 0.75]].to_numpy()
+        return frame
+
+    def corr(self) -> pd.DataFrame:
+        """Pearson correlation with pairwise-complete observations, like DataFrame.corr()"""
+        cols = self.numeric_columns
+        matrix = pd.DataFrame(np.eye(len(cols)), index=cols, columns=cols)
+        for a, b in combinations(cols, 2):
+            n = self._get(a, b, "n")
+            sx, sy = self._get(a, b, "sx"), self._get(a, b, "sy")
+            sxx, syy, sxy = self._get(a, b, "sxx"), self._get(a, b, "syy"), self._get(a, b, "sxy")
+            denom = np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+            value = (n * sxy - sx * sy) / denom if n > 1 and denom > 0 else np.nan
+            matrix.loc[a, b] = matrix.loc[b, a] = value
+        for col in cols:
+            if self._get(col, "count") < 2:
+                matrix.loc[col, col] = np.nan
+        return matrix
+
+    def top_correlations(self, n: int = 5) -> pd.Series:
+        """Strongest absolute correlations between distinct columns"""
+        pairs = {(a, b): abs(value) for (a, b), value in self.corr().stack().items() if a != b}
+        pairs = pd.Series(pairs, dtype="float64").dropna()
+        return pairs.sort_values(ascending=False, kind="stable").head(n)
+
+
+class StatsIndex:
+    """Mergeable count/sum/sumsq/cross-product partials per (tanggal, dimensions) partition"""
+
+    def __init__(self, columns: Sequence[str], numeric_columns: Sequence[str],
+                 date_column: Optional[str] = "tgl_registrasi",
+                 dimensions: Sequence[str] = ("nm_poli", "status")):
+        self.columns = list(columns)
+        self.numeric_columns = list(numeric_columns)
+        self.date_column = date_column
+        self.dimensions = list(dimensions)
+        # Geser nilai dengan rata-rata batch pertama agar sum kuadrat tidak kehilangan presisi
+        self._shift: Dict[str, float] = {}
+        self._aggs = self._aggregations()
+        self._partials = pd.DataFrame(columns=self._partition_keys + list(self._aggs))
+
+    @property
+    def _partition_keys(self) -> List[str]:
+        return ([DATE_KEY] if self.date_column else []) + self.dimensions
+
+    def _aggregations(self) -> Dict[str, str]:
+        """Measure name -> how partials merge (sum, or min/max for extremes)"""
+        aggs = {ROWS_KEY: "sum"}
+        for col in self.columns:
+            aggs[SEP.join((col, "count"))] = "sum"
+        for col in self.numeric_columns:
+            aggs.update({SEP.join((col, "sum")): "sum", SEP.join((col, "sumsq")): "sum",
+                         SEP.join((col, "min")): "min", SEP.join((col, "max")): "max"})
+        for a, b in combinations(self.numeric_columns, 2):
+            for name in ("n", "sx", "sy", "sxx", "syy", "sxy"):
+                aggs[SEP.join((a, b, name))] = "sum"
+        return aggs
+
+    def _measures(self, batch: pd.DataFrame) -> pd.DataFrame:
+        measures: Dict[str, np.ndarray] = {ROWS_KEY: np.ones(len(batch), dtype=np.int64)}
+        for col in self.columns:
+            measures[SEP.join((col, "count"))] = batch[col].notna().to_numpy(dtype=np.int64)
+        values: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for col in self.numeric_columns:
+            raw = pd.to_numeric(batch[col], errors="coerce").to_numpy(dtype=np.float64)
+            if col not in self._shift:
+                self._shift[col] = float(np.nanmean(raw)) if np.isfinite(raw).any() else 0.0
+            present = ~np.isnan(raw)
+            centered = np.where(present, raw - self._shift[col], 0.0)
+            values[col] = (centered, present)
+            measures[SEP.join((col, "sum"))] = centered
+            measures[SEP.join((col, "sumsq"))] = centered * centered
+            measures[SEP.join((col, "min"))] = np.where(present, raw, np.inf)
+            measures[SEP.join((col, "max"))] = np.where(present, raw, -np.inf)
+        for a, b in combinations(self.numeric_columns, 2):
+            (x, px), (y, py) = values[a], values[b]
+            both = px & py
+            x, y = np.where(both, x, 0.0), np.where(both, y, 0.0)
+            for name, data in (("n", both.astype(np.int64)), ("sx", x), ("sy", y),
+                               ("sxx", x * x), ("syy", y * y), ("sxy", x * y)):
+                measures[SEP.join((a, b, name))] = data
+        return pd.DataFrame(measures, index=batch.index)
+
+    def append(self, batch: pd.DataFrame) -> None:
+        """Compute the partials of a batch in one grouped pass and merge them"""
+        keys = self._partition_keys
+        frame = self._measures(batch)
+        if self.date_column:
+            frame[DATE_KEY] = batch[self.date_column].dt.normalize()
+            frame = frame[frame[DATE_KEY].notna()]
+        for dim in self.dimensions:
+            frame[dim] = batch.loc[frame.index, dim]
+        partials = frame.groupby(keys, observed=True, dropna=False).agg(self._aggs).reset_index()
+        if not self._partials.empty:
+            # Partisi yang sudah ada digabung: momen dijumlah, min/max digabung
+            partials = pd.concat([self._partials, partials], ignore_index=True) \
+                .groupby(keys, observed=True, dropna=False).agg(self._aggs).reset_index()
+        self._partials = partials.sort_values(keys, kind="stable").reset_index(drop=True)
+
+    def summary(self, start=None, end=None, **filters: Optional[Iterable]) -> StatsSummary:
+        """Merge the partials of the selected partitions"""
+        selected = self._partials
+        if self.date_column:
+            selected = slice_dates(selected, start, end)
+        selected = filter_dimensions(selected, self.dimensions, filters)
+        empty = {"sum": 0.0, "min": np.inf, "max": -np.inf}
+        totals = pd.Series({name: getattr(selected[name].astype("float64"), how)() if len(selected) else empty[how]
+                            for name, how in self._aggs.items()}, dtype="float64")
+        for col in self.numeric_columns:
+            totals[SEP.join((col, "shift"))] = self._shift.get(col, 0.0)
+        return StatsSummary(totals, self.columns, self.numeric_columns)
@@ -0,0 +1,131 @@
+"""
+Top-K / Heavy-Hitter Summary Module
+
+Untuk kolom teks berkardinalitas tinggi (nm_pasien, keterangan) setiap partisi
+(tanggal, poli, status) menyimpan ringkasan Space-Saving berukuran paling
+banyak `capacity` item, sehingga memori tidak tumbuh mengikuti jumlah pasien.
+Setiap partisi juga mencatat floor: batas atas hitungan item yang tidak
+tersimpan di partisi itu. Ringkasan digabung seperti mergeable summary
+(Agarwal dkk.): item yang tidak ada di satu ringkasan dihitung dengan floor
+ringkasan tersebut, sehingga `count` selalu batas atas hitungan sebenarnya dan
+`count - error` batas bawahnya. Query "top N" dan "hitungan >= ambang" di bawah
+filter apa pun hanya membaca ringkasan partisi terpilih, bukan data mentah.
+
+Nilai seri saat pemangkasan dipecah dengan hash (partisi, item), bukan urutan
+nama: item yang kalah seri di satu partisi dapat bertahan di partisi lain.
+"""
+from typing import Iterable, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from src.data.rollup import DATE_KEY, filter_dimensions, slice_dates
+
+ITEM_KEY = "item"
+COUNT_KEY = "count"
+ERROR_KEY = "error"
+FLOOR_KEY = "floor"
+_TRACKED_KEY = "tracked"
+_TIE_KEY = "tie"
+
+
+class TopKIndex:
+    """Bounded Space-Saving summaries of one column per partition, merged on query"""
+
+    def __init__(self, column: str, date_column: str = "tgl_registrasi",
+                 dimensions: Sequence[str] = ("nm_poli", "status"), capacity: int = 256,
+                 fill_value: Optional[str] = None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.column = column
+        self.date_column = date_column
+        self.dimensions = list(dimensions)
+        self.capacity = capacity
+        # Nilai kosong dihitung sebagai fill_value (mis. 'Unknown'); None = diabaikan
+        self.fill_value = fill_value
+        # Baris ringkasan menyimpan floor partisinya agar query tidak perlu join
+        self._entries = pd.DataFrame(columns=self._partition_keys + [ITEM_KEY, COUNT_KEY, ERROR_KEY, FLOOR_KEY])
+        self._floors = pd.DataFrame(columns=self._partition_keys + [FLOOR_KEY])
+
+    @property
+    def _partition_keys(self) -> List[str]:
+        return [DATE_KEY] + self.dimensions
+
+    def __len__(self) -> int:
+        """Number of stored (partition, item) entries; bounded by partitions x capacity"""
+        return len(self._entries)
+
+    def _truncate(self, counts: pd.DataFrame, floors: pd.DataFrame) -> None:
+        """Keep the `capacity` largest counts per partition and raise the floors to the largest dropped count"""
+        keys = self._partition_keys
+        # Seri dipecah dengan hash (partisi, item): tidak ada item yang selalu kalah di setiap partisi
+        counts[_TIE_KEY] = pd.util.hash_pandas_object(counts[keys + [ITEM_KEY]], index=False).to_numpy()
+        counts = counts.sort_values(keys + [COUNT_KEY, _TIE_KEY], ascending=[True] * len(keys) + [False, True],
+                                    kind="stable")
+        kept = counts.groupby(keys, observed=True, dropna=False).cumcount().to_numpy() < self.capacity
+        dropped = counts[~kept].groupby(keys, observed=True, dropna=False)[COUNT_KEY].max() \
+            .rename("dropped").reset_index()
+        floors = floors.merge(dropped, on=keys, how="left")
+        floors[FLOOR_KEY] = np.maximum(floors[FLOOR_KEY].to_numpy(dtype=np.int64),
+                                       floors["dropped"].fillna(0).to_numpy(dtype=np.int64))
+        self._floors = floors.drop(columns="dropped").sort_values(keys, kind="stable").reset_index(drop=True)
+        entries = counts[kept].drop(columns=[_TIE_KEY, _TRACKED_KEY, FLOOR_KEY], errors="ignore")
+        self._entries = entries.merge(self._floors, on=keys, how="left").reset_index(drop=True)
+
+    def append(self, batch: pd.DataFrame) -> None:
+        """Count a batch of raw rows and merge it into the partition summaries"""
+        keys = self._partition_keys
+        frame = pd.DataFrame({DATE_KEY: batch[self.date_column].dt.normalize()})
+        for dim in self.dimensions:
+            frame[dim] = batch[dim].to_numpy()
+        items = batch[self.column]
+        frame[ITEM_KEY] = (items.fillna(self.fill_value) if self.fill_value is not None else items).to_numpy()
+        frame = frame.dropna(subset=[DATE_KEY, ITEM_KEY])
+        if frame.empty:
+            return
+
+        counts = frame.groupby(keys + [ITEM_KEY], observed=True, dropna=False).size().reset_index(name=COUNT_KEY)
+        counts[ERROR_KEY] = 0
+        floors = counts[keys].drop_duplicates().assign(**{FLOOR_KEY: 0})
+        if not self._entries.empty:
+            # Gabung dengan ringkasan lama: hitungan dan error item yang sama dijumlah
+            old = self._entries.drop(columns=FLOOR_KEY).assign(**{_TRACKED_KEY: True})
+            counts = pd.concat([old, counts.assign(**{_TRACKED_KEY: False})], ignore_index=True) \
+                .groupby(keys + [ITEM_KEY], observed=True, dropna=False) \
+                .agg({COUNT_KEY: "sum", ERROR_KEY: "sum", _TRACKED_KEY: "max"}).reset_index()
+            floors = pd.concat([self._floors, floors], ignore_index=True) \
+                .groupby(keys, observed=True, dropna=False)[FLOOR_KEY].max().reset_index()
+            # Item baru di partisi yang pernah dipangkas bisa saja sudah muncul floor kali sebelumnya
+            counts = counts.merge(floors, on=keys, how="left")
+            untracked = ~counts[_TRACKED_KEY].to_numpy(dtype=bool)
+            floor = counts[FLOOR_KEY].fillna(0).to_numpy(dtype=np.int64) * untracked
+            counts[COUNT_KEY] = counts[COUNT_KEY].to_numpy(dtype=np.int64) + floor
+            counts[ERROR_KEY] = counts[ERROR_KEY].to_numpy(dtype=np.int64) + floor
+        self._truncate(counts, floors)
+
+    def query(self, start=None, end=None, **filters: Optional[Iterable]) -> pd.DataFrame:
+        """
+        Merged counts for the selected partitions, largest first (ties by item).
+
+        `count` is an upper bound on the true frequency and `count - error` a lower
+        bound; error is 0 while none of the selected partitions had to drop items.
+        Items missing from every selected summary occurred at most sum(floor) times.
+        """
+        entries = filter_dimensions(slice_dates(self._entries, start, end), self.dimensions, filters)
+        floors = filter_dimensions(slice_dates(self._floors, start, end), self.dimensions, filters)
+        total_floor = int(floors[FLOOR_KEY].sum()) if not floors.empty else 0
+        merged = entries.groupby(ITEM_KEY)[[COUNT_KEY, ERROR_KEY, FLOOR_KEY]].sum()
+        # Partisi terpilih yang tidak menyimpan item menyumbang floor-nya sebagai batas atas
+        absent = total_floor - merged[FLOOR_KEY].to_numpy(dtype=np.int64)
+        merged = pd.DataFrame({ITEM_KEY: merged.index.to_numpy(dtype=object),
+                               COUNT_KEY: merged[COUNT_KEY].to_numpy(dtype=np.int64) + absent,
+                               ERROR_KEY: merged[ERROR_KEY].to_numpy(dtype=np.int64) + absent})
+        return merged.sort_values([COUNT_KEY, ITEM_KEY], ascending=[False, True], kind="stable") \
+            .reset_index(drop=True)
+
+    def top(self, n: int, start=None, end=None, **filters: Optional[Iterable]) -> pd.DataFrame:
+        """The n most frequent items under a filter"""
+        return self.query(start, end, **filters).head(n)
+
+    def at_least(self, threshold: int, start=None, end=None, **filters: Optional[Iterable]) -> pd.DataFrame:
+        """Stored items whose count may reach `threshold` under a filter (certain when count - error >= threshold)"""
+        merged = self.query(start, end, **filters)
+        return merged[merged[COUNT_KEY] >= threshold]
@@ -0,0 +1,118 @@
+"""
+Versioned Directory Module
+
+Store turunan (column store, shard per kampus) tidak pernah ditimpa di tempat:
+setiap build ditulis ke direktori versi baru, lalu pointer CURRENT ditukar
+dengan os.replace (seperti SharedDataset). Pembaca selalu melihat versi yang
+lengkap, dan dua proses yang membangun ulang bersamaan sama-sama berhasil:
+versi yang dimulai paling akhir yang menjadi CURRENT. Versi lama dihapus
+setelah tergantikan KEEP_VERSIONS kali, sehingga pembaca yang sudah membuka
+versi sebelumnya tetap dapat menyelesaikan bacaannya.
+"""
+import os
+import re
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows tidak punya fcntl; pertukaran pointer tidak dikunci
+    fcntl = None
+
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = ".lock"
+# Versi yang dipertahankan, termasuk yang aktif
+KEEP_VERSIONS = 2
+# Direktori sementara milik penulis yang crash dianggap basi setelah ini (detik)
+STALE_TMP_SECONDS = 3600
+
+_VERSION_RE = re.compile(r"^v(\d+)-\d+-\d+$")
+
+
+def _stamp(name: str) -> Optional[int]:
+    match = _VERSION_RE.match(name)
+    return int(match.group(1)) if match else None
+
+
+def current(directory) -> Optional[Path]:
+    """Directory of the published version, or None when nothing is published"""
+    directory = Path(directory)
+    try:
+        version = (directory / CURRENT_FILE).read_text().strip()
+    except FileNotFoundError:
+        return None
+    path = directory / version
+    return path if version and path.is_dir() else None
+
+
+@contextmanager
+def lock(directory) -> Iterator[None]:
+    """Exclusive lock across processes for the pointer swap and garbage collection"""
+    with open(Path(directory) / LOCK_FILE, "w") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def publish(directory, write: Callable[[Path], None]) -> Path:
+    """
+    Build a new version with write(path) and make it current atomically.
+
+    Returns the path of the version that is current afterwards. When another
+    process started a newer build concurrently, that version wins and is returned.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    token = f"{time.time_ns()}-{os.getpid()}-{threading.get_ident()}"
+    tmp = directory / f".tmp-{token}"
+    path = directory / f"v{token}"
+    try:
+        write(tmp)
+        os.rename(tmp, path)
+    finally:
+        if tmp.exists():
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    # Bandingkan-lalu-tukar di bawah lock: build lama yang selesai belakangan tidak menimpa pointer
+    with lock(directory):
+        published = current(directory)
+        if published is not None and (_stamp(published.name) or 0) > (_stamp(path.name) or 0):
+            # Kalah balapan dengan build yang lebih baru: versi itu yang dipakai
+            path = published
+        else:
+            pointer = directory / f".{CURRENT_FILE}.tmp-{token}"
+            pointer.write_text(path.name)
+            os.replace(pointer, directory / CURRENT_FILE)
+        collect_garbage(directory)
+    return path
+
+
+def collect_garbage(directory) -> None:
+    """Remove versions older than the newest KEEP_VERSIONS, stale temp dirs and pre-versioning files (call under lock())"""
+    directory = Path(directory)
+    versions = sorted((p for p in directory.iterdir() if p.is_dir() and _stamp(p.name) is not None),
+                      key=lambda p: _stamp(p.name))
+    keep = set(versions[-KEEP_VERSIONS:])
+    active = current(directory)
+    if active is not None:
+        keep.add(active)
+    for path in directory.iterdir():
+        if path in keep or path.name in (CURRENT_FILE, LOCK_FILE):
+            continue
+        try:
+            if path.name.startswith(".") and time.time() - path.stat().st_mtime < STALE_TMP_SECONDS:
+                continue  # Build proses lain yang masih berjalan
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+        except FileNotFoundError:
+            pass  # Sudah dihapus proses lain
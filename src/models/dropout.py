@@ -0,0 +1,165 @@
+"""
+Dropout / Late-Graduation Risk Model Module
+
+Pipeline offline: fitur dari tabel mahasiswa + matriks aktivitas KRS
+(src/data/cohort.py), model scikit-learn yang dipersist dengan joblib, dan
+scoring seluruh mahasiswa per batch (opsional paralel lewat joblib workers).
+Modul ini tidak boleh di-import oleh dashboard; dashboard membaca skor lewat
+src/models/scores.py.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+from src.data.cohort import DROPOUT, GRADUATED, CohortMatrix, semester_ordinal
+from src.models.scores import LEVEL_COLUMN, MODEL_FILE, SCORE_COLUMN, SCORES_FILE, risk_levels
+
+CATEGORICAL_FEATURES = ["kampus", "prodi", "jalur_masuk", "jenjang", "jenis_kelamin"]
+NUMERIC_FEATURES = ["ipk", "angkatan", "jumlah_krs", "nilai_rata_rata", "rasio_nilai_gagal",
+                    "semester_aktif", "rasio_semester_aktif"]
+FAILING_GRADES = ["D", "E"]
+# Lama studi normal per jenjang (semester); lulus melewati batas ini dianggap terlambat
+NORMAL_SEMESTERS = {"D3": 6, "D4": 8, "S1": 8, "S2": 4, "S3": 6, "Profesi": 4}
+DEFAULT_NORMAL_SEMESTERS = 8
+# Fitur KRS hanya dari semester relatif awal ini (tahun pertama). Label memakai semester aktif
+# terakhir, dan lama studi normal terpendek 4 semester, jadi fitur tidak membocorkan label
+FEATURE_SEMESTERS = 2
+MISSING_CATEGORY = "Tidak Diketahui"
+
+
+def build_features(cohort: CohortMatrix, krs: pd.DataFrame, id_column: str = "id_mahasiswa",
+                   semester_column: str = "semester_akademik") -> pd.DataFrame:
+    """One feature row per student of the cohort matrix, computed with bincount reductions
+
+    KRS features only see the first FEATURE_SEMESTERS semesters of each student.
+    """
+    students = cohort.students
+    n = len(students)
+    features = pd.DataFrame(index=students.index)
+    for col in CATEGORICAL_FEATURES:
+        values = students[col] if col in students.columns else pd.Series(pd.NA, index=students.index)
+        features[col] = values.astype("object").where(values.notna(), MISSING_CATEGORY)
+    features["ipk"] = pd.to_numeric(students.get("ipk"), errors="coerce")
+    features["angkatan"] = students[cohort.cohort_column].astype("float64")
+
+    rows = pd.Index(students[id_column]).get_indexer(krs[id_column])
+    # Semester relatif tiap baris KRS (0 = Ganjil tahun angkatan); di luar jendela awal diabaikan
+    start = students[cohort.cohort_column].to_numpy(dtype=np.int64) * 2
+    ordinal = semester_ordinal(krs[semester_column]).to_numpy(dtype=np.float64, na_value=np.nan)
+    relative = np.where(rows >= 0, ordinal - start[np.maximum(rows, 0)], np.nan)
+    with np.errstate(invalid="ignore"):
+        early = (rows >= 0) & (relative >= 0) & (relative < FEATURE_SEMESTERS)
+    nilai = pd.to_numeric(krs["nilai_angka"], errors="coerce").to_numpy(dtype=np.float64)
+    graded = early & ~np.isnan(nilai)
+    failing = early & krs["nilai_huruf"].isin(FAILING_GRADES).to_numpy(dtype=bool)
+    count = np.bincount(rows[early], minlength=n).astype(np.float64)
+    graded_count = np.bincount(rows[graded], minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        features["jumlah_krs"] = count
+        features["nilai_rata_rata"] = np.bincount(rows[graded], weights=nilai[graded], minlength=n) / graded_count
+        features["rasio_nilai_gagal"] = np.bincount(rows[failing], minlength=n) / count
+
+        active = cohort.bits()[:, :FEATURE_SEMESTERS].sum(axis=1)
+        observed = cohort.observed()[:, :FEATURE_SEMESTERS].sum(axis=1)
+        features["semester_aktif"] = active.astype(np.float64)
+        features["rasio_semester_aktif"] = np.where(observed > 0, active / observed, np.nan)
+    return features[CATEGORICAL_FEATURES + NUMERIC_FEATURES]
+
+
+def build_labels(cohort: CohortMatrix) -> pd.Series:
+    """1 = DO or late graduation, 0 = on-time graduation, <NA> = outcome not known yet"""
+    status = cohort.students["status"].astype("string").str.strip().str.upper()
+    jenjang = cohort.students.get("jenjang", pd.Series(pd.NA, index=status.index))
+    normal = jenjang.map(NORMAL_SEMESTERS).fillna(DEFAULT_NORMAL_SEMESTERS).to_numpy(dtype=np.float64)
+    late = (cohort.last_active + 1) > normal
+    labels = pd.Series(pd.NA, index=status.index, dtype="Int64")
+    labels[status.eq(GRADUATED).fillna(False).to_numpy(dtype=bool)] = 0
+    labels[(status.eq(GRADUATED).fillna(False) & late).to_numpy(dtype=bool)] = 1
+    labels[status.eq(DROPOUT).fillna(False).to_numpy(dtype=bool)] = 1
+    return labels
+
+
+def make_pipeline(random_state: int = 0) -> Pipeline:
+    encoder = ColumnTransformer(
+        [("kategori", OneHotEncoder(handle_unknown="ignore", sparse_output=False), CATEGORICAL_FEATURES)],
+        remainder="passthrough",
+    )
+    # HistGradientBoosting menangani NaN pada fitur numerik secara native
+    model = HistGradientBoostingClassifier(max_iter=200, learning_rate=0.1, random_state=random_state)
+    return Pipeline([("encoder", encoder), ("model", model)])
+
+
+def train_model(features: pd.DataFrame, labels: pd.Series, test_size: float = 0.2,
+                random_state: int = 0) -> Tuple[Pipeline, Dict[str, float]]:
+    """Fit on students with a known outcome; returns (pipeline, holdout metrics)"""
+    known = labels.notna().to_numpy(dtype=bool)
+    x, y = features[known], labels[known].astype("int64")
+    if y.nunique() < 2:
+        raise ValueError("Training labels need both outcomes (at risk and on time)")
+    x_train, x_test, y_train, y_test = train_test_split(
+        x, y, test_size=test_size, stratify=y, random_state=random_state)
+    pipeline = make_pipeline(random_state).fit(x_train, y_train)
+    metrics = {
+        "train_rows": float(len(x_train)),
+        "test_rows": float(len(x_test)),
+        "positive_rate": float(y.mean()),
+        "roc_auc": float(roc_auc_score(y_test, pipeline.predict_proba(x_test)[:, 1])),
+    }
+    return pipeline, metrics
+
+
+def _predict_batch(pipeline: Pipeline, batch: pd.DataFrame) -> np.ndarray:
+    return pipeline.predict_proba(batch)[:, 1]
+
+
+def score_students(pipeline: Pipeline, features: pd.DataFrame, batch_size: int = 10000,
+                   n_jobs: int = 1) -> pd.Series:
+    """Risk probability of every row, predicted in vectorized batches (parallel when n_jobs != 1)"""
+    batch_size = max(int(batch_size), 1)
+    batches = [features.iloc[start:start + batch_size] for start in range(0, len(features), batch_size)]
+    if n_jobs == 1 or len(batches) <= 1:
+        parts = [_predict_batch(pipeline, batch) for batch in batches]
+    else:
+        parts = joblib.Parallel(n_jobs=n_jobs)(joblib.delayed(_predict_batch)(pipeline, batch) for batch in batches)
+    scores = np.concatenate(parts) if parts else np.empty(0)
+    return pd.Series(scores, index=features.index, name=SCORE_COLUMN)
+
+
+def save_model(pipeline: Pipeline, model_dir: Union[str, Path], metrics: Optional[Dict[str, float]] = None) -> Path:
+    path = Path(model_dir) / MODEL_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump({
+        "pipeline": pipeline,
+        "features": CATEGORICAL_FEATURES + NUMERIC_FEATURES,
+        "metrics": metrics or {},
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+    }, path)
+    return path
+
+
+def load_model(model_dir: Union[str, Path]) -> Dict[str, Any]:
+    path = Path(model_dir) / MODEL_FILE
+    if not path.exists():
+        raise FileNotFoundError(f"Model not found: {path}")
+    return joblib.load(path)
+
+
+def save_scores(cohort: CohortMatrix, scores: pd.Series, model_dir: Union[str, Path],
+                id_column: str = "id_mahasiswa") -> Path:
+    """Write id, probability and risk level for the dashboards to read"""
+    path = Path(model_dir) / SCORES_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({
+        id_column: cohort.students[id_column].to_numpy(),
+        SCORE_COLUMN: scores.to_numpy().round(4),
+        LEVEL_COLUMN: risk_levels(scores).to_numpy(),
+    }).to_csv(path, index=False)
+    return path
@@ -0,0 +1,43 @@
+"""
+Precomputed Risk Scores Module
+
+Dashboard hanya membaca skor hasil pipeline offline (scripts/train_dropout_model.py);
+tidak ada inferensi model di dalam rerun, sehingga modul ini cukup memakai pandas.
+"""
+from pathlib import Path
+from typing import Optional, Union
+import pandas as pd
+
+MODEL_FILE = "dropout_model.joblib"
+SCORES_FILE = "dropout_scores.csv"
+SCORE_COLUMN = "risiko_dropout"
+LEVEL_COLUMN = "kategori_risiko"
+RISK_LEVELS = ["Rendah", "Sedang", "Tinggi"]
+RISK_BINS = [0.0, 1 / 3, 2 / 3, 1.0]
+
+
+def risk_levels(scores: pd.Series) -> pd.Series:
+    """Bucket probabilities into Rendah/Sedang/Tinggi"""
+    return pd.cut(scores, RISK_BINS, labels=RISK_LEVELS, include_lowest=True)
+
+
+def load_scores(model_dir: Union[str, Path]) -> Optional[pd.DataFrame]:
+    """Read the stored scores, or None when the pipeline has not been run yet"""
+    path = Path(model_dir) / SCORES_FILE
+    if not path.exists():
+        return None
+    scores = pd.read_csv(path)
+    scores[LEVEL_COLUMN] = pd.Categorical(scores[LEVEL_COLUMN], categories=RISK_LEVELS, ordered=True)
+    return scores
+
+
+def attach_scores(df: pd.DataFrame, scores: Optional[pd.DataFrame],
+                  id_column: str = "id_mahasiswa") -> pd.DataFrame:
+    """Add the score columns to a student table (left join on the student id)"""
+    if scores is None or id_column not in df.columns:
+        return df
+    lookup = scores.drop_duplicates(id_column).set_index(id_column)
+    df = df.copy()
+    df[SCORE_COLUMN] = df[id_column].map(lookup[SCORE_COLUMN]).astype("float64")
+    df[LEVEL_COLUMN] = df[id_column].map(lookup[LEVEL_COLUMN]).astype(lookup[LEVEL_COLUMN].dtype)
+    return df
@@ -0,0 +1,156 @@
+"""
+Hot-path Timing Instrumentation Module
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+import pandas as pd
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (Linux /proc), else None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _row_count(obj) -> Optional[int]:
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return len(obj)
+    return None
+
+
+class StageRecord:
+    """Timing of one stage execution; rows_out may be set inside the block"""
+
+    __slots__ = ("run_id", "stage", "started_at", "wall_ms", "rows_in", "rows_out", "mem_delta_bytes")
+
+    def __init__(self, run_id: int, stage: str, rows_in: Optional[int] = None):
+        self.run_id = run_id
+        self.stage = stage
+        self.started_at = time.time()
+        self.wall_ms = 0.0
+        self.rows_in = rows_in
+        self.rows_out: Optional[int] = None
+        self.mem_delta_bytes: Optional[int] = None
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Instrumentation:
+    """Record wall time, rows in/out and memory delta per stage into a ring buffer"""
+
+    def __init__(self, enabled: bool = False, capacity: int = 1000, prefix: str = "dashboard"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._last_run_id = 0
+        self._records: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        # Setiap sesi Streamlit berjalan di thread sendiri
+        self._local = threading.local()
+
+    @property
+    def run_id(self) -> int:
+        """Run id of the calling thread's current rerun"""
+        return getattr(self._local, "run_id", 0)
+
+    def begin_run(self) -> int:
+        """Mark the start of a new rerun; following stages in this thread share its run id"""
+        with self._lock:
+            self._last_run_id += 1
+            self._local.run_id = self._last_run_id
+        return self._local.run_id
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None) -> Iterator[StageRecord]:
+        """Time a block: ``with instr.stage("filter", rows_in=len(df)) as s: ... s.rows_out = len(df)``"""
+        record = StageRecord(self.run_id, name, rows_in)
+        if not self.enabled:
+            yield record
+            return
+        rss_before = current_rss()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.wall_ms = (time.perf_counter() - start) * 1000
+            rss_after = current_rss()
+            if rss_before is not None and rss_after is not None:
+                record.mem_delta_bytes = rss_after - rss_before
+            self._records.append(record)
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """Decorator variant; rows are taken from a DataFrame first argument and result"""
+        def decorator(func: Callable) -> Callable:
+            stage_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                rows_in = _row_count(args[0]) if args else None
+                with self.stage(stage_name, rows_in=rows_in) as record:
+                    result = func(*args, **kwargs)
+                    record.rows_out = _row_count(result)
+                return result
+            return wrapper
+        return decorator
+
+    def records(self, run_id: Optional[int] = None) -> List[StageRecord]:
+        records = list(self._records)
+        if run_id is not None:
+            records = [r for r in records if r.run_id == run_id]
+        return records
+
+    def clear(self) -> None:
+        self._records.clear()
+
+    def summary(self, run_id: Optional[int] = None) -> pd.DataFrame:
+        """Records as a DataFrame (default: the latest run)"""
+        run_id = self.run_id if run_id is None else run_id
+        columns = list(StageRecord.__slots__)
+        return pd.DataFrame([r.to_dict() for r in self.records(run_id)], columns=columns)
+
+    def to_json(self) -> str:
+        return json.dumps([r.to_dict() for r in self.records()], indent=2)
+
+    def to_prometheus(self) -> str:
+        """Aggregate the ring buffer in Prometheus text exposition format"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for r in self.records():
+            entry = totals.setdefault(r.stage, {"count": 0, "sum": 0.0, "rows_out": None, "mem": None})
+            entry["count"] += 1
+            entry["sum"] += r.wall_ms / 1000
+            entry["rows_out"] = r.rows_out if r.rows_out is not None else r.rows_in
+            entry["mem"] = r.mem_delta_bytes
+
+        metric = f"{self.prefix}_stage_seconds"
+        lines = [
+            f"# HELP {metric} Wall time spent per dashboard stage.",
+            f"# TYPE {metric} summary",
+        ]
+        for stage, entry in totals.items():
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {entry["sum"]:.6f}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {entry["count"]}')
+        for suffix, key, help_text in (
+            ("stage_rows", "rows_out", "Rows produced by the latest execution of a stage."),
+            ("stage_memory_delta_bytes", "mem", "RSS change during the latest execution of a stage."),
+        ):
+            name = f"{self.prefix}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for stage, entry in totals.items():
+                if entry[key] is not None:
+                    lines.append(f'{name}{{stage="{stage}"}} {entry[key]}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,29 @@
+"""
+Lazy Import Module
+"""
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that performs the real import on first attribute access"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module = None
+
+    def _load(self) -> types.ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a proxy for module `name` without importing it yet"""
+    return LazyModule(name)
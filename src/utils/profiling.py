@@ -0,0 +1,98 @@
+"""
+Per-rerun Profiling Module
+"""
+import cProfile
+import io
+import json
+import pstats
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from pyinstrument import Profiler as SamplingProfiler
+except ImportError:  # pyinstrument opsional; fallback ke cProfile
+    SamplingProfiler = None
+
+
+class RerunTrace:
+    """Handle of one in-progress profiled rerun"""
+
+    def __init__(self, profiler, kind: str):
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.profiler = profiler
+        self.kind = kind
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+
+class RerunProfiler:
+    """Capture a profile of one dashboard rerun together with its filter state"""
+
+    def __init__(self, trace_dir: str, keep: int = 20, interval: float = 0.001):
+        self.trace_dir = Path(trace_dir)
+        self.keep = keep
+        self.interval = interval
+
+    def start(self) -> Optional[RerunTrace]:
+        """Start profiling; returns None when another profiler is already active"""
+        try:
+            if SamplingProfiler is not None:
+                profiler = SamplingProfiler(interval=self.interval)
+                profiler.start()
+                return RerunTrace(profiler, "pyinstrument")
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return RerunTrace(profiler, "cprofile")
+        except (RuntimeError, ValueError):
+            # Hanya satu profiler aktif dalam satu waktu (mis. sesi lain sedang diprofil)
+            return None
+
+    def stop(self, trace: RerunTrace, state: Optional[Dict[str, Any]] = None) -> Path:
+        """Stop profiling and save the trace plus its metadata; returns the metadata path"""
+        duration_ms = trace.elapsed_ms()
+        self.trace_dir.mkdir(parents=True, exist_ok=True)
+        if trace.kind == "pyinstrument":
+            trace.profiler.stop()
+            trace_file = self.trace_dir / f"{trace.id}.html"
+            trace_file.write_text(trace.profiler.output_html())
+        else:
+            trace.profiler.disable()
+            trace_file = self.trace_dir / f"{trace.id}.prof"
+            trace.profiler.dump_stats(str(trace_file))
+
+        meta_file = self.trace_dir / f"{trace.id}.json"
+        meta_file.write_text(json.dumps({
+            "id": trace.id,
+            "profiler": trace.kind,
+            "started_at": trace.started_at,
+            "duration_ms": duration_ms,
+            "trace_file": trace_file.name,
+            "state": state or {},
+        }, indent=2, default=str))
+        self.prune()
+        return meta_file
+
+    def traces(self) -> List[Dict[str, Any]]:
+        """Metadata of saved traces, newest first"""
+        if not self.trace_dir.exists():
+            return []
+        metas = sorted(self.trace_dir.glob("*.json"), key=lambda p: p.name, reverse=True)
+        return [json.loads(p.read_text()) for p in metas]
+
+    def prune(self) -> None:
+        """Keep only the newest `keep` traces on disk"""
+        for meta in self.traces()[self.keep:]:
+            for name in (meta["trace_file"], f"{meta['id']}.json"):
+                (self.trace_dir / name).unlink(missing_ok=True)
+
+    @staticmethod
+    def top_functions(trace_file: str, limit: int = 25) -> str:
+        """Text summary of a cProfile trace, sorted by cumulative time"""
+        buffer = io.StringIO()
+        pstats.Stats(trace_file, stream=buffer).sort_stats("cumulative").print_stats(limit)
+        return buffer.getvalue()
@@ -1,12 +1,21 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from config.config import ProfilingConfig
+from src.dashboard.common import (
+    CUSTOM_CSS,
+    calculate_kpis,
+    distribution_kpis,
+    get_instrumentation,
+    get_export_service,
+    get_refresher,
+    get_rerun_profiler,
+    px,
+    reload_config,
+)
+from src.dashboard.debug import render_debug_panel
+from src.dashboard.export import render_report_export, render_table_export
+from src.data.filters import And, Between, DateIn, Eq, In
 
 # Set page config
 st.set_page_config(
@@ -16,463 +25,485 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #1f4e79;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .section-header {
-        font-size: 2rem;
-        color: #2e75b6;
-        border-bottom: 2px solid #2e75b6;
-        padding-bottom: 0.5rem;
-        margin-top: 1.5rem;
-        text-align: center;
-    }
-    .metric-card {
-        background-color: #f8f9fa;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        margin-bottom: 1rem;
-        text-align: center;
-    }
-    .metric-card h3 {
-        margin: 0.2rem 0;
-        font-size: 1.8rem;
-        color: #1f4e79;
-    }
-    .metric-card p {
-        margin: 0.2rem 0;
-        font-size: 1rem;
-        color: #555;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Main title
-st.markdown('<h1 class="main-header">🎓 Dashboard Analitik Universitas</h1>', unsafe_allow_html=True)
-
-# Load dataset with error handling
-@st.cache_data
-def load_data():
-    try:
-        df = pd.read_csv('./database/data/mahasiswa_simulasi.csv')
-        # Convert date columns if they exist
-        for col in df.columns:
-            if 'tanggal' in col.lower() or 'date' in col.lower() or 'waktu' in col.lower() or 'time' in col.lower():
-                try:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
-                except:
-                    pass
-        return df
-    except FileNotFoundError:
-        st.error("File './database/data/mahasiswa_simulasi.csv' tidak ditemukan.")
-        return pd.DataFrame() # Return empty DataFrame
-    except Exception as e:
-        st.error(f"Terjadi kesalahan saat memuat data: {str(e)}")
-        return pd.DataFrame() # Return empty DataFrame
-
-# Function to calculate KPIs
-def calculate_kpis(df):
+# Perubahan .env diterapkan tanpa restart: dicek sekali per rerun (satu stat)
+reload_config()
+
+# Profiling satu rerun (opt-in lewat PROFILE_RERUNS=True atau query parameter ?profile=1)
+profile_trace = None
+filter_state = {}
+if ProfilingConfig.ENABLED or st.query_params.get("profile") == "1":
+    rerun_profiler = get_rerun_profiler()
+    profile_query_params = st.query_params.to_dict()
+    profile_trace = rerun_profiler.start()
+
+# Trace disimpan di finally: rerun yang berhenti lewat st.stop() atau exception tetap tercatat
+# dan profiler selalu dimatikan. Setelah st.stop() setiap perintah st.* melempar StopException
+# lagi, jadi finally hanya memakai objek yang sudah diambil di atas
+try:
+    # Custom CSS
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+    # Instrumentasi waktu per tahap (aktif jika DEBUG=True)
+    instr = get_instrumentation()
+    instr.begin_run()
+
+    # Main title
+    st.markdown('<h1 class="main-header">🎓 Dashboard Analitik Universitas</h1>', unsafe_allow_html=True)
+
+    # Load data (snapshot tidak berubah selama satu rerun)
+    with instr.stage("load_data") as stage:
+        refresher = get_refresher()
+        snapshot = refresher.snapshot
+        if snapshot is None:
+            st.error(f"Terjadi kesalahan saat memuat data: {refresher.last_error}")
+            st.stop()
+        df = snapshot.data
+        quality_report = snapshot['quality_report']
+        filter_engine = snapshot['filter_engine']
+        # State sidebar sebagai predikat; dikompilasi dan dieksekusi oleh filter_engine
+        predicates = []
+        # Filter yang sama dalam bentuk dimensi sketch (snapshot['sketches']) untuk KPI perkiraan
+        sketch_filters = {}
+        stage.rows_out = len(df)
+
+    with instr.stage("filter_angkatan", rows_in=len(df)) as stage:
+        # Tambahkan filter tahun angkatan di sini
+        st.sidebar.subheader("Filter Tahun Angkatan")
+        tahun_angkatan_cols = [col for col in df.columns if 'angkatan' in col.lower() or 'tahun' in col.lower() or 'year' in col.lower()]
+        if tahun_angkatan_cols:
+            tahun_angkatan_col = tahun_angkatan_cols[0]  # Gunakan kolom tahun angkatan pertama
+            unique_tahun = list(set(df[tahun_angkatan_col].dropna().unique()))
+            unique_tahun = sorted([int(year) for year in unique_tahun if pd.notna(year)])  # Pastikan hanya tahun valid dan urut
+            selected_tahun_angkatan = st.sidebar.selectbox("Pilih Tahun Angkatan", ["Semua"] + unique_tahun, key="tahun_angkatan_filter")
+            filter_state["tahun_angkatan"] = selected_tahun_angkatan
+    
+            if selected_tahun_angkatan != "Semua":
+                predicates.append(Eq(tahun_angkatan_col, selected_tahun_angkatan))
+                sketch_filters[tahun_angkatan_col] = [selected_tahun_angkatan]
+                df = filter_engine.apply(And(*predicates))  # Apply filter to main df for KPI calculation
+        else:
+            # If no tahun angkatan column found, use original df
+            pass
+        stage.rows_out = len(df)
+
+    with instr.stage("filter_fakultas", rows_in=len(df)) as stage:
+        # Tambahkan filter fakultas di sini
+        st.sidebar.subheader("Filter Fakultas")
+        # Mencari kolom yang mungkin berisi informasi fakultas/jurusan
+        fakultas_prodi_cols = [col for col in df.columns if 'fakultas' in col.lower() or 'faculty' in col.lower() or 'prodi' in col.lower() or 'jurusan' in col.lower() or 'department' in col.lower()]
+        selected_fakultas_col = None  # Inisialisasi variabel
+        if fakultas_prodi_cols:
+            selected_fakultas_col = fakultas_prodi_cols[0] # Gunakan kolom pertama yang ditemukan
+            # Ambil semua nilai dari kolom fakultas dan pastikan unik
+            all_faculty_values = df[selected_fakultas_col].dropna()
+            # Gunakan set untuk mendapatkan nilai unik, lalu ubah kembali ke list
+            unique_faculties = list(set(all_faculty_values))
+            # Bersihkan nilai NaN jika ada setelah konversi
+            unique_faculties = [fak for fak in unique_faculties if pd.notna(fak) and str(fak).lower() != 'nan']
+    
+            # Ganti selectbox dengan multiselect untuk multi-filter fakultas
+            selected_faculties = st.sidebar.multiselect(f"Pilih {selected_fakultas_col}", unique_faculties, default=unique_faculties)
+            filter_state["fakultas"] = selected_faculties
+    
+            if selected_fakultas_col and selected_fakultas_col in df.columns and selected_faculties:
+                predicates.append(In(selected_fakultas_col, selected_faculties))
+                sketch_filters[selected_fakultas_col] = selected_faculties
+        filter_plans = {"utama": filter_engine.compile(And(*predicates))}
+        df = filter_plans["utama"].apply()  # Apply filter to main df for KPI calculation
+        stage.rows_out = len(df)
+
+    # Check if data is loaded successfully
     if df.empty:
-        return {
+        st.error("Dataset kosong atau tidak dapat dimuat. Menampilkan KPI default.")
+        kpis = {
             'total_mahasiswa': 0,
             'total_aktif': 0,
             'total_lulus': 0,
             'persentase_aktif': 0,
             'avg_ipk': 0.0
         }
+    else:
+        # Calculate KPIs
+        with instr.stage("calculate_kpis", rows_in=len(df)):
+            kpis = calculate_kpis(df)
+
+    # Mahasiswa unik dan kuantil IPK: exact (scan df terfilter) atau perkiraan (gabungan sketch partisi terpilih)
+    approx_kpis = st.sidebar.toggle("KPI Perkiraan (Sketch)", value=False,
+                                    help="Mahasiswa unik dari HyperLogLog dan kuantil IPK dari t-digest")
+    filter_state["kpi_perkiraan"] = approx_kpis
+    with instr.stage("distribution_kpis", rows_in=len(df)):
+        sketches = snapshot['sketches']
+        # Filter pada kolom yang tidak menjadi dimensi sketch hanya bisa dijawab exact
+        if approx_kpis and set(sketch_filters) <= set(sketches.dimensions):
+            kpis.update(distribution_kpis(df, sketches, sketch_filters))
+        else:
+            kpis.update(distribution_kpis(df))
+
+    # Display KPIs at the top of the dashboard
+    st.markdown('<h1 class="section-header">KPI Utama</h1>', unsafe_allow_html=True)
+
+    # Create KPI cards with guaranteed display
+    col1, col2, col3, col4, col5 = st.columns(5)
+
+    with col1:
+        total_mahasiswa = kpis.get('total_mahasiswa', 0)
+        st.markdown(
+            f"""
+            <div class="metric-card">
+                <h3>{total_mahasiswa:,}</h3>
+                <p>Total Mahasiswa</p>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+
+    with col2:
+        total_aktif = kpis.get('total_aktif', 0)
+        st.markdown(
+            f"""
+            <div class="metric-card">
+                <h3>{total_aktif:,}</h3>
+                <p>Mahasiswa Aktif</p>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+
+    with col3:
+        total_lulus = kpis.get('total_lulus', 0)
+        st.markdown(
+            f"""
+            <div class="metric-card">
+                <h3>{total_lulus:,}</h3>
+                <p>Mahasiswa Lulus</p>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+
+    with col4:
+        persentase_aktif = kpis.get('persentase_aktif', 0)
+        st.markdown(
+            f"""
+            <div class="metric-card">
+                <h3>{persentase_aktif:.1f}%</h3>
+                <p>Persen Aktif</p>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+
+    with col5:
+        avg_ipk = kpis.get('avg_ipk', 0.0)
+        st.markdown(
+            f"""
+            <div class="metric-card">
+                <h3>{avg_ipk:.2f}</h3>
+                <p>Rata-rata IPK</p>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+
+    # Baris kedua: jumlah unik dan sebaran IPK (perkiraan jika toggle sketch aktif)
+    approx_label = " (perkiraan)" if approx_kpis else ""
+    distribution_cards = [
+        (f"{kpis['mahasiswa_unik']:,}", f"Mahasiswa Unik{approx_label}"),
+        (f"{kpis['ipk_median']:.2f}", f"Median IPK{approx_label}"),
+        (f"{kpis['ipk_p10']:.2f} – {kpis['ipk_p90']:.2f}", f"IPK P10 – P90{approx_label}"),
+    ]
+    for column, (value, label) in zip(st.columns(len(distribution_cards)), distribution_cards):
+        with column:
+            st.markdown(
+                f"""
+                <div class="metric-card">
+                    <h3>{value}</h3>
+                    <p>{label}</p>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+    # Display additional information about the data
+    if not df.empty:
+        st.success(f"Dataset berhasil dimuat dengan {len(df)} baris data")
+        # st.write("### Informasi Dataset")
+        # st.write(f"- Jumlah kolom: {len(df.columns)}")
+        # st.write(f"- Nama kolom: {', '.join(df.columns.tolist())}")
+
+    # Sidebar filters
+    st.sidebar.header("Filter Data")
+
+    with instr.stage("filter_tanggal", rows_in=len(df)) as stage:
+        # Date range filter
+        date_columns = []
+        for col in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                date_columns.append(col)
+
+        selected_date_col = None
+        if date_columns:
+            selected_date_col = st.sidebar.selectbox("Pilih Kolom Tanggal", ["Tidak Ada"] + date_columns)
+            filter_state["kolom_tanggal"] = selected_date_col
     
-    total_mahasiswa = len(df)
-    
-    # Find status column
-    status_col = None
-    for col in df.columns:
-        if 'status' in col.lower():
-            status_col = col
-            break
-    
-    # Count active and graduated students
-    total_aktif = 0
-    total_lulus = 0
-    if status_col and status_col in df.columns:
-        total_aktif = df[df[status_col].str.upper() == 'AKTIF'].shape[0]
-        total_lulus = df[df[status_col].str.upper() == 'LULUS'].shape[0]
-    
-    # Find IPK column
-    ipk_col = None
-    for col in df.columns:
-        if 'ipk' in col.lower() or 'gpa' in col.lower():
-            ipk_col = col
-            break
-    
-    # Calculate average IPK
-    avg_ipk = 0.0
-    if ipk_col and ipk_col in df.columns:
-        try:
-            ipk_values = pd.to_numeric(df[ipk_col], errors='coerce')
-            avg_ipk = ipk_values.mean()
-            if pd.isna(avg_ipk):
-                avg_ipk = 0.0
-        except:
-            avg_ipk = 0.0
-    
-    # Calculate percentage of active students
-    persentase_aktif = (total_aktif / total_mahasiswa * 100) if total_mahasiswa > 0 else 0
-    
-    return {
-        'total_mahasiswa': total_mahasiswa,
-        'total_aktif': total_aktif,
-        'total_lulus': total_lulus,
-        'persentase_aktif': persentase_aktif,
-        'avg_ipk': avg_ipk
-    }
-
-# Load data
-df = load_data()
-
-# Tambahkan filter tahun angkatan di sini
-st.sidebar.subheader("Filter Tahun Angkatan")
-tahun_angkatan_cols = [col for col in df.columns if 'angkatan' in col.lower() or 'tahun' in col.lower() or 'year' in col.lower()]
-if tahun_angkatan_cols:
-    tahun_angkatan_col = tahun_angkatan_cols[0]  # Gunakan kolom tahun angkatan pertama
-    unique_tahun = list(set(df[tahun_angkatan_col].dropna().unique()))
-    unique_tahun = sorted([int(year) for year in unique_tahun if pd.notna(year)])  # Pastikan hanya tahun valid dan urut
-    selected_tahun_angkatan = st.sidebar.selectbox("Pilih Tahun Angkatan", ["Semua"] + unique_tahun, key="tahun_angkatan_filter")
-    
-    if selected_tahun_angkatan != "Semua":
-        df = df[df[tahun_angkatan_col] == selected_tahun_angkatan]  # Apply filter to main df for KPI calculation
-else:
-    # If no tahun angkatan column found, use original df
-    pass
-
-# Tambahkan filter fakultas di sini
-st.sidebar.subheader("Filter Fakultas")
-# Mencari kolom yang mungkin berisi informasi fakultas/jurusan
-fakultas_prodi_cols = [col for col in df.columns if 'fakultas' in col.lower() or 'faculty' in col.lower() or 'prodi' in col.lower() or 'jurusan' in col.lower() or 'department' in col.lower()]
-selected_fakultas_col = None  # Inisialisasi variabel
-if fakultas_prodi_cols:
-    selected_fakultas_col = fakultas_prodi_cols[0] # Gunakan kolom pertama yang ditemukan
-    # Ambil semua nilai dari kolom fakultas dan pastikan unik
-    all_faculty_values = df[selected_fakultas_col].dropna()
-    # Gunakan set untuk mendapatkan nilai unik, lalu ubah kembali ke list
-    unique_faculties = list(set(all_faculty_values))
-    # Bersihkan nilai NaN jika ada setelah konversi
-    unique_faculties = [fak for fak in unique_faculties if pd.notna(fak) and str(fak).lower() != 'nan']
-    
-    # Ganti selectbox dengan multiselect untuk multi-filter fakultas
-    selected_faculties = st.sidebar.multiselect(f"Pilih {selected_fakultas_col}", unique_faculties, default=unique_faculties)
-    
-    if selected_fakultas_col and selected_fakultas_col in df.columns and selected_faculties:
-        df = df[df[selected_fakultas_col].isin(selected_faculties)]  # Apply filter to main df for KPI calculation
-
-# Check if data is loaded successfully
-if df.empty:
-    st.error("Dataset kosong atau tidak dapat dimuat. Menampilkan KPI default.")
-    kpis = {
-        'total_mahasiswa': 0,
-        'total_aktif': 0,
-        'total_lulus': 0,
-        'persentase_aktif': 0,
-        'avg_ipk': 0.0
-    }
-else:
-    # Calculate KPIs
-    kpis = calculate_kpis(df)
-
-# Display KPIs at the top of the dashboard
-st.markdown('<h1 class="section-header">KPI Utama</h1>', unsafe_allow_html=True)
-
-# Create KPI cards with guaranteed display
-col1, col2, col3, col4, col5 = st.columns(5)
-
-with col1:
-    total_mahasiswa = kpis.get('total_mahasiswa', 0)
-    st.markdown(
-        f"""
-        <div class="metric-card">
-            <h3>{total_mahasiswa:,}</h3>
-            <p>Total Mahasiswa</p>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-
-with col2:
-    total_aktif = kpis.get('total_aktif', 0)
-    st.markdown(
-        f"""
-        <div class="metric-card">
-            <h3>{total_aktif:,}</h3>
-            <p>Mahasiswa Aktif</p>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-
-with col3:
-    total_lulus = kpis.get('total_lulus', 0)
-    st.markdown(
-        f"""
-        <div class="metric-card">
-            <h3>{total_lulus:,}</h3>
-            <p>Mahasiswa Lulus</p>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-
-with col4:
-    persentase_aktif = kpis.get('persentase_aktif', 0)
-    st.markdown(
-        f"""
-        <div class="metric-card">
-            <h3>{persentase_aktif:.1f}%</h3>
-            <p>Persen Aktif</p>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-
-with col5:
-    avg_ipk = kpis.get('avg_ipk', 0.0)
-    st.markdown(
-        f"""
-        <div class="metric-card">
-            <h3>{avg_ipk:.2f}</h3>
-            <p>Rata-rata IPK</p>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-
-# Display additional information about the data
-if not df.empty:
-    st.success(f"Dataset berhasil dimuat dengan {len(df)} baris data")
-    # st.write("### Informasi Dataset")
-    # st.write(f"- Jumlah kolom: {len(df.columns)}")
-    # st.write(f"- Nama kolom: {', '.join(df.columns.tolist())}")
-
-# Sidebar filters
-st.sidebar.header("Filter Data")
-
-# Date range filter
-date_columns = []
-for col in df.columns:
-    if pd.api.types.is_datetime64_any_dtype(df[col]):
-        date_columns.append(col)
-
-selected_date_col = None
-if date_columns:
-    selected_date_col = st.sidebar.selectbox("Pilih Kolom Tanggal", ["Tidak Ada"] + date_columns)
-    
-    if selected_date_col != "Tidak Ada":
-        min_date = df[selected_date_col].min()
-        max_date = df[selected_date_col].max()
+            if selected_date_col != "Tidak Ada":
+                min_date = df[selected_date_col].min()
+                max_date = df[selected_date_col].max()
         
-        # Multi-select date filter
-        date_option = st.sidebar.radio("Pilih Jenis Filter Tanggal", ["Rentang Tunggal", "Multi-Tanggal"])
+                # Multi-select date filter
+                date_option = st.sidebar.radio("Pilih Jenis Filter Tanggal", ["Rentang Tunggal", "Multi-Tanggal"])
+                filter_state["jenis_filter_tanggal"] = date_option
         
-        if date_option == "Rentang Tunggal":
-            date_range = st.sidebar.date_input(
-                "Pilih Rentang Tanggal",
-                value=(min_date.date(), max_date.date()),
-                min_value=min_date.date(),
-                max_value=max_date.date()
-            )
+                if date_option == "Rentang Tunggal":
+                    date_range = st.sidebar.date_input(
+                        "Pilih Rentang Tanggal",
+                        value=(min_date.date(), max_date.date()),
+                        min_value=min_date.date(),
+                        max_value=max_date.date()
+                    )
+                    filter_state["rentang_tanggal"] = date_range
             
-            if isinstance(date_range, tuple) and len(date_range) == 2:
-                start_date, end_date = date_range
-                # Convert to datetime for comparison
-                start_datetime = pd.Timestamp(start_date)
-                end_datetime = pd.Timestamp(end_date)
-                mask = (df[selected_date_col] >= start_datetime) & (df[selected_date_col] <= end_datetime)
-                df_filtered = df.loc[mask]
-            else:
-                df_filtered = df
-        elif date_option == "Multi-Tanggal":
-            # Convert datetime column to date for comparison
-            df_dates = pd.to_datetime(df[selected_date_col]).dt.date
-            unique_dates = sorted(df_dates.dropna().unique())
-            selected_dates = st.sidebar.multiselect(
-                "Pilih Tanggal",
-                options=unique_dates,
-                default=[min_date.date(), max_date.date()]
-            )
+                    if isinstance(date_range, tuple) and len(date_range) == 2:
+                        start_date, end_date = date_range
+                        # Convert to datetime for comparison
+                        date_predicate = Between(selected_date_col, pd.Timestamp(start_date), pd.Timestamp(end_date))
+                        filter_plans["tanggal"] = filter_engine.compile(And(*predicates, date_predicate))
+                        df_filtered = filter_plans["tanggal"].apply()
+                    else:
+                        df_filtered = df
+                elif date_option == "Multi-Tanggal":
+                    # Convert datetime column to date for comparison
+                    df_dates = pd.to_datetime(df[selected_date_col]).dt.date
+                    unique_dates = sorted(df_dates.dropna().unique())
+                    selected_dates = st.sidebar.multiselect(
+                        "Pilih Tanggal",
+                        options=unique_dates,
+                        default=[min_date.date(), max_date.date()]
+                    )
+                    filter_state["multi_tanggal"] = selected_dates
             
-            if selected_dates:
-                # Create a mask using the date-only version
-                mask = df_dates.isin(selected_dates)
-                df_filtered = df.loc[mask]
+                    if selected_dates:
+                        # Dicocokkan per tanggal kalender (tanpa jam)
+                        filter_plans["tanggal"] = filter_engine.compile(And(*predicates, DateIn(selected_date_col, selected_dates)))
+                        df_filtered = filter_plans["tanggal"].apply()
+                    else:
+                        df_filtered = df
             else:
                 df_filtered = df
-    else:
-        df_filtered = df
-else:
-    df_filtered = df
-
-# Column selection for analysis
-numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
-categorical_columns = df.select_dtypes(include=['object', 'category']).columns.tolist()
-
-# Now df is already filtered based on sidebar selections, so we use it directly for visualization
-df_filtered_visual = df
-
-df_cleaned_visual = df_filtered_visual.copy()
-original_shape = df_cleaned_visual.shape
-
-# Isi nilai hilang dengan mean/median
-for col in numeric_columns:
-    if df_cleaned_visual[col].isnull().any():
-        if col in ['age', 'semester', 'ipk', 'nilai']:
-            df_cleaned_visual[col].fillna(df_cleaned_visual[col].median(), inplace=True)
-        else:
-            df_cleaned_visual[col].fillna(df_cleaned_visual[col].mean(), inplace=True)
-
-for col in categorical_columns:
-    if df_cleaned_visual[col].isnull().any():
-        mode_val = df_cleaned_visual[col].mode()
-        if not mode_val.empty:
-            df_cleaned_visual[col].fillna(mode_val[0], inplace=True)
         else:
-            df_cleaned_visual[col].fillna('Tidak Diketahui', inplace=True)
+            df_filtered = df
+        stage.rows_out = len(df_filtered)
+
+    # Column selection for analysis
+    numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
+    categorical_columns = df.select_dtypes(include=['object', 'category']).columns.tolist()
+
+    # Now df is already filtered based on sidebar selections, so we use it directly for visualization
+    df_filtered_visual = df
+
+    df_cleaned_visual = df_filtered_visual.copy()
+    original_shape = df_cleaned_visual.shape
+
+    # Ringkasan kualitas data dan opsi untuk mengecualikan baris anomali
+    with st.sidebar.expander("Kualitas Data"):
+        st.dataframe(quality_report.summary(), use_container_width=True)
+        if snapshot['cleaning_report']:
+            st.caption("Diperbaiki saat ingest (aturan CleaningConfig)")
+            st.dataframe(pd.DataFrame(list(snapshot['cleaning_report'].items()), columns=["Aturan", "Jumlah Baris"]),
+                         hide_index=True, width='stretch')
+        exclude_anomalies = st.checkbox("Kecualikan baris anomali (IPK di luar rentang, prodi tidak rapi)", value=False)
+        filter_state["kecualikan_anomali"] = exclude_anomalies
+
+    if exclude_anomalies and not df_cleaned_visual.empty:
+        anomaly_mask = quality_report.flagged(["ipk_out_of_range", "prodi_padded"])
+        df_cleaned_visual = df_cleaned_visual[~anomaly_mask[df_cleaned_visual.index.to_numpy()]]
+
+    with instr.stage("clean_missing", rows_in=len(df_cleaned_visual)) as stage:
+        # Isi nilai hilang dengan mean/median
+        for col in numeric_columns:
+            if df_cleaned_visual[col].isnull().any():
+                if col in ['age', 'semester', 'ipk', 'nilai']:
+                    df_cleaned_visual[col].fillna(df_cleaned_visual[col].median(), inplace=True)
+                else:
+                    df_cleaned_visual[col].fillna(df_cleaned_visual[col].mean(), inplace=True)
+
+        for col in categorical_columns:
+            if df_cleaned_visual[col].isnull().any():
+                mode_val = df_cleaned_visual[col].mode()
+                if not mode_val.empty:
+                    df_cleaned_visual[col].fillna(mode_val[0], inplace=True)
+                else:
+                    df_cleaned_visual[col].fillna('Tidak Diketahui', inplace=True)
             
-st.sidebar.success("Proses pengisian nilai hilang selesai")
-
-# Hapus baris duplikat
-original_len = len(df_cleaned_visual)
-df_cleaned_visual = df_cleaned_visual.drop_duplicates()
-removed_count = original_len - len(df_cleaned_visual)
-st.sidebar.success(f"Hapus {removed_count} baris duplikat")
-
-# Update dataframe yang digunakan untuk visualisasi
-df_filtered_visual = df_cleaned_visual
-st.sidebar.success("Pembersihan data selesai!")
-st.sidebar.metric(label="Ukuran Dataset yang Dibersihkan", value=f"{len(df_cleaned_visual):,} rekaman", delta=f"-{original_shape[0] - len(df_cleaned_visual)} dari ukuran awal")
-
-# Display dashboard section
-st.markdown('<h1 class="section-header">Dashboard Visualisasi</h1>', unsafe_allow_html=True)
-
-# Visualisasi 1: Bar Chart
-st.markdown("### 📊 Bar Chart - Distribusi Mahasiswa per Jurusan/Fakultas")
-categorical_cols_for_bar = [col for col in categorical_columns if 'jurusan' in col.lower() or 'fakultas' in col.lower() or 'prodi' in col.lower()]
-gender_cols = [col for col in categorical_columns if 'gender' in col.lower() or 'jk' in col.lower() or 'kelamin' in col.lower()]
-if categorical_cols_for_bar:
-    if categorical_cols_for_bar:
-        selected_cat_col = categorical_cols_for_bar[0] # Gunakan kolom pertama
-    else:
-        selected_cat_col = None
+        st.sidebar.success("Proses pengisian nilai hilang selesai")
+        stage.rows_out = len(df_cleaned_visual)
+
+    # Hapus baris duplikat
+    with instr.stage("deduplicate", rows_in=len(df_cleaned_visual)) as stage:
+        original_len = len(df_cleaned_visual)
+        duplicate_mask = snapshot['deduplicator'].duplicated(rows=df_cleaned_visual.index.to_numpy())
+        df_cleaned_visual = df_cleaned_visual[~duplicate_mask]
+        stage.rows_out = len(df_cleaned_visual)
+    removed_count = original_len - len(df_cleaned_visual)
+    st.sidebar.success(f"Hapus {removed_count} baris duplikat")
+
+    # Update dataframe yang digunakan untuk visualisasi
+    df_filtered_visual = df_cleaned_visual
+    st.sidebar.success("Pembersihan data selesai!")
+    st.sidebar.metric(label="Ukuran Dataset yang Dibersihkan", value=f"{len(df_cleaned_visual):,} rekaman", delta=f"-{original_shape[0] - len(df_cleaned_visual)} dari ukuran awal")
+
+    # Display dashboard section
+    st.markdown('<h1 class="section-header">Dashboard Visualisasi</h1>', unsafe_allow_html=True)
+
+    with instr.stage("chart_bar", rows_in=len(df_filtered_visual)):
+        # Visualisasi 1: Bar Chart
+        st.markdown("### 📊 Bar Chart - Distribusi Mahasiswa per Jurusan/Fakultas")
+        categorical_cols_for_bar = [col for col in categorical_columns if 'jurusan' in col.lower() or 'fakultas' in col.lower() or 'prodi' in col.lower()]
+        gender_cols = [col for col in categorical_columns if 'gender' in col.lower() or 'jk' in col.lower() or 'kelamin' in col.lower()]
+        if categorical_cols_for_bar:
+            if categorical_cols_for_bar:
+                selected_cat_col = categorical_cols_for_bar[0] # Gunakan kolom pertama
+            else:
+                selected_cat_col = None
         
-    # Check if gender column is available for grouping
-    if gender_cols:
-        selected_gender_col = gender_cols[0] # Gunakan kolom gender pertama
-        # Group by both selected category and gender
-        bar_data = df_filtered_visual.groupby([selected_cat_col, selected_gender_col]).size().reset_index()
-        bar_data.columns = [selected_cat_col, selected_gender_col, 'Jumlah Mahasiswa']
+            # Check if gender column is available for grouping
+            if gender_cols:
+                selected_gender_col = gender_cols[0] # Gunakan kolom gender pertama
+                # Group by both selected category and gender
+                bar_data = df_filtered_visual.groupby([selected_cat_col, selected_gender_col]).size().reset_index()
+                bar_data.columns = [selected_cat_col, selected_gender_col, 'Jumlah Mahasiswa']
         
-        fig_bar = px.bar(bar_data, x=selected_cat_col, y='Jumlah Mahasiswa', color=selected_gender_col,
-                        labels={'x': selected_cat_col, 'y': 'Jumlah Mahasiswa', 'color': selected_gender_col},
-                        title=f"Distribusi Mahasiswa per {selected_cat_col} (Berdasarkan {selected_gender_col})")
-        st.plotly_chart(fig_bar, use_container_width=True)
-    else:
-        # Fallback if no gender column is available
-        # Jumlahkan mahasiswa per prodi/jurusan/fakultas
-        bar_data = df_filtered_visual[selected_cat_col].value_counts().reset_index()
-        bar_data.columns = [selected_cat_col, 'Jumlah Mahasiswa']
+                fig_bar = px.bar(bar_data, x=selected_cat_col, y='Jumlah Mahasiswa', color=selected_gender_col,
+                                labels={'x': selected_cat_col, 'y': 'Jumlah Mahasiswa', 'color': selected_gender_col},
+                                title=f"Distribusi Mahasiswa per {selected_cat_col} (Berdasarkan {selected_gender_col})")
+                st.plotly_chart(fig_bar, use_container_width=True)
+            else:
+                # Fallback if no gender column is available
+                # Jumlahkan mahasiswa per prodi/jurusan/fakultas
+                bar_data = df_filtered_visual[selected_cat_col].value_counts().reset_index()
+                bar_data.columns = [selected_cat_col, 'Jumlah Mahasiswa']
         
-        fig_bar = px.bar(bar_data, x=selected_cat_col, y='Jumlah Mahasiswa',
-                        labels={'x': selected_cat_col, 'y': 'Jumlah Mahasiswa'},
-                        title=f"Distribusi Mahasiswa per {selected_cat_col}")
-        st.plotly_chart(fig_bar, use_container_width=True)
-else:
-    st.warning("Tidak ditemukan kolom jurusan/fakultas. Menggunakan kolom kategorikal pertama sebagai contoh.")
-    if categorical_columns:
-        selected_cat_col = categorical_columns[0]
+                fig_bar = px.bar(bar_data, x=selected_cat_col, y='Jumlah Mahasiswa',
+                                labels={'x': selected_cat_col, 'y': 'Jumlah Mahasiswa'},
+                                title=f"Distribusi Mahasiswa per {selected_cat_col}")
+                st.plotly_chart(fig_bar, use_container_width=True)
+        else:
+            st.warning("Tidak ditemukan kolom jurusan/fakultas. Menggunakan kolom kategorikal pertama sebagai contoh.")
+            if categorical_columns:
+                selected_cat_col = categorical_columns[0]
+                gender_cols = [col for col in categorical_columns if 'gender' in col.lower() or 'jk' in col.lower() or 'kelamin' in col.lower()]
+                if gender_cols:
+                    selected_gender_col = gender_cols[0]
+                    # Group by both selected category and gender
+                    bar_data = df_filtered_visual.groupby([selected_cat_col, selected_gender_col]).size().reset_index()
+                    bar_data.columns = [selected_cat_col, selected_gender_col, 'Jumlah Mahasiswa']
+            
+                    fig_bar = px.bar(bar_data, x=selected_cat_col, y='Jumlah Mahasiswa', color=selected_gender_col,
+                                    labels={'x': selected_cat_col, 'y': 'Jumlah Mahasiswa', 'color': selected_gender_col},
+                                    title=f"Distribusi Mahasiswa per {selected_cat_col} (Berdasarkan {selected_gender_col})")
+                    st.plotly_chart(fig_bar, use_container_width=True)
+                else:
+                    bar_data = df_filtered_visual[selected_cat_col].value_counts().reset_index()
+                    bar_data.columns = [selected_cat_col, 'Jumlah Mahasiswa']
+            
+                    fig_bar = px.bar(bar_data, x=selected_cat_col, y='Jumlah Mahasiswa',
+                                    labels={'x': selected_cat_col, 'y': 'Jumlah Mahasiswa'},
+                                    title=f"Distribusi Mahasiswa per {selected_cat_col}")
+                    st.plotly_chart(fig_bar, use_container_width=True)
+
+    with instr.stage("chart_line", rows_in=len(df_filtered_visual)):
+        # Visualisasi 2: Line Chart
+        st.markdown("### 📈 Line Chart - Tren Mahasiswa per Tahun Angkatan")
+        tahun_angkatan_cols = [col for col in df.columns if 'angkatan' in col.lower() or 'tahun' in col.lower() or 'year' in col.lower()]
+        if tahun_angkatan_cols:
+            selected_tahun_col = tahun_angkatan_cols[0]  # Gunakan kolom tahun angkatan pertama
+            if selected_tahun_col:
+                line_data = df_filtered_visual.groupby(selected_tahun_col).size().reset_index()
+                line_data.columns = [selected_tahun_col, 'Jumlah Mahasiswa']
+                fig_line = px.line(line_data, x=selected_tahun_col, y='Jumlah Mahasiswa',
+                                  title=f"Tren Jumlah Mahasiswa per {selected_tahun_col}")
+                st.plotly_chart(fig_line, use_container_width=True)
+        else:
+            st.warning("Tidak ditemukan kolom tahun angkatan untuk line chart.")
+
+    # Visualisasi 3: Pie Charts
+    st.markdown("### 🥧 Pie Chart - Proporsi Mahasiswa berdasarkan Status dan Gender")
+
+    with instr.stage("chart_pie_status", rows_in=len(df_filtered_visual)):
+        # Mencari kolom status
+        status_cols = [col for col in categorical_columns if 'status' in col.lower() or 'aktif' in col.lower()]
+        if status_cols:
+            selected_status_col = status_cols[0]  # Gunakan kolom status pertama
+            if selected_status_col:
+                status_data = df_filtered_visual[selected_status_col].value_counts()
+                fig_status = px.pie(status_data, values=status_data.values, names=status_data.index,
+                                   title=f"Proporsi Mahasiswa berdasarkan Status")
+                st.plotly_chart(fig_status, use_container_width=True)
+        else:
+            st.warning("Tidak ditemukan kolom status untuk pie chart.")
+
+    with instr.stage("chart_pie_gender", rows_in=len(df_filtered_visual)):
+        # Mencari kolom gender
         gender_cols = [col for col in categorical_columns if 'gender' in col.lower() or 'jk' in col.lower() or 'kelamin' in col.lower()]
         if gender_cols:
-            selected_gender_col = gender_cols[0]
-            # Group by both selected category and gender
-            bar_data = df_filtered_visual.groupby([selected_cat_col, selected_gender_col]).size().reset_index()
-            bar_data.columns = [selected_cat_col, selected_gender_col, 'Jumlah Mahasiswa']
-            
-            fig_bar = px.bar(bar_data, x=selected_cat_col, y='Jumlah Mahasiswa', color=selected_gender_col,
-                            labels={'x': selected_cat_col, 'y': 'Jumlah Mahasiswa', 'color': selected_gender_col},
-                            title=f"Distribusi Mahasiswa per {selected_cat_col} (Berdasarkan {selected_gender_col})")
-            st.plotly_chart(fig_bar, use_container_width=True)
+            selected_gender_col = gender_cols[0]  # Gunakan kolom gender pertama
+            if selected_gender_col:
+                gender_data = df_filtered_visual[selected_gender_col].value_counts()
+                fig_gender = px.pie(gender_data, values=gender_data.values, names=gender_data.index,
+                                   title=f"Proporsi Mahasiswa berdasarkan Jenis Kelamin")
+                st.plotly_chart(fig_gender, use_container_width=True)
         else:
-            bar_data = df_filtered_visual[selected_cat_col].value_counts().reset_index()
-            bar_data.columns = [selected_cat_col, 'Jumlah Mahasiswa']
-            
-            fig_bar = px.bar(bar_data, x=selected_cat_col, y='Jumlah Mahasiswa',
-                            labels={'x': selected_cat_col, 'y': 'Jumlah Mahasiswa'},
-                            title=f"Distribusi Mahasiswa per {selected_cat_col}")
-            st.plotly_chart(fig_bar, use_container_width=True)
-
-# Visualisasi 2: Line Chart
-st.markdown("### 📈 Line Chart - Tren Mahasiswa per Tahun Angkatan")
-tahun_angkatan_cols = [col for col in df.columns if 'angkatan' in col.lower() or 'tahun' in col.lower() or 'year' in col.lower()]
-if tahun_angkatan_cols:
-    selected_tahun_col = tahun_angkatan_cols[0]  # Gunakan kolom tahun angkatan pertama
-    if selected_tahun_col:
-        line_data = df_filtered_visual.groupby(selected_tahun_col).size().reset_index()
-        line_data.columns = [selected_tahun_col, 'Jumlah Mahasiswa']
-        fig_line = px.line(line_data, x=selected_tahun_col, y='Jumlah Mahasiswa',
-                          title=f"Tren Jumlah Mahasiswa per {selected_tahun_col}")
-        st.plotly_chart(fig_line, use_container_width=True)
-else:
-    st.warning("Tidak ditemukan kolom tahun angkatan untuk line chart.")
-
-# Visualisasi 3: Pie Charts
-st.markdown("### 🥧 Pie Chart - Proporsi Mahasiswa berdasarkan Status dan Gender")
-
-# Mencari kolom status
-status_cols = [col for col in categorical_columns if 'status' in col.lower() or 'aktif' in col.lower()]
-if status_cols:
-    selected_status_col = status_cols[0]  # Gunakan kolom status pertama
-    if selected_status_col:
-        status_data = df_filtered_visual[selected_status_col].value_counts()
-        fig_status = px.pie(status_data, values=status_data.values, names=status_data.index,
-                           title=f"Proporsi Mahasiswa berdasarkan Status")
-        st.plotly_chart(fig_status, use_container_width=True)
-else:
-    st.warning("Tidak ditemukan kolom status untuk pie chart.")
-
-# Mencari kolom gender
-gender_cols = [col for col in categorical_columns if 'gender' in col.lower() or 'jk' in col.lower() or 'kelamin' in col.lower()]
-if gender_cols:
-    selected_gender_col = gender_cols[0]  # Gunakan kolom gender pertama
-    if selected_gender_col:
-        gender_data = df_filtered_visual[selected_gender_col].value_counts()
-        fig_gender = px.pie(gender_data, values=gender_data.values, names=gender_data.index,
-                           title=f"Proporsi Mahasiswa berdasarkan Jenis Kelamin")
-        st.plotly_chart(fig_gender, use_container_width=True)
-else:
-    st.warning("Tidak ditemukan kolom gender untuk pie chart.")
-
-# Visualisasi 4: Histogram
-st.markdown("### 📊 Histogram - Distribusi IPK Mahasiswa")
-ipk_cols = [col for col in numeric_columns if 'ipk' in col.lower() or 'gpa' in col.lower() or 'indeks' in col.lower()]
-if ipk_cols:
-    selected_ipk_col = ipk_cols[0]  # Gunakan kolom IPK pertama
-    if selected_ipk_col:
-        fig_hist = px.histogram(df_filtered_visual, x=selected_ipk_col, nbins=20,
-                               title=f"Distribusi {selected_ipk_col} Mahasiswa",
-                               labels={selected_ipk_col: selected_ipk_col, 'count': 'Frekuensi'})
-        st.plotly_chart(fig_hist, use_container_width=True)
-else:
-    st.warning("Tidak ditemukan kolom IPK. Menggunakan kolom numerik pertama sebagai contoh.")
-    if numeric_columns:
-        selected_ipk_col = numeric_columns[0]
-        fig_hist = px.histogram(df_filtered_visual, x=selected_ipk_col, nbins=20,
-                               title=f"Distribusi {selected_ipk_col} Mahasiswa",
-                               labels={selected_ipk_col: selected_ipk_col, 'count': 'Frekuensi'})
-        st.plotly_chart(fig_hist, use_container_width=True)
-
-# Footer
-st.markdown("---")
-st.markdown("<p style='text-align: center; color: gray;'>Dashboard Analitik Universitas © 2025</p>", unsafe_allow_html=True)
\ No newline at end of file
+            st.warning("Tidak ditemukan kolom gender untuk pie chart.")
+
+    with instr.stage("chart_histogram", rows_in=len(df_filtered_visual)):
+        # Visualisasi 4: Histogram
+        st.markdown("### 📊 Histogram - Distribusi IPK Mahasiswa")
+        ipk_cols = [col for col in numeric_columns if 'ipk' in col.lower() or 'gpa' in col.lower() or 'indeks' in col.lower()]
+        if ipk_cols:
+            selected_ipk_col = ipk_cols[0]  # Gunakan kolom IPK pertama
+            if selected_ipk_col:
+                fig_hist = px.histogram(df_filtered_visual, x=selected_ipk_col, nbins=20,
+                                       title=f"Distribusi {selected_ipk_col} Mahasiswa",
+                                       labels={selected_ipk_col: selected_ipk_col, 'count': 'Frekuensi'})
+                st.plotly_chart(fig_hist, use_container_width=True)
+        else:
+            st.warning("Tidak ditemukan kolom IPK. Menggunakan kolom numerik pertama sebagai contoh.")
+            if numeric_columns:
+                selected_ipk_col = numeric_columns[0]
+                fig_hist = px.histogram(df_filtered_visual, x=selected_ipk_col, nbins=20,
+                                       title=f"Distribusi {selected_ipk_col} Mahasiswa",
+                                       labels={selected_ipk_col: selected_ipk_col, 'count': 'Frekuensi'})
+                st.plotly_chart(fig_hist, use_container_width=True)
+
+    # Ekspor daftar mahasiswa terfilter dan laporan KPI untuk rapat fakultas
+    st.markdown("### 📥 Ekspor Data & Laporan")
+    render_table_export(get_export_service(), df_filtered_visual, "mahasiswa_terfilter", snapshot['dataset_version'],
+                        filter_state, key="export_mahasiswa", label="📥 Download Daftar Mahasiswa")
+
+    def report_contents():
+        report_kpis = {
+            "Total Mahasiswa": f"{kpis['total_mahasiswa']:,}",
+            "Mahasiswa Aktif": f"{kpis['total_aktif']:,}",
+            "Lulusan": f"{kpis['total_lulus']:,}",
+            "Persentase Aktif": f"{kpis['persentase_aktif']:.1f}%",
+            "Rata-rata IPK": f"{kpis['avg_ipk']:.2f}",
+        }
+        chart_cols = [col for col in dict.fromkeys([selected_fakultas_col, 'status', 'jenjang'])
+                      if col and col in df_filtered_visual.columns]
+        return report_kpis, {f"Mahasiswa per {col}": df_filtered_visual[col].value_counts() for col in chart_cols}
+
+    render_report_export(get_export_service(), "laporan_mahasiswa", snapshot['dataset_version'], filter_state,
+                         key="report_mahasiswa", title="Dashboard Analitik Universitas", contents=report_contents)
+
+    render_debug_panel(instr, filter_plans)
+
+    # Footer
+    st.markdown("---")
+    st.markdown("<p style='text-align: center; color: gray;'>Dashboard Analitik Universitas © 2025</p>", unsafe_allow_html=True)
+finally:
+    # Simpan trace profiling beserta state filter yang menghasilkannya
+    if profile_trace is not None:
+        rerun_profiler.stop(profile_trace, {
+            "filters": filter_state,
+            "query_params": profile_query_params,
+        })
@@ -0,0 +1,37 @@
+"""
+Unit tests untuk student aggregates module
+"""
+import pandas as pd
+import pytest
+from src.data.aggregates import student_summary
+from src.data.dataset import prepare_table
+
+@pytest.fixture
+def mahasiswa():
+    return pd.DataFrame({
+        "prodi": ["Informatika", "Informatika ", "Farmasi", "Farmasi"],
+        "angkatan": [2020, 2020, 2021, 2021],
+        "status": ["AKTIF", "aktif", "LULUS", "DO"],
+        "ipk": [3.0, 3.5, 2.5, None],
+    })
+
+@pytest.mark.parametrize("typed", [False, True])
+def test_student_summary(mahasiswa, typed):
+    df = prepare_table(mahasiswa) if typed else mahasiswa
+    summary = student_summary(df)
+    
+    assert summary["kpis"] == {
+        "total_mahasiswa": 4,
+        "total_aktif": 2,
+        "total_lulus": 1,
+        "persentase_aktif": 50.0,
+        "avg_ipk": 3.0,
+    }
+    assert summary["prodi"] == [{"prodi": "Informatika", "jumlah": 2}, {"prodi": "Farmasi", "jumlah": 2}]
+    assert summary["angkatan"][1] == {"angkatan": 2021, "jumlah": 2, "aktif": 0, "lulus": 1, "avg_ipk": 2.5}
+
+def test_empty_table_has_zero_kpis(mahasiswa):
+    summary = student_summary(mahasiswa.iloc[0:0])
+    assert summary["kpis"]["total_mahasiswa"] == 0
+    assert summary["kpis"]["avg_ipk"] == 0.0
+    assert summary["prodi"] == [] and summary["angkatan"] == []
@@ -0,0 +1,82 @@
+"""
+Unit tests untuk headless aggregate API
+"""
+import json
+import anyio
+import pandas as pd
+import pytest
+from src.api.server import build_api_dataset, create_app, etag_matches
+from src.data.refresh import DataRefresher
+
+def request(app, path, headers=None):
+    """Call the ASGI app directly and return (status, headers, body)"""
+    messages = []
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "server": ("test", 80), "client": ("test", 1),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        messages.append(message)
+    
+    anyio.run(app, scope, receive, send)
+    start = messages[0]
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return start["status"], {k.decode(): v.decode() for k, v in start["headers"]}, body
+
+@pytest.fixture
+def app(tmp_path):
+    pd.DataFrame({
+        "prodi": ["Informatika", "Farmasi", "Farmasi"],
+        "angkatan": [2020, 2021, 2021],
+        "status": ["AKTIF", "LULUS", "AKTIF"],
+        "ipk": [3.0, 3.5, 2.5],
+    }).to_csv(tmp_path / "mahasiswa_simulasi.csv", index=False)
+    refresher = DataRefresher(str(tmp_path), build_api_dataset, interval=3600)
+    refresher.refresh()
+    return create_app(refresher)
+
+def test_aggregate_endpoint_and_etag(app):
+    status, headers, body = request(app, "/api/v1/students/kpis")
+    assert status == 200
+    payload = json.loads(body)
+    assert payload["data"]["total_aktif"] == 2
+    assert headers["etag"] == f'"{payload["dataset_version"]}-kpis"'
+    
+    status, _, body = request(app, "/api/v1/students/kpis", {"If-None-Match": headers["etag"]})
+    assert status == 304 and body == b""
+
+def test_unknown_aggregate_is_404(app):
+    assert request(app, "/api/v1/students/unknown")[0] == 404
+
+def test_not_loaded_is_503(tmp_path):
+    app = create_app(DataRefresher(str(tmp_path), build_api_dataset))
+    assert request(app, "/api/v1/students/summary")[0] == 503
+
+def test_etag_matches():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches("", '"b"')
+
+def test_kpis_match_dashboard(tmp_path):
+    from src.dashboard.common import build_dataset, calculate_kpis
+    # Baris duplikat dan prodi kosong: populasi API harus sama dengan tabel dashboard
+    pd.DataFrame({
+        "id_mahasiswa": [1, 2, 2, 3, 4],
+        "prodi": ["Informatika", "Farmasi", "Farmasi", None, "Farmasi"],
+        "angkatan": [2020, 2021, 2021, 2022, 2022],
+        "status": ["AKTIF", "LULUS", "LULUS", "AKTIF", "DO"],
+        "ipk": [3.0, 3.5, 3.5, 2.5, None],
+    }).to_csv(tmp_path / "mahasiswa_simulasi.csv", index=False)
+    refresher = DataRefresher(str(tmp_path), build_api_dataset, interval=3600)
+    refresher.refresh()
+    
+    df, _ = build_dataset(str(tmp_path))
+    payload = json.loads(request(create_app(refresher), "/api/v1/students/kpis")[2])
+    assert payload["data"] == calculate_kpis(df)
+    assert payload["data"]["total_mahasiswa"] == 5
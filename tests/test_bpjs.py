@@ -0,0 +1,39 @@
+"""
+Unit tests untuk BPJS antrol loading module
+"""
+import pandas as pd
+import pytest
+from src.data.bpjs import UNKNOWN_STATUS, load_bpjs, map_status
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "bpjs antrol.csv"
+    pd.DataFrame({
+        "no_rawat": ["2025/000001", "2025/000002", "2025/000003"],
+        "tgl_registrasi": ["22/10/2025", "09/10/2025", "31/02/2025"],
+        "jam_reg": ["08:11:22", "11:40:48", "25:00:00"],
+        "tanggal_periksa": ["24/10/2025", "10/10/2025", "01/03/2025"],
+        "nm_poli": ["Poli THT", "Poli Mata", "Poli THT"],
+        "status_kirim": ["Sudah", "Gagal", "Batal"],
+        "kolom_lain": [1, 2, 3],
+    }).to_csv(path, index=False)
+    return path
+
+def test_load_bpjs_parses_columns(csv_path):
+    df = load_bpjs(csv_path)
+    
+    assert "kolom_lain" not in df.columns
+    assert df["tgl_registrasi"].iloc[0] == pd.Timestamp(2025, 10, 22)
+    assert pd.isna(df["tgl_registrasi"].iloc[2])
+    assert df["jam_reg"].iloc[1] == pd.Timedelta(hours=11, minutes=40, seconds=48)
+    assert pd.isna(df["jam_reg"].iloc[2])
+    assert df["status"].tolist() == ["Sudah", "Gagal", UNKNOWN_STATUS]
+
+def test_load_bpjs_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_bpjs(tmp_path / "missing.csv")
+
+def test_map_status_is_categorical():
+    status = map_status(pd.Series(["Belum", None, "Ambil Antrian"]))
+    assert isinstance(status.dtype, pd.CategoricalDtype)
+    assert status.tolist() == ["Belum", UNKNOWN_STATUS, "Ambil Antrian"]
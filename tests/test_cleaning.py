@@ -0,0 +1,65 @@
+"""
+Unit tests untuk data cleaning rules module
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.cleaning import canonical_semester, clean_table
+from src.data.loader import DataLoader
+
+RULES = {
+    "strip": ["prodi"],
+    "clamp": {"ipk": (0.0, 4.0), "sks": (1, 6)},
+    "semester": ["semester_akademik"],
+}
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "prodi": [" Fisika ", "Fisika", "Kimia", None, "  ", "Kimia "],
+        "ipk": [3.2, 4.7, -0.5, np.nan, 2.0, 3.9],
+        "sks": [0, 3, 2, 7, 3, 2],
+        "semester_akademik": ["202/2023 Ganjil", "2022/2023 Genap", " 2023/2024 ganjil", "2021/2023 Genap",
+                              None, "Semester 1"],
+    })
+
+def test_canonical_semester():
+    assert canonical_semester("202/2023 Ganjil") == "2022/2023 Ganjil"
+    assert canonical_semester("2023/2024  genap ") == "2023/2024 Genap"
+    assert canonical_semester("2021/2023 Genap") is None
+    assert canonical_semester(np.nan) is None
+
+@pytest.mark.parametrize("as_category", [False, True])
+def test_clean_table(df, as_category):
+    if as_category:
+        df = df.astype({"prodi": "category", "semester_akademik": "category"})
+    cleaned = clean_table(df, RULES)
+    assert cleaned["prodi"].tolist()[:3] == ["Fisika", "Fisika", "Kimia"]
+    assert cleaned["prodi"].isna().tolist() == [False, False, False, True, True, False]
+    assert cleaned["prodi"].nunique() == 2
+    assert cleaned["ipk"].tolist()[:3] == [3.2, 4.0, 0.0] and np.isnan(cleaned["ipk"][3])
+    assert cleaned["sks"].tolist() == [1, 3, 2, 6, 3, 2]
+    assert cleaned["semester_akademik"].tolist()[:3] == ["2022/2023 Ganjil", "2022/2023 Genap", "2023/2024 Ganjil"]
+    assert cleaned["semester_akademik"].isna().sum() == 3
+    assert cleaned.attrs["cleaning"] == {
+        "prodi_stripped": 3, "ipk_clamped": 2, "sks_clamped": 2,
+        "semester_akademik_repaired": 2, "semester_akademik_invalid": 2,
+    }
+    assert isinstance(cleaned["prodi"].dtype, pd.CategoricalDtype) == as_category
+    # Input tidak diubah
+    assert df["prodi"].iloc[0] == " Fisika "
+
+def test_unknown_rule(df):
+    with pytest.raises(ValueError):
+        clean_table(df, {"trim": ["prodi"]})
+
+def test_loader_cleans_at_ingest(df, tmp_path):
+    df.to_csv(tmp_path / "krs_simulasi.csv", index=False)
+    raw = DataLoader(str(tmp_path))
+    loader = DataLoader(str(tmp_path), {"krs": RULES})
+    assert raw.load_csv("krs_simulasi.csv")["prodi"].iloc[0] == " Fisika "
+    assert loader.load_csv("krs_simulasi.csv")["prodi"].iloc[0] == "Fisika"
+    # Store turunan dibangun ulang saat aturan berubah
+    assert loader.store_name("krs_simulasi.csv") != raw.store_name("krs_simulasi.csv")
+    assert loader.store_name("krs_simulasi.csv") != \
+        DataLoader(str(tmp_path), {"krs": {"strip": ["prodi"]}}).store_name("krs_simulasi.csv")
@@ -0,0 +1,87 @@
+"""
+Unit tests untuk memory-mapped column store module
+"""
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from src.data import versioned
+from src.data.column_store import ColumnStore
+from src.data.loader import DataLoader
+
+class TestColumnStore:
+    """Test cases untuk ColumnStore melalui DataLoader"""
+    
+    @pytest.fixture
+    def loader(self, tmp_path):
+        pd.DataFrame({
+            "id_mahasiswa": [1, 2, 3],
+            "prodi": ["Manajemen", np.nan, "Akuntansi"],
+            "status": ["AKTIF", "LULUS", "AKTIF"],
+            "jenis_kelamin": ["L", "P", "P"],
+            "jenjang": ["S1", "S1", "D3"],
+            "angkatan": [2020, 2021, 2022],
+            "ipk": [3.1, np.nan, 3.5],
+        }).to_csv(tmp_path / "mahasiswa.csv", index=False)
+        return DataLoader(str(tmp_path))
+    
+    def test_roundtrip_with_mmap(self, loader):
+        store = loader.load_column_store("mahasiswa.csv")
+        assert isinstance(store.array("ipk"), np.memmap)
+        df = store.to_frame()
+        assert df["angkatan"].tolist() == [2020, 2021, 2022]
+        assert df["prodi"].cat.categories.tolist() == ["Akuntansi", "Manajemen"]
+        assert pd.isna(df.loc[1, "prodi"])
+        assert store.array("jenjang").dtype == np.int8
+    
+    def test_rebuild_when_source_changes(self, loader):
+        store = loader.load_column_store("mahasiswa.csv")
+        assert store.is_fresh(loader.data_path / "mahasiswa.csv")
+        with open(loader.data_path / "mahasiswa.csv", "a") as f:
+            f.write("4,Biologi,DO,L,S2,2023,2.9\n")
+        assert not store.is_fresh(loader.data_path / "mahasiswa.csv")
+        assert loader.load_column_store("mahasiswa.csv").n_rows == 4
+    
+    def test_rewrite_keeps_open_readers(self, loader):
+        old = loader.load_column_store("mahasiswa.csv")
+        old.manifest
+        with open(loader.data_path / "mahasiswa.csv", "a") as f:
+            f.write("4,Biologi,DO,L,S2,2023,2.9\n")
+        new = loader.load_column_store("mahasiswa.csv")
+        # Pembaca lama tetap pada versinya sendiri; direktori store tidak pernah kosong
+        assert old.path != new.path and old.to_frame()["angkatan"].tolist() == [2020, 2021, 2022]
+        assert new.n_rows == 4 and ColumnStore(old.directory).n_rows == 4
+    
+    def test_concurrent_writers_both_succeed(self, loader):
+        df = loader.load("mahasiswa.csv")
+        directory = loader.column_store_path("mahasiswa.csv")
+        newer = []
+        
+        def write_slow(path):
+            # Penulis lain mulai dan selesai selagi build ini masih berjalan
+            newer.append(versioned.publish(
+                directory, lambda inner: ColumnStore.write(df, inner, ["ipk"], ["prodi"], atomic=False)))
+            ColumnStore.write(df.head(1), path, ["ipk"], ["prodi"], atomic=False)
+        
+        # Kalah balapan tetap berhasil: build yang dimulai lebih akhir yang menjadi CURRENT
+        assert versioned.publish(directory, write_slow) == newer[0] == versioned.current(directory)
+        assert ColumnStore(directory).n_rows == 3
+        assert sorted(p.name for p in directory.iterdir() if not p.name.startswith("v")) == [".lock", "CURRENT"]
+    
+    def test_parallel_publishes_keep_newest_build(self, tmp_path):
+        directory = tmp_path / "store"
+        df = pd.DataFrame({"ipk": [3.0]})
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            published = list(executor.map(
+                lambda _: versioned.publish(directory, lambda path: ColumnStore.write(df, path, ["ipk"], [], atomic=False)),
+                range(16)))
+        # Pointer hanya pernah maju: build yang dimulai paling akhir tetap CURRENT
+        newest = max(published, key=lambda path: versioned._stamp(path.name))
+        assert versioned.current(directory) == newest
+    
+    def test_replaces_flat_store(self, loader):
+        directory = loader.column_store_path("mahasiswa.csv")
+        ColumnStore.write(loader.load("mahasiswa.csv"), directory, ["ipk"], [], atomic=False)
+        store = loader.materialize_column_store("mahasiswa.csv")
+        assert store.path.parent == directory and store.columns[-1] == "jenjang"
+        assert not (directory / "ipk.npy").exists()
@@ -0,0 +1,86 @@
+"""
+Unit tests untuk typed, reloadable configuration module
+"""
+import os
+import sqlite3
+import pandas as pd
+import pytest
+from config import config
+from config.config import CacheConfig, DataConfig, ExportConfig, Setting
+from src.data.loader import DataLoader
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    path = tmp_path / ".env"
+    path.write_text("")
+    for name in ("DATA_SOURCE", "DATA_PATH", "DB_PATH", "EXPORT_MAX_WORKERS", "CACHE_FILTER_PLANS"):
+        monkeypatch.delenv(name, raising=False)
+    original = config.ENV_FILE
+    config.ENV_FILE = str(path)
+    config.reload()
+    yield path
+    config.ENV_FILE = original
+    monkeypatch.undo()
+    config.reload()
+
+def write_env(path, text):
+    path.write_text(text)
+    # mtime dinaikkan eksplisit: resolusi mtime filesystem bisa lebih kasar dari jarak dua tulis
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def test_setting_coerce():
+    workers = Setting("X_WORKERS", 2, int, minimum=1)
+    assert workers.coerce(None) == 2 and workers.coerce(" ") == 2 and workers.coerce(" 4 ") == 4
+    with pytest.raises(ValueError):
+        workers.coerce("0")
+    with pytest.raises(ValueError):
+        workers.coerce("dua")
+    assert Setting("X_FLAG", False, config._bool).coerce("true") is True
+    assert config._data_source("local") == "csv"
+    with pytest.raises(ValueError):
+        config._data_source("kaggle")
+
+def test_reload_from_env_file(env_file, monkeypatch):
+    assert DataConfig.DATA_SOURCE == "csv" and CacheConfig.FILTER_PLANS == 128
+    assert config.reload_if_changed() is False
+
+    write_env(env_file, "DATA_SOURCE=sqlite  # tabel di DB_PATH\nCACHE_FILTER_PLANS=16\nEXPORT_MAX_WORKERS=3\n")
+    generation = config.generation()
+    assert config.reload_if_changed() is True
+    assert (DataConfig.DATA_SOURCE, CacheConfig.FILTER_PLANS, ExportConfig.MAX_WORKERS) == ("sqlite", 16, 3)
+    assert DataConfig.source_path() == config.DatabaseConfig.DB_PATH
+    assert config.generation() == generation + 1
+
+    # Env var proses menang atas .env
+    monkeypatch.setenv("EXPORT_MAX_WORKERS", "5")
+    assert config.reload() == {"ExportConfig.MAX_WORKERS": (3, 5)}
+
+    # Nilai tidak valid: tidak ada yang diterapkan, nilai lama tetap berlaku
+    write_env(env_file, "DATA_SOURCE=csv\nCACHE_FILTER_PLANS=nol\n")
+    assert config.reload_if_changed() is False
+    assert "CACHE_FILTER_PLANS" in config.last_error()
+    assert (DataConfig.DATA_SOURCE, CacheConfig.FILTER_PLANS) == ("sqlite", 16)
+    assert config.generation() == generation + 2
+
+def test_loader_follows_configured_source(env_file, tmp_path):
+    df = pd.DataFrame({"id_mahasiswa": [1, 2], "prodi": [" Fisika", "Kimia "], "ipk": [3.1, 4.4]})
+    df.to_csv(tmp_path / "mahasiswa_simulasi.csv", index=False)
+    db_path = tmp_path / "university.db"
+    with sqlite3.connect(db_path) as conn:
+        df.to_sql("mahasiswa", conn, index=False)
+
+    write_env(env_file, f"DATA_PATH={tmp_path}\nDB_PATH={db_path}\n")
+    config.reload()
+    csv = DataLoader.from_config()
+    assert csv.source == "csv" and csv.source_path("mahasiswa_simulasi.csv") == tmp_path / "mahasiswa_simulasi.csv"
+
+    write_env(env_file, f"DATA_PATH={tmp_path}\nDB_PATH={db_path}\nDATA_SOURCE=sqlite\n")
+    config.reload()
+    sqlite = DataLoader.from_config()
+    assert sqlite.source_path("mahasiswa_simulasi.csv") == db_path
+    pd.testing.assert_frame_equal(sqlite.load("mahasiswa_simulasi.csv"), csv.load("mahasiswa_simulasi.csv"))
+    assert sqlite.load("mahasiswa_simulasi.csv")["prodi"].tolist() == ["Fisika", "Kimia"]
+    assert sqlite.store_name("mahasiswa_simulasi.csv") != csv.store_name("mahasiswa_simulasi.csv")
+    with pytest.raises(ValueError):
+        DataLoader(str(tmp_path), source="sqlite")
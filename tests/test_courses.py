@@ -0,0 +1,76 @@
+"""
+Unit tests untuk course aggregates module
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.courses import CourseAggregates
+
+@pytest.fixture
+def krs():
+    rng = np.random.default_rng(1)
+    n = 500
+    return pd.DataFrame({
+        "id_mahasiswa": rng.integers(0, 60, n).astype(float),
+        "kode_mk": rng.choice(["MK001", "MK002", "MK003", "MK999", None], n),
+        "semester_akademik": rng.choice(["2022/2023 Ganjil", "202/2023 Genap", None], n),
+        "nilai_angka": np.where(rng.random(n) < 0.1, np.nan, rng.uniform(40, 100, n)),
+        "nilai_huruf": rng.choice(["A", "B", "C", "D", "E"], n),
+    })
+
+@pytest.fixture
+def courses():
+    return pd.DataFrame({
+        "kode_mk": ["MK001", "MK002", "MK003", "MK003"],
+        "nama_mk": ["Kalkulus", "Fisika Dasar", "Biokimia", "Duplikat"],
+        "sks": [3.0, 2.0, 3.0, 4.0],
+        "prodi": ["Fisika", "Fisika", "Biologi", "Kimia"],
+    })
+
+def test_course_partials_match_raw(krs, courses):
+    agg = CourseAggregates(krs, courses)
+    assert agg.partials["jumlah_krs"].sum() == len(krs)
+
+    table = agg.courses().set_index("kode_mk")
+    raw = krs[krs["kode_mk"] == "MK001"]["nilai_angka"]
+    assert table.loc["MK001", "jumlah_krs"] == raw.size
+    assert table.loc["MK001", "rata_rata_nilai"] == pytest.approx(raw.mean())
+    assert table.loc["MK001", "std_nilai"] == pytest.approx(raw.std())
+    assert table.loc["MK003", "prodi"] == "Biologi"
+    assert table.loc["MK999", "prodi"] == "Tidak Diketahui"
+
+def test_drill_down(krs, courses):
+    agg = CourseAggregates(krs, courses)
+    fisika = krs["kode_mk"].isin(["MK001", "MK002"])
+    grades = agg.grade_distribution(prodi=["Fisika"])
+    assert grades.to_dict() == krs[fisika]["nilai_huruf"].value_counts().reindex(list("ABCDE"), fill_value=0).to_dict()
+
+    semesters = agg.semesters(kode_mk=["MK002"])
+    assert semesters.index.tolist() == ["2022/2023 Ganjil", "2022/2023 Genap", "Tidak Diketahui"]
+    genap = (krs["kode_mk"] == "MK002") & (krs["semester_akademik"] == "202/2023 Genap")
+    assert semesters.loc["2022/2023 Genap", "jumlah_krs"] == genap.sum()
+
+    load = agg.sks_load(["Fisika"]).set_index("semester")
+    ganjil = krs[fisika & (krs["semester_akademik"] == "2022/2023 Ganjil")]
+    sks = ganjil["kode_mk"].map({"MK001": 3.0, "MK002": 2.0})
+    assert load.loc["2022/2023 Ganjil", "total_sks"] == sks.sum()
+    assert load.loc["2022/2023 Ganjil", "jumlah_mahasiswa"] == ganjil["id_mahasiswa"].nunique()
+
+def test_semester_load_counts_students_once(courses):
+    # Mahasiswa 1 mengambil MK Fisika (MK001) dan Biologi (MK003) di semester yang sama
+    krs = pd.DataFrame({
+        "id_mahasiswa": [1.0, 1.0, 2.0, 3.0],
+        "kode_mk": ["MK001", "MK003", "MK001", "MK003"],
+        "semester_akademik": ["2022/2023 Ganjil"] * 4,
+        "nilai_angka": [80.0, 70.0, 60.0, 90.0],
+        "nilai_huruf": ["A", "B", "C", "A"],
+    })
+    agg = CourseAggregates(krs, courses)
+    assert agg.sks_load()["jumlah_mahasiswa"].sum() == 4
+    total = agg.semester_load().set_index("semester").loc["2022/2023 Ganjil"]
+    assert total["jumlah_mahasiswa"] == 3
+    assert total["total_sks"] == 12.0 and total["sks_per_mahasiswa"] == pytest.approx(4.0)
+    both = agg.semester_load(["Fisika", "Biologi"]).set_index("semester")
+    pd.testing.assert_series_equal(both.loc["2022/2023 Ganjil"], total)
+    fisika = agg.semester_load(["Fisika"]).set_index("semester").loc["2022/2023 Ganjil"]
+    assert fisika["jumlah_mahasiswa"] == 2 and fisika["total_sks"] == 6.0
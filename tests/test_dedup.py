@@ -0,0 +1,42 @@
+"""
+Unit tests untuk hash-based deduplication module
+"""
+import pandas as pd
+import pytest
+from src.data.dedup import Deduplicator
+
+class TestDeduplicator:
+    """Test cases untuk Deduplicator class"""
+    
+    @pytest.fixture
+    def df(self):
+        return pd.DataFrame({
+            "no_rawat": ["A1", "A2", "A1", "A3"],
+            "nm_poli": ["Umum", "Gigi", "Umum", "Gigi"],
+            "status": ["Sudah", "Gagal", "Sudah", "Sudah"],
+        })
+    
+    def test_matches_pandas_duplicated(self, df):
+        dedup = Deduplicator(df, subsets={"no_rawat": ["no_rawat"]})
+        assert dedup.duplicated().tolist() == df.duplicated().tolist()
+        assert dedup.duplicated("no_rawat", keep=False).tolist() == df.duplicated(subset=["no_rawat"], keep=False).tolist()
+    
+    def test_duplicated_on_row_subset(self, df):
+        dedup = Deduplicator(df)
+        assert dedup.duplicated(rows=[2, 3]).tolist() == [False, False]
+    
+    def test_incremental_append(self, df):
+        dedup = Deduplicator(df, subsets={"no_rawat": ["no_rawat"]})
+        batch = pd.DataFrame({
+            "no_rawat": ["A3", "A4", "A4"],
+            "nm_poli": ["Gigi", "Anak", "Anak"],
+            "status": ["Gagal", "Sudah", "Sudah"],
+        })
+        masks = dedup.append(batch)
+        assert masks["row"].tolist() == [False, False, True]
+        assert masks["no_rawat"].tolist() == [True, False, True]
+        assert len(dedup) == 7
+    
+    def test_unknown_key(self, df):
+        with pytest.raises(KeyError):
+            Deduplicator(df).duplicated("nik")
@@ -0,0 +1,85 @@
+"""
+Unit tests untuk dropout risk pipeline dan precomputed scores
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.cohort import CohortMatrix
+from src.models.dropout import (
+    build_features,
+    build_labels,
+    load_model,
+    save_model,
+    save_scores,
+    score_students,
+    train_model,
+)
+from src.models.scores import LEVEL_COLUMN, SCORE_COLUMN, attach_scores, load_scores
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    n = 400
+    students = pd.DataFrame({
+        "id_mahasiswa": np.arange(n),
+        "kampus": "Kampus A",
+        "prodi": rng.choice(["Biologi", "Fisika"], n),
+        "angkatan": rng.choice([2021, 2022], n),
+        "status": rng.choice(["LULUS", "DO", "AKTIF"], n),
+        "jalur_masuk": rng.choice(["Mandiri", "Beasiswa", None], n),
+        "jenjang": "S1",
+        "jenis_kelamin": rng.choice(["L", "P"], n),
+        "ipk": rng.uniform(2.0, 4.0, n),
+    })
+    krs = pd.DataFrame({
+        "id_mahasiswa": rng.integers(0, n, 3000).astype(float),
+        "semester_akademik": rng.choice(["2021/2022 Ganjil", "2022/2023 Genap", "2023/2024 Ganjil"], 3000),
+        "nilai_angka": rng.uniform(30, 100, 3000),
+        "nilai_huruf": rng.choice(["A", "B", "C", "D", "E"], 3000),
+    })
+    return CohortMatrix(students, krs), krs
+
+def test_features_and_labels(data):
+    cohort, krs = data
+    features = build_features(cohort, krs)
+    assert len(features) == len(cohort)
+    # Hanya KRS tahun pertama (Ganjil/Genap angkatan) yang menjadi fitur
+    angkatan = cohort.students.set_index("id_mahasiswa")["angkatan"].reindex(krs["id_mahasiswa"]).to_numpy()
+    early = krs["semester_akademik"].str[:4].astype(int).to_numpy() == angkatan
+    assert features["jumlah_krs"].sum() == early.sum() < len(krs)
+    assert features["jalur_masuk"].notna().all()
+    first = krs[early & (krs["id_mahasiswa"] == 0).to_numpy()]
+    assert features.loc[0, "nilai_rata_rata"] == pytest.approx(first["nilai_angka"].mean())
+    # KRS setelah jendela fitur (penentu label terlambat lulus) tidak mengubah fitur apa pun
+    pd.testing.assert_frame_equal(build_features(cohort, krs[early]), features)
+
+    labels = build_labels(cohort)
+    status = cohort.students["status"]
+    assert labels[status == "AKTIF"].isna().all()
+    assert (labels[status == "DO"] == 1).all()
+
+def test_train_score_and_persist(data, tmp_path):
+    cohort, krs = data
+    features = build_features(cohort, krs)
+    pipeline, metrics = train_model(features, build_labels(cohort))
+    assert 0.0 <= metrics["roc_auc"] <= 1.0
+
+    serial = score_students(pipeline, features, batch_size=128)
+    parallel = score_students(pipeline, features, batch_size=128, n_jobs=2)
+    np.testing.assert_allclose(serial, parallel)
+    np.testing.assert_allclose(serial, pipeline.predict_proba(features)[:, 1])
+
+    save_model(pipeline, tmp_path, metrics)
+    restored = load_model(tmp_path)
+    np.testing.assert_allclose(score_students(restored["pipeline"], features), serial)
+
+    save_scores(cohort, serial, tmp_path)
+    scores = load_scores(tmp_path)
+    table = attach_scores(cohort.students.iloc[::-1], scores)
+    assert table[SCORE_COLUMN].to_numpy() == pytest.approx(serial.iloc[::-1].round(4).to_numpy())
+    assert set(table[LEVEL_COLUMN].dropna()) <= {"Rendah", "Sedang", "Tinggi"}
+
+def test_missing_scores_are_optional(tmp_path):
+    df = pd.DataFrame({"id_mahasiswa": [1, 2]})
+    assert load_scores(tmp_path) is None
+    assert attach_scores(df, None) is df
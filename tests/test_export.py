@@ -0,0 +1,77 @@
+"""
+Unit tests untuk export service module
+"""
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.export import ExportService, available_formats, export_key, write_csv, write_parquet
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(4)
+    n = 1050
+    return pd.DataFrame({
+        "id_mahasiswa": np.arange(n),
+        "prodi": pd.Categorical(rng.choice(["Biologi", "Fisika", None], n)),
+        "ipk": np.where(rng.random(n) < 0.1, np.nan, rng.uniform(2, 4, n)),
+        "tanggal": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 90, n), unit="D"),
+    })
+
+def test_chunked_writers_match_whole_frame(df, tmp_path):
+    write_csv(df, tmp_path / "data.csv", chunk_rows=100)
+    assert (tmp_path / "data.csv").read_text() == df.to_csv(index=False)
+    write_csv(df.iloc[:0], tmp_path / "empty.csv", chunk_rows=100)
+    assert (tmp_path / "empty.csv").read_text() == df.iloc[:0].to_csv(index=False)
+
+    if "parquet" in available_formats():
+        write_parquet(df, tmp_path / "data.parquet", chunk_rows=100)
+        pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / "data.parquet"), df, check_dtype=False,
+                                      check_categorical=False)
+
+def test_exports_cached_per_version_and_state(df, tmp_path):
+    service = ExportService(str(tmp_path), chunk_rows=200)
+    state = {"prodi": ["Fisika"], "rentang": (pd.Timestamp("2024-01-01").date(), None)}
+    assert service.find("mahasiswa", "csv", "v1", state) is None
+
+    path = service.table(df, "mahasiswa", "csv", "v1", state).result(timeout=30)
+    assert pd.read_csv(path).shape == df.shape
+    mtime = path.stat().st_mtime_ns
+    # State sama (urutan kunci berbeda): file yang sama, tanpa ditulis ulang
+    again = service.table(df, "mahasiswa", "csv", "v1", dict(reversed(list(state.items()))))
+    assert again.done() and again.result() == path
+    assert path.stat().st_mtime_ns >= mtime and service.find("mahasiswa", "csv", "v1", state).done()
+
+    assert service.path("mahasiswa", "csv", "v2", state) != path
+    assert export_key("v1", {"prodi": ["Kimia"]}) != export_key("v1", {"prodi": ["Fisika"]})
+    with pytest.raises(ValueError):
+        service.table(df, "mahasiswa", "json", "v1", state)
+    service.shutdown()
+
+def test_reports_and_eviction(df, tmp_path):
+    service = ExportService(str(tmp_path), max_files=2)
+    charts = {"Mahasiswa per prodi": df["prodi"].value_counts()}
+    png = service.report("laporan", "png", "v1", {}, "Laporan", {"Total": len(df)}, charts).result(timeout=60)
+    pdf = service.report("laporan", "pdf", "v1", {}, "Laporan", {"Total": len(df)}, charts).result(timeout=60)
+    assert png.read_bytes()[:4] == b"\x89PNG" and pdf.read_bytes()[:4] == b"%PDF"
+
+    service.table(df, "mahasiswa", "csv", "v1", {}).result(timeout=30)
+    assert len(list(tmp_path.iterdir())) == 2
+    service.shutdown()
+
+def test_eviction_skips_files_removed_concurrently(tmp_path, monkeypatch):
+    service = ExportService(str(tmp_path), max_files=1)
+    for name in ["a.csv", "b.csv", "c.csv"]:
+        (tmp_path / name).write_text(name)
+    # Worker lain menghapus a.csv tepat setelah file itu terlihat
+    is_file = Path.is_file
+    
+    def is_file_then_removed(path):
+        found = is_file(path)
+        if path.name == "a.csv":
+            path.unlink(missing_ok=True)
+        return found
+    monkeypatch.setattr(Path, "is_file", is_file_then_removed)
+    service._evict()
+    assert len(list(tmp_path.iterdir())) == 1
+    service.shutdown()
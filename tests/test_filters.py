@@ -0,0 +1,89 @@
+"""
+Unit tests untuk declarative filter module
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.filters import (And, Between, DateIn, Eq, FilterEngine, In, PandasBackend,
+                              SqliteBackend, build_engine, default_backends)
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(5)
+    n = 400
+    tanggal = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 20 * 24, n), unit="h")
+    return pd.DataFrame({
+        "angkatan": rng.choice([2021, 2022, 2023], n),
+        "prodi": rng.choice(["Biologi", "Fisika", "Kimia", None], n),
+        "status": pd.Categorical(rng.choice(["AKTIF", "LULUS", "DO", None], n)),
+        "ipk": rng.uniform(2, 4, n),
+        "tgl_registrasi": pd.Series(tanggal).where(rng.random(n) > 0.05),
+    })
+
+def states():
+    day = pd.Timestamp("2024-01-05")
+    return [
+        And(),
+        And(Eq("angkatan", 2022)),
+        And(In("prodi", ["Fisika", "Kimia"]), In("status", ["AKTIF"])),
+        And(Between("tgl_registrasi", day, day + pd.Timedelta(days=4)), In("prodi", ["Biologi"])),
+        And(DateIn("tgl_registrasi", [day.date(), pd.Timestamp("2024-01-12").date()]), Eq("angkatan", 2021)),
+        And(Between("ipk", 3.0, None), In("status", ["DO", "Tidak Ada"])),
+        # Nilai kosong yang dipilih (mis. default multiselect = unique() termasuk NaN)
+        And(In("prodi", ["Fisika", np.nan]), In("status", ["AKTIF", np.nan])),
+        And(In("prodi", [None]), Eq("status", "DO")),
+    ]
+
+def test_strategies_match_pandas(df):
+    engine = FilterEngine(df)
+    for state in states():
+        expected = state.mask(df)
+        plan = engine.compile(state)
+        assert np.array_equal(plan.mask(), expected), state
+        assert len(plan.apply()) == expected.sum()
+
+    plan = engine.compile(And(In("prodi", ["Fisika"]), Between("ipk", 3.0, 3.5)))
+    assert plan.strategy == "category_codes + pandas"
+    assert plan.explain()["strategi"].tolist() == ["category_codes", "pandas"]
+    assert engine.compile(And()).strategy == "all"
+    # Tanpa filter: salinan dangkal, mengubahnya tidak mengubah tabel bersama engine
+    unfiltered = engine.compile(And()).apply()
+    unfiltered.fillna({"prodi": "Unknown"}, inplace=True)
+    assert unfiltered is not df and df["prodi"].isna().any()
+
+def test_plan_cached_per_state(df):
+    engine = FilterEngine(df)
+    plan = engine.compile(And(In("prodi", ["Fisika", "Kimia"]), Eq("angkatan", 2022)))
+    assert engine.compile(And(Eq("angkatan", 2022), In("prodi", ["Kimia", "Fisika"]))) is plan
+    assert engine.compile(Eq("angkatan", 2022)) is engine.compile(And(Eq("angkatan", 2022)))
+
+def test_sqlite_pushdown(df, tmp_path):
+    path = str(tmp_path / "university.db")
+    sqlite = SqliteBackend.write(df, path, "mahasiswa", index_columns=["prodi", "tgl_registrasi"])
+    engine = FilterEngine(df, [sqlite, PandasBackend(df)])
+    for state in states():
+        plan = engine.compile(state)
+        assert np.array_equal(plan.mask(), state.mask(df)), state
+        assert plan.strategy in ("sqlite", "all")
+
+    assert SqliteBackend.open(path, "mahasiswa", df) is not None
+    assert SqliteBackend.open(path, "mahasiswa", df.iloc[1:]) is None
+    assert SqliteBackend.open(str(tmp_path / "missing.db"), "mahasiswa", df) is None
+    # Kode kategori tetap lebih murah dari SQLite untuk kolom berkode
+    engine = FilterEngine(df, default_backends(df) + [sqlite])
+    assert engine.compile(And(In("prodi", ["Fisika"]), Between("ipk", 3.0, None))).strategy == \
+        "category_codes + sqlite"
+
+def test_build_engine_writes_copy_beside_source(df, tmp_path):
+    import sqlite3
+    path = str(tmp_path / "university.db")
+    source = pd.DataFrame({"prodi": ["Fisika"], "ipk": [3.0]})
+    with sqlite3.connect(path) as conn:
+        source.to_sql("mahasiswa", conn, index=False)
+    
+    engine = build_engine(df, path, "mahasiswa", index_columns=["prodi"])
+    assert engine.compile(Between("ipk", 3.0, None)).strategy == "sqlite"
+    # Tabel sumber (DATA_SOURCE=sqlite) tidak tersentuh; salinan berikutnya dipakai ulang
+    with sqlite3.connect(path) as conn:
+        pd.testing.assert_frame_equal(pd.read_sql_query("SELECT * FROM mahasiswa", conn), source)
+    assert SqliteBackend.open(path, "mahasiswa", df).table == "_filter_mahasiswa"
@@ -0,0 +1,38 @@
+"""
+Unit tests untuk paginated grid index module
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.grid import GridIndex
+
+@pytest.fixture
+def index():
+    return GridIndex(pd.DataFrame({
+        "nm_pasien": ["B", "A", None, "C", "A", "B"],
+        "umur": [30, 20, None, 50, 40, 10],
+    }))
+
+def test_sorting_matches_pandas(index):
+    for ascending in (True, False):
+        for column in ("nm_pasien", "umur"):
+            expected = index.df.sort_values(column, ascending=ascending, kind="stable").index.to_numpy()
+            np.testing.assert_array_equal(index.permutation(column, ascending), expected)
+
+def test_page_of_filtered_rows(index):
+    rows = np.array([5, 0, 1, 3])
+    first = index.page(rows, sort_by="umur", page=1, page_size=3)
+    assert first.positions.tolist() == [5, 1, 0]
+    assert (first.total_rows, first.total_pages, first.first_row, first.last_row) == (4, 2, 1, 3)
+    
+    last = index.page(rows, sort_by="umur", page=99, page_size=3)
+    assert last.page == 2 and last.positions.tolist() == [3]
+    assert index.page(rows, page=1, page_size=2).positions.tolist() == [0, 1]
+
+def test_frame_reads_from_source_view(index):
+    view = index.df[index.df["umur"] > 15].fillna({"nm_pasien": "Unknown"})
+    page = index.page(index.positions(view.index), sort_by="nm_pasien", page_size=10)
+    frame = index.frame(page, ["nm_pasien"], source=view)
+    assert frame["nm_pasien"].tolist() == ["A", "A", "B", "C"]
+    with pytest.raises(KeyError):
+        index.permutation("missing")
@@ -0,0 +1,53 @@
+"""
+Import-time budget tests untuk entry point dashboard
+"""
+import ast
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Library berat yang hanya boleh dimuat saat benar-benar dipakai
+HEAVY_MODULES = {"matplotlib", "seaborn", "sklearn", "joblib", "plotly.express"}
+
+# Batas total waktu import (self time) modul milik project, dalam detik
+PROJECT_IMPORT_BUDGET = 0.3
+
+
+def import_times(module):
+    """Run `python -X importtime` and return {module: (self_us, cumulative_us)}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+@pytest.mark.parametrize("path", ["streamlit_app.py", "dashboard.py", "src/dashboard/common.py"])
+def test_entry_points_have_no_heavy_top_level_imports(path):
+    tree = ast.parse((ROOT / path).read_text(encoding="utf-8"))
+    imported = set()
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            imported.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            imported.add(node.module)
+    heavy = {name for name in imported if any(name == m or name.startswith(m + ".") for m in HEAVY_MODULES)}
+    assert not heavy, f"{path} imports heavy modules at top level: {sorted(heavy)}"
+
+
+def test_dashboard_package_import_budget():
+    times = import_times("src.dashboard.common")
+    loaded_heavy = HEAVY_MODULES & set(times)
+    assert not loaded_heavy, f"Heavy modules imported eagerly: {sorted(loaded_heavy)}"
+    project_self_s = sum(self_us for name, (self_us, _) in times.items()
+                         if name.split(".")[0] in ("src", "config")) / 1e6
+    assert project_self_s < PROJECT_IMPORT_BUDGET
@@ -0,0 +1,41 @@
+"""
+Unit tests untuk instrumentation module
+"""
+import json
+import pandas as pd
+from src.utils.instrumentation import Instrumentation
+
+class TestInstrumentation:
+    """Test cases untuk Instrumentation class"""
+    
+    def test_disabled_records_nothing(self):
+        instr = Instrumentation(enabled=False)
+        with instr.stage("load_data") as stage:
+            stage.rows_out = 10
+        assert instr.records() == []
+    
+    def test_stage_and_decorator(self):
+        instr = Instrumentation(enabled=True)
+        run_id = instr.begin_run()
+        
+        @instr.timed("filter_status")
+        def keep_active(df):
+            return df[df["status"] == "AKTIF"]
+        
+        keep_active(pd.DataFrame({"status": ["AKTIF", "LULUS", "AKTIF"]}))
+        summary = instr.summary()
+        assert summary["stage"].tolist() == ["filter_status"]
+        assert summary.loc[0, "rows_in"] == 3
+        assert summary.loc[0, "rows_out"] == 2
+        assert summary.loc[0, "run_id"] == run_id
+    
+    def test_ring_buffer_and_exports(self):
+        instr = Instrumentation(enabled=True, capacity=2)
+        for name in ["load_data", "filter", "chart"]:
+            with instr.stage(name, rows_in=5):
+                pass
+        assert [r.stage for r in instr.records()] == ["filter", "chart"]
+        assert len(json.loads(instr.to_json())) == 2
+        prometheus = instr.to_prometheus()
+        assert 'dashboard_stage_seconds_count{stage="chart"} 1' in prometheus
+        assert 'dashboard_stage_rows{stage="filter"} 5' in prometheus
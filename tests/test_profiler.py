@@ -0,0 +1,64 @@
+"""
+Unit tests untuk data quality profiler module
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from config.config import CleaningConfig
+from src.data.cleaning import clean_table
+from src.data.dataset import prepare_table
+from src.data.profiler import TABLE_RULES, DataProfiler
+
+class TestDataProfiler:
+    """Test cases untuk DataProfiler class"""
+    
+    @pytest.fixture
+    def profiler(self):
+        return DataProfiler()
+    
+    def test_mahasiswa_anomalies(self, profiler):
+        df = pd.DataFrame({
+            "prodi": ["Manajemen", " Manajemen ", "Akuntansi", "Akuntansi"],
+            "ipk": [3.2, 0.5, 4.6, 4.6],
+        })
+        report = profiler.profile(df, "mahasiswa")
+        assert report.mask("ipk_out_of_range").tolist() == [False, True, True, True]
+        assert report.mask("prodi_padded").tolist() == [False, True, False, False]
+        assert report.mask("duplicate").tolist() == [False, False, False, True]
+        assert report.counts["ipk_out_of_range"] == 3
+    
+    def test_krs_semester_and_nilai(self, profiler):
+        df = pd.DataFrame({
+            "semester_akademik": ["202/2023 Ganjil", "2022/2023 Genap", np.nan, "2022/2024 Ganjil"],
+            "nilai_angka": [80.0, 120.0, 70.0, np.nan],
+        })
+        report = profiler.profile(df, "krs")
+        assert report.mask("semester_akademik_invalid_format").tolist() == [True, False, False, True]
+        assert report.mask("nilai_angka_out_of_range").tolist() == [False, True, False, False]
+        assert report.flagged(["missing"]).tolist() == [False, False, True, True]
+    
+    def test_unknown_table(self, profiler):
+        with pytest.raises(ValueError):
+            profiler.profile(pd.DataFrame(), "unknown")
+    
+    def test_cleaned_rows_stay_flagged(self, profiler):
+        raw = pd.DataFrame({
+            "prodi": ["Manajemen", " Manajemen ", "Akuntansi", "Akuntansi", "Akuntansi"],
+            "ipk": [3.2, 0.5, 4.6, 4.6, 3.0],
+        })
+        cleaned = clean_table(raw, CleaningConfig.RULES["mahasiswa"])
+        assert cleaned["ipk"].between(1.0, 4.0).all()
+        report = profiler.profile(cleaned, "mahasiswa", cleaned.attrs["cleaning_rows"])
+        expected = profiler.profile(raw, "mahasiswa")
+        for check in ["ipk_out_of_range", "prodi_padded"]:
+            assert report.mask(check).tolist() == expected.mask(check).tolist()
+        # Setelah deduplikasi bitset tetap sejajar dengan baris yang tersisa
+        deduped = prepare_table(cleaned)
+        report = profiler.profile(deduped, "mahasiswa", deduped.attrs["cleaning_rows"])
+        assert report.flagged(["ipk_out_of_range", "prodi_padded"]).tolist() == [False, True, True, False]
+    
+    def test_clamp_bounds_match_quality_rules(self):
+        for table, rules in CleaningConfig.RULES.items():
+            for col, bounds in rules.get("clamp", {}).items():
+                checked = TABLE_RULES[table]["ranges"].get(col) or TABLE_RULES[table]["allowed"][col]
+                assert (min(bounds), max(bounds)) == (min(checked), max(checked))
@@ -0,0 +1,30 @@
+"""
+Unit tests untuk per-rerun profiling module
+"""
+import json
+import pytest
+from src.utils import profiling
+from src.utils.profiling import RerunProfiler
+
+class TestRerunProfiler:
+    """Test cases untuk RerunProfiler class"""
+    
+    @pytest.fixture
+    def profiler(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(profiling, "SamplingProfiler", None)
+        return RerunProfiler(str(tmp_path), keep=2)
+    
+    def test_trace_saved_with_state(self, profiler):
+        trace = profiler.start()
+        sum(range(1000))
+        meta_file = profiler.stop(trace, {"filters": {"prodi": ["Manajemen"]}})
+        meta = json.loads(meta_file.read_text())
+        assert meta["state"]["filters"]["prodi"] == ["Manajemen"]
+        assert (profiler.trace_dir / meta["trace_file"]).exists()
+        assert "cumulative" in RerunProfiler.top_functions(str(profiler.trace_dir / meta["trace_file"]))
+    
+    def test_keeps_last_n_traces(self, profiler):
+        for _ in range(3):
+            profiler.stop(profiler.start())
+        assert len(profiler.traces()) == 2
+        assert len(list(profiler.trace_dir.iterdir())) == 4
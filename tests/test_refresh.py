@@ -0,0 +1,61 @@
+"""
+Unit tests untuk background data refresh module
+"""
+import os
+import pandas as pd
+import pytest
+from src.data.refresh import DataRefresher
+
+def build(data_path):
+    df = pd.read_csv(data_path / "mahasiswa.csv")
+    return df, {"total": len(df)}
+
+class TestDataRefresher:
+    """Test cases untuk DataRefresher class"""
+    
+    @pytest.fixture
+    def refresher(self, tmp_path):
+        pd.DataFrame({"ipk": [3.0, 3.5]}).to_csv(tmp_path / "mahasiswa.csv", index=False)
+        return DataRefresher(str(tmp_path), build, interval=3600)
+    
+    def test_refresh_swaps_snapshot_on_change(self, refresher):
+        refresher.refresh()
+        first = refresher.snapshot
+        assert first["total"] == 2
+        assert refresher.refresh() is False
+        
+        path = refresher.data_path / "mahasiswa.csv"
+        pd.DataFrame({"ipk": [3.0, 3.5, 2.9]}).to_csv(path, index=False)
+        os.utime(path, ns=(0, 1))
+        assert refresher.refresh() is True
+        assert refresher.snapshot.version == first.version + 1
+        assert refresher.snapshot["total"] == 3
+        assert first["total"] == 2
+    
+    def test_failed_build_keeps_old_snapshot(self, refresher):
+        refresher.refresh()
+        (refresher.data_path / "mahasiswa.csv").write_text("")
+        assert refresher.refresh() is False
+        assert refresher.snapshot["total"] == 2
+        assert refresher.last_error is not None
+    
+    def test_snapshot_is_immutable(self, refresher):
+        refresher.start()
+        refresher.stop()
+        with pytest.raises(AttributeError):
+            refresher.snapshot.data = pd.DataFrame()
+    
+    def test_key_and_configure(self, refresher, tmp_path_factory):
+        settings = {"generation": 0}
+        refresher.key = lambda: settings["generation"]
+        refresher.refresh()
+        assert refresher.refresh() is False
+        settings["generation"] = 1
+        assert refresher.refresh() is True
+        
+        other = tmp_path_factory.mktemp("other")
+        pd.DataFrame({"ipk": [2.5]}).to_csv(other / "mahasiswa.csv", index=False)
+        refresher.configure(str(other), interval=60)
+        assert refresher.interval == 60
+        assert refresher.refresh() is True
+        assert refresher.snapshot["total"] == 1
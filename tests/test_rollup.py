@@ -0,0 +1,53 @@
+"""
+Unit tests untuk time-series rollup module
+"""
+import pandas as pd
+import pytest
+from src.data.rollup import RollupStore, seconds_of_day
+
+@pytest.fixture
+def registrations():
+    return pd.DataFrame({
+        "tgl_registrasi": pd.to_datetime(["2025-10-01", "2025-10-01", "2025-10-02", "2025-10-03", None]),
+        "jam_reg": pd.to_timedelta(["08:05:00", "08:15:30", "09:00:00", None, "07:00:00"]),
+        "nm_poli": ["Poli THT", "Poli Mata", "Poli THT", "Poli THT", "Poli Mata"],
+        "status": ["Sudah", "Gagal", "Sudah", "Belum", "Sudah"],
+    })
+
+def test_grains_count_rows_with_a_bucket(registrations):
+    rollup = RollupStore()
+    rollup.append(registrations)
+    
+    assert rollup.table("day")["count"].sum() == 4
+    hours = rollup.table("hour").groupby("bucket")["count"].sum()
+    assert hours.to_dict() == {8 * 3600: 2, 9 * 3600: 1}
+    slots = rollup.table("10min")["bucket"].tolist()
+    assert slots == [8 * 3600, 8 * 3600 + 600, 9 * 3600]
+
+def test_slice_by_date_and_dimension(registrations):
+    rollup = RollupStore()
+    rollup.append(registrations)
+    
+    assert rollup.slice("day", "2025-10-01", "2025-10-01")["count"].sum() == 2
+    assert rollup.slice("day", "2025-10-02", None, nm_poli=["Poli THT"])["count"].sum() == 2
+    assert rollup.slice("day", status=[])["count"].sum() == 4
+    with pytest.raises(KeyError):
+        rollup.slice("day", umur=[1])
+    with pytest.raises(KeyError):
+        rollup.slice("minute")
+
+def test_incremental_update_matches_full_build(registrations):
+    incremental = RollupStore()
+    incremental.append(registrations.iloc[:2])
+    assert incremental.update(registrations.iloc[:4]) == 2
+    assert incremental.update(registrations.iloc[:4]) == 0
+    
+    full = RollupStore()
+    full.append(registrations.iloc[:4])
+    for grain in ("day", "hour", "10min"):
+        pd.testing.assert_frame_equal(incremental.table(grain), full.table(grain))
+
+def test_seconds_of_day_rejects_time_objects():
+    with pytest.raises(TypeError):
+        seconds_of_day(pd.Series(["08:00:00"], dtype=object))
+    assert seconds_of_day(pd.to_timedelta(pd.Series(["00:10:05"]))).tolist() == [605]
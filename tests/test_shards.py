@@ -0,0 +1,66 @@
+"""
+Unit tests untuk campus shard store module
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.aggregates import campus_summaries
+from src.data.loader import DataLoader
+from src.data.shards import UNKNOWN_CAMPUS
+
+@pytest.fixture
+def mahasiswa():
+    rng = np.random.default_rng(2)
+    n = 600
+    return pd.DataFrame({
+        "id_mahasiswa": np.arange(n),
+        "kampus": rng.choice(["Kampus A", "Kampus B", "Kampus C", None], n, p=[0.4, 0.3, 0.2, 0.1]),
+        "prodi": rng.choice(["Biologi", "Fisika", "Kimia"], n),
+        "angkatan": rng.choice([2021, 2022], n),
+        "status": rng.choice(["AKTIF", "LULUS", "DO", None], n),
+        "jalur_masuk": rng.choice(["Mandiri", "Beasiswa"], n),
+        "jenjang": rng.choice(["S1", "S2"], n),
+        "ipk": np.where(rng.random(n) < 0.1, np.nan, rng.uniform(2, 4, n)),
+    })
+
+@pytest.fixture
+def loader(tmp_path, mahasiswa):
+    mahasiswa.to_csv(tmp_path / "mahasiswa.csv", index=False)
+    return DataLoader(str(tmp_path))
+
+def test_single_campus_reads_one_shard(loader, mahasiswa):
+    shards = loader.load_sharded("mahasiswa.csv")
+    assert shards.campuses == ["Kampus A", "Kampus B", "Kampus C", UNKNOWN_CAMPUS]
+    part = shards.load("Kampus B")
+    assert len(part) == (mahasiswa["kampus"] == "Kampus B").sum()
+    assert set(part["kampus"].astype(str)) == {"Kampus B"}
+    assert shards.aggregates(["Kampus B"])["status_dist"]["kampus"].unique().tolist() == ["Kampus B"]
+
+def test_merged_shards_match_whole_table(loader, mahasiswa):
+    merged = loader.load_sharded("mahasiswa.csv").aggregates(max_workers=4)
+    expected_ipk = mahasiswa.groupby(["kampus", "jenjang"]).agg(
+        jumlah_mhs=("id_mahasiswa", "count"), rata2_ipk=("ipk", "mean")).reset_index()
+    pd.testing.assert_frame_equal(merged["ipk_summary"], expected_ipk, check_dtype=False)
+    expected_status = mahasiswa.groupby(["kampus", "status"]).size().reset_index(name="jumlah")
+    pd.testing.assert_frame_equal(merged["status_dist"], expected_status, check_dtype=False)
+    for name, whole in campus_summaries(mahasiswa).items():
+        pd.testing.assert_frame_equal(merged[name], whole, check_dtype=False)
+
+def test_rebuild_when_source_changes(loader):
+    shards = loader.load_sharded("mahasiswa.csv")
+    with open(loader.data_path / "mahasiswa.csv", "a") as f:
+        f.write("999,Kampus D,Biologi,2022,AKTIF,Mandiri,S1,3.0\n")
+    assert not shards.is_fresh(loader.data_path / "mahasiswa.csv")
+    assert "Kampus D" in loader.load_sharded("mahasiswa.csv").campuses
+
+def test_cached_reader_follows_new_versions(loader):
+    reader = loader.load_sharded("mahasiswa.csv")
+    reader.aggregates()
+    for kampus in ["Kampus D", "Kampus E"]:
+        with open(loader.data_path / "mahasiswa.csv", "a") as f:
+            f.write(f"999,{kampus},Biologi,2022,AKTIF,Mandiri,S1,3.0\n")
+        loader.load_sharded("mahasiswa.csv")
+    # Versi pertama sudah dihapus; pembaca lama membaca versi terbaru, bukan FileNotFoundError
+    assert "Kampus E" in reader.campuses
+    status = reader.aggregates()["status_dist"]
+    assert status.loc[status["kampus"] == "Kampus E", "jumlah"].sum() == 1
@@ -0,0 +1,75 @@
+"""
+Unit tests untuk HyperLogLog / t-digest sketch module
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.sketches import HyperLogLog, SketchIndex, TDigest
+
+def test_hyperloglog_estimate_and_merge():
+    left = HyperLogLog().add(pd.Series(np.arange(0, 60000)))
+    right = HyperLogLog().add(pd.Series(np.arange(40000, 100000)))
+    assert left.count() == pytest.approx(60000, rel=0.05)
+    assert left.merge(right).count() == pytest.approx(100000, rel=0.05)
+    assert HyperLogLog().add(pd.Series(["a", "b", "a", None])).count() == pytest.approx(2, abs=0.1)
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(precision=10))
+
+def test_tdigest_quantiles_and_merge():
+    values = np.random.default_rng(0).normal(size=50000)
+    digest = TDigest().add(pd.Series(values[:25000])).merge(TDigest().add(pd.Series(values[25000:])))
+    assert digest.count == 50000
+    assert len(digest.means) <= 100
+    np.testing.assert_allclose(digest.quantile([0.1, 0.5, 0.9]), np.quantile(values, [0.1, 0.5, 0.9]), atol=0.05)
+    assert digest.quantile([0.0, 1.0]).tolist() == [values.min(), values.max()]
+
+@pytest.fixture
+def visits():
+    rng = np.random.default_rng(1)
+    n = 3000
+    return pd.DataFrame({
+        "tgl_registrasi": pd.Timestamp("2025-10-01") + pd.to_timedelta(rng.integers(0, 10, n), unit="D"),
+        "nm_poli": rng.choice(["Poli THT", "Poli Mata"], n),
+        "status": rng.choice(["Sudah", "Gagal"], n),
+        "nm_pasien": [f"PASIEN {i}" for i in rng.integers(0, 800, n)],
+        "umur": rng.integers(1, 90, n).astype(float),
+    })
+
+def test_sketch_index_matches_exact_under_filter(visits):
+    index = SketchIndex(["nm_pasien"], ["umur"])
+    index.append(visits.iloc[:1000])
+    index.append(visits.iloc[1000:])
+    
+    mask = (visits["tgl_registrasi"] <= "2025-10-05") & (visits["status"] == "Sudah")
+    exact = visits[mask]
+    assert index.nunique("nm_pasien", None, "2025-10-05", status=["Sudah"]) == \
+        pytest.approx(exact["nm_pasien"].nunique(), rel=0.05)
+    
+    quartiles = index.quantiles("umur", [0.0, 0.5, 1.0], None, "2025-10-05", status=["Sudah"])
+    assert quartiles[0.0] == exact["umur"].min() and quartiles[1.0] == exact["umur"].max()
+    assert quartiles[0.5] == pytest.approx(exact["umur"].median(), abs=2)
+
+def test_sketch_index_unknown_column(visits):
+    index = SketchIndex(["nm_pasien"])
+    index.append(visits)
+    with pytest.raises(KeyError):
+        index.nunique("umur")
+    with pytest.raises(KeyError):
+        index.quantiles("umur", [0.5])
+
+def test_sketch_index_dense_partitions_without_dates(visits):
+    visits = visits.assign(status=visits["status"].where(visits.index % 7 != 0))
+    index = SketchIndex(["nm_pasien"], ["umur"], date_column=None, precision=10)
+    # Batch pertama hanya Poli THT: partisi Poli Mata baru muncul di batch kedua
+    batches = [visits.iloc[:500][visits["nm_poli"].iloc[:500] == "Poli THT"], visits.iloc[500:]]
+    for batch in batches:
+        index.append(batch)
+    assert index.n_partitions == 6
+    assert index._registers["nm_pasien"].shape == (6, 1 << 10)
+    
+    appended = pd.concat(batches)
+    exact = appended[(appended["nm_poli"] == "Poli Mata") & appended["status"].isna()]
+    assert index.nunique("nm_pasien", nm_poli=["Poli Mata"], status=[None]) == \
+        pytest.approx(exact["nm_pasien"].nunique(), rel=0.05)
+    assert index.quantiles("umur", [1.0], nm_poli=["Poli Mata"], status=[None])[1.0] == exact["umur"].max()
+    assert index.nunique("nm_pasien", nm_poli=["Poli Gigi"]) == 0
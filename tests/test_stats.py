@@ -0,0 +1,46 @@
+"""
+Unit tests untuk descriptive statistics engine
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.stats import StatsIndex
+
+@pytest.fixture
+def visits():
+    rng = np.random.default_rng(0)
+    n = 2000
+    df = pd.DataFrame({
+        "tgl_registrasi": pd.Timestamp("2025-10-01") + pd.to_timedelta(rng.integers(0, 10, n), unit="D"),
+        "nm_poli": rng.choice(["Poli THT", "Poli Mata"], n),
+        "status": rng.choice(["Sudah", "Gagal"], n),
+        "umur": rng.normal(1e6, 5, n),
+        "x": rng.normal(size=n),
+        "keterangan": rng.choice(["OK", None], n),
+    })
+    df["y"] = df["x"] * 2 + rng.normal(size=n)
+    df.loc[::7, "umur"] = np.nan
+    return df
+
+def test_summary_matches_pandas_under_filter(visits):
+    index = StatsIndex(visits.columns, ["umur", "x", "y"])
+    index.append(visits.iloc[:500])
+    index.append(visits.iloc[500:])
+    
+    summary = index.summary("2025-10-03", "2025-10-08", nm_poli=["Poli THT"])
+    exact = visits[visits["tgl_registrasi"].between("2025-10-03", "2025-10-08") & (visits["nm_poli"] == "Poli THT")]
+    numeric = exact[["umur", "x", "y"]]
+    
+    assert summary.rows == len(exact)
+    pd.testing.assert_series_equal(summary.nulls(), exact.isnull().sum(), check_names=False)
+    pd.testing.assert_frame_equal(summary.describe(numeric.quantile([0.25, 0.5, 0.75])), numeric.describe())
+    pd.testing.assert_frame_equal(summary.corr(), numeric.corr())
+    assert summary.top_correlations(1).index[0] in [("x", "y"), ("y", "x")]
+
+def test_empty_selection(visits):
+    index = StatsIndex(visits.columns, ["umur", "x"])
+    index.append(visits)
+    summary = index.summary("2030-01-01", None)
+    assert summary.rows == 0
+    assert summary.describe().loc["count"].tolist() == [0, 0]
+    assert summary.corr().isna().all().all()
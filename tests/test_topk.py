@@ -0,0 +1,67 @@
+"""
+Unit tests untuk top-K / heavy-hitter summary module
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.topk import TopKIndex
+
+@pytest.fixture
+def visits():
+    return pd.DataFrame({
+        "tgl_registrasi": pd.to_datetime(["2025-10-01"] * 4 + ["2025-10-02"] * 3),
+        "nm_poli": ["Poli THT", "Poli THT", "Poli Mata", "Poli THT", "Poli THT", "Poli THT", "Poli Mata"],
+        "status": ["Sudah", "Sudah", "Gagal", "Gagal", "Sudah", "Sudah", "Sudah"],
+        "nm_pasien": ["A", "A", "B", "C", "A", "B", None],
+    })
+
+def test_query_matches_exact_counts_under_filter(visits):
+    index = TopKIndex("nm_pasien", fill_value="Unknown")
+    index.append(visits)
+    
+    merged = index.query(nm_poli=["Poli THT"])
+    assert dict(zip(merged["item"], merged["count"])) == {"A": 3, "B": 1, "C": 1}
+    assert (merged["error"] == 0).all()
+    assert index.top(1, "2025-10-02", "2025-10-02")["item"].tolist() == ["A"]
+    assert index.at_least(2)["item"].tolist() == ["A", "B"]
+    assert "Unknown" in index.query()["item"].tolist()
+
+def test_capacity_bounds_memory_and_keeps_heavy_hitters():
+    # Satu partisi padat: 2.000 pasien sekali datang, A 50 kali dan B 30 kali
+    names = [f"P{i:04d}" for i in range(2000)]
+    visits = pd.DataFrame({"nm_pasien": names + ["A"] * 50 + ["B"] * 30})
+    visits["tgl_registrasi"] = pd.Timestamp("2025-10-01")
+    visits["nm_poli"], visits["status"] = "Poli THT", "Sudah"
+    index = TopKIndex("nm_pasien", capacity=16)
+    shuffled = visits.sample(frac=1, random_state=0)
+    for start in range(0, len(shuffled), 500):
+        index.append(shuffled.iloc[start:start + 500])
+    
+    assert len(index) == 16
+    top = index.top(2)
+    assert top["item"].tolist() == ["A", "B"]
+    assert ((top["count"] >= [50, 30]) & (top["count"] - top["error"] <= [50, 30])).all()
+
+def test_ties_are_not_broken_by_name():
+    # 300 pasien datang sekali setiap hari selama 40 hari; tiap partisi hanya muat 100
+    names = [f"P{i:03d}" for i in range(300)]
+    visits = pd.DataFrame({
+        "tgl_registrasi": pd.Timestamp("2025-10-01") + pd.to_timedelta(np.repeat(np.arange(40), 300), unit="D"),
+        "nm_poli": "Poli THT", "status": "Sudah", "nm_pasien": names * 40,
+    })
+    index = TopKIndex("nm_pasien", capacity=100)
+    index.append(visits)
+    
+    assert len(index) == 40 * 100
+    # Setiap pasien tersimpan di sebagian partisi, dan batas atasnya tetap 40 kunjungan
+    frequent = index.at_least(40)
+    assert sorted(frequent["item"]) == names
+    assert (frequent["count"] == 40).all()
+
+def test_incremental_append_merges_partitions(visits):
+    incremental = TopKIndex("nm_pasien")
+    incremental.append(visits.iloc[:5])
+    incremental.append(visits.iloc[5:])
+    full = TopKIndex("nm_pasien")
+    full.append(visits)
+    pd.testing.assert_frame_equal(incremental.query(), full.query())